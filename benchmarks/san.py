@@ -0,0 +1,70 @@
+"""
+Benchmark formatting all legal moves in SAN, move by move with `board.san` and in bulk
+with `legal_moves_san`, over middlegame positions from random games.
+
+Usage, with llm_chess installed: python benchmarks/san.py [--positions N] [--repeats N]
+"""
+
+import argparse
+import random
+import time
+from collections.abc import Callable
+
+import chess
+
+from llm_chess.utils.san import legal_moves_san
+
+
+def middlegame_positions(n_positions: int, seed: int = 0) -> list[chess.Board]:
+    """Positions from plies 20 to 60 of random games, with at least 20 legal moves."""
+    rng = random.Random(seed)
+    positions: list[chess.Board] = []
+    while len(positions) < n_positions:
+        board = chess.Board()
+        for ply in range(60):
+            if board.is_game_over():
+                break
+            if ply >= 20 and board.legal_moves.count() >= 20:
+                positions.append(board.copy())
+            board.push(rng.choice(list(board.legal_moves)))
+    return positions[:n_positions]
+
+
+def per_move_san(board: chess.Board) -> list[str]:
+    return [board.san(move) for move in board.legal_moves]
+
+
+def time_formatter(
+    formatter: Callable[[chess.Board], list[str]], positions: list[chess.Board], repeats: int
+) -> float:
+    """The best time, in seconds, to format the legal moves of all positions."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for board in positions:
+            formatter(board)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--positions", type=int, default=1000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    positions = middlegame_positions(args.positions)
+    for board in positions:
+        assert legal_moves_san(board) == per_move_san(board), board.fen()
+
+    n_moves = sum(board.legal_moves.count() for board in positions)
+    per_move = time_formatter(per_move_san, positions, args.repeats)
+    bulk = time_formatter(legal_moves_san, positions, args.repeats)
+    print(f"{len(positions)} positions, {n_moves / len(positions):.1f} legal moves on average")
+    print(f"board.san:       {per_move * 1e6 / len(positions):8.1f} µs per position")
+    print(f"legal_moves_san: {bulk * 1e6 / len(positions):8.1f} µs per position")
+    print(f"Speed-up:        {per_move / bulk:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,3 +12,20 @@ class APIResponseFormat(Enum):
     JSON = "json"
     TEXT = "text"
     MULTI_TURN = "multi_turn"
+
+
+class CandidateSelection(Enum):
+    FIRST_LEGAL = "first_legal"
+    MAJORITY = "majority"
+
+
+class ContextPolicy(Enum):
+    APPEND = "append"
+    STATELESS = "stateless"
+    SLIDING_WINDOW = "sliding_window"
+    MULTI_TURN = "multi_turn"
+
+
+class DatasetFormat(Enum):
+    JSONL = "jsonl"
+    PARQUET = "parquet"
@@ -1,10 +1,15 @@
+import asyncio
 import random
 import sys
 import time
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
 
 import chess
 
-from llm_chess.core.player import ChessPlayer
+from llm_chess.core.player import AsyncChessPlayer, ChessPlayer, as_async_player
+from llm_chess.core.position import position_context
 from llm_chess.utils.displays import BoardDisplayer
 
 # Attempt to import display from IPython. Only available in IPython environments.
@@ -15,8 +20,10 @@ try:
 except ImportError:
     _IPYTHON_AVAILABLE = False
 
+AnyChessPlayer = ChessPlayer | AsyncChessPlayer
 
-class GameManager:
+
+class BaseGameManager:
     def _print_board(
         self,
         board: chess.Board,
@@ -39,6 +46,8 @@ class GameManager:
 
         time.sleep(sleep_time)
 
+
+class GameManager(BaseGameManager):
     def play_game(
         self,
         white: ChessPlayer,
@@ -74,14 +83,14 @@ class GameManager:
             board = chess.Board()
 
         n_half_moves = 0
-        while not board.is_game_over() and n_half_moves <= max_half_moves:
+        while not position_context(board).is_game_over and n_half_moves <= max_half_moves:
             if displayer:
                 self._print_board(board, displayer, sleep_time=sleep_time)
 
             current_player = white if board.turn == chess.WHITE else black
             move = None
             if n_half_moves < n_randomised_starting_half_moves:
-                move = random.choice(list(board.legal_moves))
+                move = random.choice(position_context(board).legal_moves)
             else:
                 try:
                     move = current_player.make_move(board)
@@ -103,3 +112,185 @@ class GameManager:
             self._print_board(board, displayer, ended=True)
 
         return board, board.result()
+
+    def play_games_lockstep(
+        self,
+        games: Iterable[tuple[ChessPlayer, ChessPlayer, chess.Board | None]],
+        max_half_moves: int = 400,
+        n_randomised_starting_half_moves: int = 0,
+    ) -> list[tuple[chess.Board, str]]:
+        """
+        Plays many games in lock-step. Each tick, the positions of every game in which
+        the same player is to move are collected and passed to that player's
+        `get_moves_batch` in one call, so players backed by a model server can serve
+        them with a single batched request. Players without batch support move in
+        each position in turn.
+
+        Args:
+            games: (white, black, board) triples, one per game. Player objects may be
+                shared between games provided they hold no per-game state.
+            max_half_moves: Maximum number of half-moves allowed in each game.
+            n_randomised_starting_half_moves: Number of random moves to make before
+                using the players' strategies.
+
+        Returns:
+            The final board state and result of each game, in the order supplied.
+        """
+        states = [
+            GameState(white, black, board if board is not None else chess.Board())
+            for white, black, board in games
+        ]
+        while True:
+            waiting: dict[int, list[GameState]] = defaultdict(list)
+            players: dict[int, ChessPlayer] = {}
+            for state in states:
+                if state.result is not None:
+                    continue
+                board = state.board
+                if position_context(board).is_game_over or state.n_half_moves > max_half_moves:
+                    state.result = board.result()
+                elif state.n_half_moves < n_randomised_starting_half_moves:
+                    board.push(random.choice(position_context(board).legal_moves))
+                    state.n_half_moves += 1
+                else:
+                    player = state.white if board.turn == chess.WHITE else state.black
+                    players[id(player)] = player
+                    waiting[id(player)].append(state)
+            if all(state.result is not None for state in states):
+                break
+
+            for key, player_states in waiting.items():
+                player = players[key]
+                moves = player.get_moves_batch([state.board for state in player_states])
+                for state, move in zip(player_states, moves, strict=True):
+                    if move is None:
+                        state.result = f"Illegal move by {player.name}"
+                        continue
+                    state.board.push(move)
+                    state.n_half_moves += 1
+
+        return [(state.board, state.result or state.board.result()) for state in states]
+
+
+@dataclass
+class GameState:
+    """A game in progress, for runners that advance many games at once."""
+
+    white: ChessPlayer
+    black: ChessPlayer
+    board: chess.Board
+    n_half_moves: int = 0
+    result: str | None = None
+    # The id of the game's pending batch request, if any
+    custom_id: str | None = None
+
+
+class AsyncGameManager(BaseGameManager):
+    """
+    Plays games on an asyncio event loop, so that many games whose players spend most
+    of their time waiting on I/O (e.g. API calls) can run concurrently in one thread.
+    Synchronous players are run in an executor via `SyncPlayerAdapter`.
+    """
+
+    async def play_game(
+        self,
+        white: AnyChessPlayer,
+        black: AnyChessPlayer,
+        board: chess.Board | None,
+        displayer: BoardDisplayer | None = None,
+        print_move: bool = False,
+        sleep_time: float = 0.1,
+        max_half_moves: int = 400,
+        n_randomised_starting_half_moves: int = 0,
+    ) -> tuple[chess.Board, str]:
+        """
+        Plays a game of chess between two players.
+
+        Args:
+            white (ChessPlayer | AsyncChessPlayer): The player playing as white.
+            black (ChessPlayer | AsyncChessPlayer): The player playing as black.
+            board (chess.Board | None): The initial board state. If None, a new board
+                is created.
+            displayer (BoardDisplayer | None): Optional displayer for the board.
+            sleep_time (float): Time to wait between moves for display purposes.
+            max_half_moves (int): Maximum number of half-moves allowed in the game.
+            n_randomised_starting_half_moves (int): Number of random moves to make
+                before before using the players' strategies.
+
+        Returns:
+            tuple[chess.Board, str]: The final board state and the game result.
+        """
+        if board is None:
+            board = chess.Board()
+        async_white, async_black = as_async_player(white), as_async_player(black)
+
+        n_half_moves = 0
+        while not position_context(board).is_game_over and n_half_moves <= max_half_moves:
+            if displayer:
+                self._print_board(board, displayer, sleep_time=0)
+                await asyncio.sleep(sleep_time)
+
+            current_player = async_white if board.turn == chess.WHITE else async_black
+            move = None
+            if n_half_moves < n_randomised_starting_half_moves:
+                move = random.choice(position_context(board).legal_moves)
+            else:
+                try:
+                    move = await current_player.make_move(board)
+                except Exception as e:
+                    print(f"Error: {e}")
+                    return board, f"Illegal move by {current_player.name}"
+
+            if move is None:
+                break
+
+            if print_move:
+                length = max(len(white.name), len(black.name))
+                print(f"    {current_player.name:<{length}} plays: {board.san(move)}")
+
+            board.push(move)
+            n_half_moves += 1
+
+        if displayer:
+            self._print_board(board, displayer, ended=True)
+
+        return board, board.result()
+
+    async def play_games(
+        self,
+        games: Iterable[tuple[AnyChessPlayer, AnyChessPlayer, chess.Board | None]],
+        max_concurrency: int | None = None,
+        max_half_moves: int = 400,
+        n_randomised_starting_half_moves: int = 0,
+    ) -> list[tuple[chess.Board, str]]:
+        """
+        Plays many games concurrently on the running event loop.
+
+        Args:
+            games: (white, black, board) triples, one per game. Player objects may be
+                shared between games provided they hold no per-game state.
+            max_concurrency: Maximum number of games in progress at once. If None, all
+                games are started immediately.
+            max_half_moves: Maximum number of half-moves allowed in each game.
+            n_randomised_starting_half_moves: Number of random moves to make before
+                using the players' strategies.
+
+        Returns:
+            The final board state and result of each game, in the order supplied.
+        """
+        games = list(games)
+        semaphore = asyncio.Semaphore(max_concurrency or max(len(games), 1))
+
+        async def play(
+            white: AnyChessPlayer, black: AnyChessPlayer, board: chess.Board | None
+        ) -> tuple[chess.Board, str]:
+            async with semaphore:
+                return await self.play_game(
+                    white,
+                    black,
+                    board,
+                    max_half_moves=max_half_moves,
+                    n_randomised_starting_half_moves=n_randomised_starting_half_moves,
+                )
+
+        return await asyncio.gather(*(play(white, black, board) for white, black, board in games))
@@ -1,7 +1,14 @@
+import asyncio
+import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor
 
 import chess
 
+from llm_chess.core.position import position_context
+
+logger = logging.getLogger(__name__)
+
 
 class ChessPlayer(ABC):
     """Abstract base class for chess players."""
@@ -10,11 +17,11 @@ class ChessPlayer(ABC):
         self.name = name
 
     def make_move(self, board: chess.Board) -> chess.Move | None:
-        legal_moves = list(board.legal_moves)
-        if not legal_moves:
+        context = position_context(board)
+        if not context.legal_moves:
             return None
         move = self._get_move(board)
-        if move not in legal_moves:
+        if not context.is_legal(move):
             raise ValueError(f"Invalid move: {move}")
         return move
 
@@ -22,8 +29,86 @@ class ChessPlayer(ABC):
     def _get_move(self, board: chess.Board) -> chess.Move:
         pass
 
+    def get_moves_batch(self, boards: list[chess.Board]) -> list[chess.Move | None]:
+        """
+        Choose a move in each of several positions, each of which must have a legal
+        move. Players that can serve many positions in one request override this; by
+        default, each position is handled in turn.
+
+        Returns:
+            The move for each position, in order, or None where the player failed to
+            return a legal move.
+        """
+        moves: list[chess.Move | None] = []
+        for board in boards:
+            try:
+                moves.append(self.make_move(board))
+            except Exception as e:
+                logger.warning(f"{self.name} failed to move: {e}")
+                moves.append(None)
+        return moves
+
     def __str__(self) -> str:
         return f"{self.name}"
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(name='{self.name}'"
+
+
+class AsyncChessPlayer(ABC):
+    """Abstract base class for chess players that select moves asynchronously."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    async def make_move(self, board: chess.Board) -> chess.Move | None:
+        context = position_context(board)
+        if not context.legal_moves:
+            return None
+        move = await self._get_move(board)
+        if not context.is_legal(move):
+            raise ValueError(f"Invalid move: {move}")
+        return move
+
+    @abstractmethod
+    async def _get_move(self, board: chess.Board) -> chess.Move:
+        pass
+
+    def __str__(self) -> str:
+        return f"{self.name}"
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(name='{self.name}'"
+
+
+class SyncPlayerAdapter(AsyncChessPlayer):
+    """
+    Adapts a synchronous `ChessPlayer` to the async protocol by running its moves in an
+    executor, so that it does not block the event loop.
+    """
+
+    def __init__(self, player: ChessPlayer, executor: Executor | None = None):
+        """
+        Args:
+            player: The synchronous player to wrap.
+            executor: The executor to run moves in. If None, the event loop's default
+                executor is used.
+        """
+        super().__init__(player.name)
+        self.player = player
+        self.executor = executor
+
+    async def make_move(self, board: chess.Board) -> chess.Move | None:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.player.make_move, board)
+
+    async def _get_move(self, board: chess.Board) -> chess.Move:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.player._get_move, board)
+
+
+def as_async_player(player: ChessPlayer | AsyncChessPlayer) -> AsyncChessPlayer:
+    """Return the player unchanged if it is async, otherwise wrap it in an adapter."""
+    if isinstance(player, AsyncChessPlayer):
+        return player
+    return SyncPlayerAdapter(player)
@@ -0,0 +1,175 @@
+import threading
+import weakref
+from collections.abc import Callable, Hashable
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import chess
+import chess.polyglot
+
+from llm_chess.core.enums import MoveNotation
+from llm_chess.utils.san import legal_moves_san
+
+if TYPE_CHECKING:
+    from llm_chess.prompts.base import PromptConfig
+
+T = TypeVar("T")
+
+
+class PositionContext:
+    """
+    Facts about a position, each computed lazily and at most once. Within a ply, the
+    game loop, the player, its prompt and schema builders and the displayer all ask
+    about the same position; `position_context` hands them a shared context, so legal
+    moves, their formatting and the prompt are only computed once.
+
+    A context describes the position when it was created. Use `position_context` to
+    get an up-to-date context for a board that may have changed.
+    """
+
+    def __init__(self, board: chess.Board):
+        self.board = board
+        self.key = _position_key(board)
+        self._memo: dict[Hashable, Any] = {}
+
+    @cached_property
+    def legal_moves(self) -> list[chess.Move]:
+        return list(self.board.legal_moves)
+
+    def is_legal(self, move: chess.Move) -> bool:
+        # Scanning the few legal moves is cheaper than building a set to check one move
+        return move in self.legal_moves
+
+    @cached_property
+    def outcome(self) -> chess.Outcome | None:
+        return self.board.outcome()
+
+    @property
+    def is_game_over(self) -> bool:
+        return self.outcome is not None
+
+    @cached_property
+    def fen(self) -> str:
+        return self.board.fen()
+
+    @cached_property
+    def zobrist_hash(self) -> int:
+        return chess.polyglot.zobrist_hash(self.board)
+
+    def formatted_legal_moves(
+        self, move_notation: MoveNotation, move_response_has_leading_space: bool = False
+    ) -> list[str]:
+        """The legal moves in the given notation, as from `format_legal_moves`."""
+        key = ("legal_moves", move_notation, move_response_has_leading_space)
+        if key not in self._memo:
+            if move_response_has_leading_space:
+                moves = self.formatted_legal_moves(move_notation)
+                self._memo[key] = [f" {move}" for move in moves]
+            elif move_notation == MoveNotation.UCI:
+                self._memo[key] = [self.board.uci(move) for move in self.legal_moves]
+            elif move_notation == MoveNotation.SAN:
+                self._memo[key] = legal_moves_san(self.board, self.legal_moves)
+            else:
+                raise ValueError(f"Unsupported notation: {move_notation}")
+        return list(self._memo[key])
+
+    def parse_move(self, move_str: str, move_notation: MoveNotation) -> chess.Move | None:
+        """
+        Look up the legal move spelt by the string, or return None if it isn't one of the
+        accepted spellings of a legal move. See `move_spellings`.
+        """
+        return self.move_spellings(move_notation).get(move_str)
+
+    def move_spellings(self, move_notation: MoveNotation) -> dict[str, chess.Move]:
+        """
+        Map the accepted spellings of each legal move in the notation to the move. These
+        are the formatted move, with or without a leading space, and for SAN, with any or
+        no check suffix, and castling spelt with zeros. They're built from the formatted
+        legal moves, so reuse the strings produced for the prompt and schema.
+        """
+        return self.memo(("spellings", move_notation), lambda: self._move_spellings(move_notation))
+
+    def _move_spellings(self, move_notation: MoveNotation) -> dict[str, chess.Move]:
+        spellings: dict[str, chess.Move] = {}
+        for move_str, move in zip(
+            self.formatted_legal_moves(move_notation), self.legal_moves, strict=True
+        ):
+            if move_notation == MoveNotation.SAN:
+                base = move_str.rstrip("+#")
+                variants = [base, base.replace("O", "0")] if base.startswith("O-O") else [base]
+                for variant in variants:
+                    for suffix in ("", "+", "#"):
+                        spellings[variant + suffix] = move
+            else:
+                spellings[move_str] = move
+        for move_str, move in list(spellings.items()):
+            spellings[f" {move_str}"] = move
+        return spellings
+
+    def prompt(self, prompt_config: "PromptConfig") -> str:
+        """The prompt built by the prompt config for this position."""
+        # Keyed by identity, as configs needn't be hashable; the config is kept alongside
+        # the prompt so that its id can't be reused while the entry exists
+        _, prompt = self.memo(
+            ("prompt", id(prompt_config)),
+            lambda: (prompt_config, prompt_config.build_prompt(self.board)),
+        )
+        return prompt
+
+    def memo(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """Return the value stored under the key, computing and storing it if absent."""
+        if key not in self._memo:
+            self._memo[key] = compute()
+        value: T = self._memo[key]
+        return value
+
+
+def _position_key(board: chess.Board) -> tuple[Any, ...]:
+    # Built from cheap public state, as it's computed on every lookup. The outcome also
+    # depends on the move history, e.g. through repetitions, and the FEN on the counters
+    last_move = board.move_stack[-1] if board.move_stack else None
+    return (
+        len(board.move_stack),
+        last_move,
+        board.halfmove_clock,
+        board.fullmove_number,
+        board.pawns,
+        board.knights,
+        board.bishops,
+        board.rooks,
+        board.queens,
+        board.kings,
+        board.occupied_co[chess.WHITE],
+        board.occupied_co[chess.BLACK],
+        board.turn,
+        board.castling_rights,
+        board.ep_square,
+    )
+
+
+_contexts: dict[int, tuple[weakref.ref[chess.Board], PositionContext]] = {}
+_contexts_lock = threading.Lock()
+
+
+def position_context(board: chess.Board) -> PositionContext:
+    """
+    The context of the board's current position. Repeated calls for the same board in
+    the same position return the same context; once the board changes, e.g. a move is
+    pushed, a new context is created. Contexts are dropped with their boards.
+    """
+    board_id = id(board)
+    key = _position_key(board)
+    with _contexts_lock:
+        entry = _contexts.get(board_id)
+        if entry is not None and entry[0]() is board and entry[1].key == key:
+            return entry[1]
+        context = PositionContext(board)
+        _contexts[board_id] = (weakref.ref(board, lambda _: _discard(board_id)), context)
+        return context
+
+
+def _discard(board_id: int) -> None:
+    with _contexts_lock:
+        entry = _contexts.get(board_id)
+        if entry is not None and entry[0]() is None:
+            del _contexts[board_id]
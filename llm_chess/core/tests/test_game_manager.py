@@ -0,0 +1,117 @@
+import asyncio
+import random
+from collections.abc import Iterator
+
+import chess
+import pytest
+
+from llm_chess.conftest import MockChessPlayer
+from llm_chess.core.game_manager import AsyncGameManager, GameManager
+from llm_chess.core.player import AsyncChessPlayer, SyncPlayerAdapter, as_async_player
+from llm_chess.players.random import RandomPlayer
+
+
+class BatchCountingPlayer(RandomPlayer):
+    """Random player that records the size of each batch of positions it is given."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.batch_sizes: list[int] = []
+
+    def get_moves_batch(self, boards: list[chess.Board]) -> list[chess.Move | None]:
+        self.batch_sizes.append(len(boards))
+        return super().get_moves_batch(boards)
+
+
+class MockAsyncChessPlayer(AsyncChessPlayer):
+    """Async player that always plays the first legal move."""
+
+    async def _get_move(self, board: chess.Board) -> chess.Move:
+        await asyncio.sleep(0)
+        return next(iter(board.legal_moves))
+
+
+def test_play_game_max_half_moves() -> None:
+    board, _ = GameManager().play_game(
+        RandomPlayer("White"), RandomPlayer("Black"), board=None, max_half_moves=9
+    )
+    assert len(board.move_stack) <= 10
+
+
+def test_play_game_generates_legal_moves_once_per_ply_for_the_move(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # The loop's game-over check, `make_move` and the player share the ply's position
+    # context, so the move list is generated once per ply rather than once by each of
+    # them. The outcome check generates moves too, but stops at the first.
+    n_calls = 0
+    generate_legal_moves = chess.Board.generate_legal_moves
+
+    def counting_generate_legal_moves(
+        board: chess.Board, *args: chess.Bitboard
+    ) -> Iterator[chess.Move]:
+        nonlocal n_calls
+        n_calls += 1
+        return generate_legal_moves(board, *args)
+
+    monkeypatch.setattr(chess.Board, "generate_legal_moves", counting_generate_legal_moves)
+    random.seed(0)
+    board, _ = GameManager().play_game(RandomPlayer("White"), RandomPlayer("Black"), board=None)
+    assert n_calls < 3 * len(board.move_stack)
+
+
+def test_as_async_player_wraps_sync_players() -> None:
+    sync_player = RandomPlayer("Random")
+    async_player = MockAsyncChessPlayer("Async")
+
+    adapted = as_async_player(sync_player)
+    assert isinstance(adapted, SyncPlayerAdapter)
+    assert adapted.name == "Random"
+    assert as_async_player(async_player) is async_player
+
+
+def test_async_play_game_mixed_players() -> None:
+    board, result = asyncio.run(
+        AsyncGameManager().play_game(
+            MockAsyncChessPlayer("Async"), RandomPlayer("Random"), board=None, max_half_moves=20
+        )
+    )
+    assert 0 < len(board.move_stack) <= 21
+    assert result in ("1-0", "0-1", "1/2-1/2", "*")
+
+
+def test_async_play_game_illegal_move() -> None:
+    _, result = asyncio.run(
+        AsyncGameManager().play_game(
+            MockChessPlayer("e2e5", "Mock"), MockAsyncChessPlayer("Async"), board=None
+        )
+    )
+    assert result == "Illegal move by Mock"
+
+
+def test_async_play_games_concurrently() -> None:
+    games = [
+        (MockAsyncChessPlayer("White"), RandomPlayer("Black"), chess.Board()) for _ in range(5)
+    ]
+    results = asyncio.run(AsyncGameManager().play_games(games, max_concurrency=2, max_half_moves=6))
+
+    assert len(results) == 5
+    for (_, _, board), (final_board, _) in zip(games, results, strict=True):
+        assert final_board is board
+        assert len(board.move_stack) == 7
+
+
+def test_play_games_lockstep_batches_positions() -> None:
+    white, black = BatchCountingPlayer("White"), BatchCountingPlayer("Black")
+    games = [(white, black, None) for _ in range(4)]
+    results = GameManager().play_games_lockstep(games, max_half_moves=5)
+    assert len(results) == 4
+    assert all(len(board.move_stack) == 6 for board, _ in results)
+    assert white.batch_sizes == [4, 4, 4]
+    assert black.batch_sizes == [4, 4, 4]
+
+
+def test_play_games_lockstep_illegal_move() -> None:
+    games = [(MockChessPlayer("e2e5", "Mock"), RandomPlayer("Random"), None)]
+    [(_, result)] = GameManager().play_games_lockstep(games)
+    assert result == "Illegal move by Mock"
@@ -0,0 +1,69 @@
+from unittest.mock import Mock
+
+import chess
+
+from llm_chess.core.enums import MoveNotation
+from llm_chess.core.position import position_context
+from llm_chess.utils.displays import PromptDisplayer
+
+
+def test_context_is_shared_within_a_ply(starting_board: chess.Board) -> None:
+    context = position_context(starting_board)
+    assert position_context(starting_board) is context
+    assert len(context.legal_moves) == 20
+    assert not context.is_game_over
+
+    starting_board.push_san("e4")
+    assert position_context(starting_board) is not context
+    starting_board.pop()
+    assert position_context(starting_board).fen == starting_board.fen()
+
+
+def test_context_is_per_board(starting_board: chess.Board) -> None:
+    assert position_context(starting_board) is not position_context(starting_board.copy())
+
+
+def test_context_tracks_outcome(stalemate_board: chess.Board) -> None:
+    context = position_context(stalemate_board)
+    assert context.legal_moves == []
+    assert context.is_game_over
+    assert context.outcome == stalemate_board.outcome()
+
+
+def test_formatted_legal_moves(starting_board: chess.Board) -> None:
+    context = position_context(starting_board)
+    san = context.formatted_legal_moves(MoveNotation.SAN)
+    assert san == [starting_board.san(move) for move in starting_board.legal_moves]
+    assert context.formatted_legal_moves(MoveNotation.SAN, True) == [f" {m}" for m in san]
+    # Callers get their own copy
+    san.clear()
+    assert len(context.formatted_legal_moves(MoveNotation.SAN)) == 20
+
+
+def test_prompt_is_built_once_per_ply(starting_board: chess.Board) -> None:
+    prompt_config = Mock()
+    prompt_config.build_prompt.return_value = "prompt"
+    displayer = PromptDisplayer(prompt_config)
+
+    assert displayer.display(starting_board) == "prompt"
+    assert position_context(starting_board).prompt(prompt_config) == "prompt"
+    assert prompt_config.build_prompt.call_count == 1
+
+    starting_board.push_san("e4")
+    displayer.display(starting_board)
+    assert prompt_config.build_prompt.call_count == 2
+
+
+def test_parse_move_accepts_spellings_of_legal_moves() -> None:
+    board = chess.Board("r3k3/8/8/8/8/8/8/R3K2R w KQq - 0 1")
+    context = position_context(board)
+    castle = chess.Move.from_uci("e1g1")
+    check = chess.Move.from_uci("a1a8")
+
+    for move_str in ["O-O", "0-0", " O-O", "O-O+"]:
+        assert context.parse_move(move_str, MoveNotation.SAN) == castle
+    for move_str in ["Rxa8+", "Rxa8", " Rxa8#"]:
+        assert context.parse_move(move_str, MoveNotation.SAN) == check
+    assert context.parse_move(" a1a8", MoveNotation.UCI) == check
+    assert context.parse_move("a1a8", MoveNotation.SAN) is None
+    assert context.parse_move("Rxa8", MoveNotation.UCI) is None
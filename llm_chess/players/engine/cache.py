@@ -0,0 +1,201 @@
+import json
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+import chess
+import chess.engine
+import chess.polyglot
+
+from llm_chess.utils.cache import LRUCache, SQLiteCache
+
+
+@dataclass(frozen=True)
+class Evaluation:
+    """
+    An engine evaluation of a position. Scores are stored from white's point of view,
+    as either centipawns or moves to mate.
+
+    `depth` is the depth reported by the engine, which may be shallower than the depth
+    requested, e.g. for mates and terminal positions. `requested_depth` records the
+    depth limit of the search, if it was depth-limited. It is bookkeeping for the
+    cache, so it is ignored when comparing evaluations.
+    """
+
+    cp: int | None
+    mate: int | None
+    pv: tuple[chess.Move, ...] = ()
+    depth: int | None = None
+    nodes: int | None = None
+    requested_depth: int | None = field(default=None, compare=False)
+
+    @property
+    def search_depth(self) -> int:
+        """The depth this evaluation satisfies: the deeper of the reported and requested."""
+        return max(self.depth or 0, self.requested_depth or 0)
+
+    @property
+    def score(self) -> chess.engine.PovScore:
+        score: chess.engine.Score = (
+            chess.engine.Mate(self.mate) if self.mate is not None else chess.engine.Cp(self.cp or 0)
+        )
+        return chess.engine.PovScore(score, chess.WHITE)
+
+    @property
+    def best_move(self) -> chess.Move | None:
+        return self.pv[0] if self.pv else None
+
+    @classmethod
+    def from_info(cls, info: chess.engine.InfoDict) -> "Evaluation":
+        if "score" not in info:
+            raise ValueError("Engine analysis returned no score.")
+        score = info["score"].white()
+        return cls(
+            cp=score.score(),
+            mate=score.mate(),
+            pv=tuple(info.get("pv", ())),
+            depth=info.get("depth"),
+            nodes=info.get("nodes"),
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "cp": self.cp,
+                "mate": self.mate,
+                "pv": [move.uci() for move in self.pv],
+                "depth": self.depth,
+                "nodes": self.nodes,
+                "requested_depth": self.requested_depth,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, data: str) -> "Evaluation":
+        d = json.loads(data)
+        return cls(
+            cp=d["cp"],
+            mate=d["mate"],
+            pv=tuple(chess.Move.from_uci(move) for move in d["pv"]),
+            depth=d["depth"],
+            nodes=d["nodes"],
+            requested_depth=d.get("requested_depth"),
+        )
+
+
+def _is_depth_only(limit: chess.engine.Limit) -> bool:
+    return limit.depth is not None and all(
+        value is None
+        for value in (
+            limit.time,
+            limit.nodes,
+            limit.mate,
+            limit.white_clock,
+            limit.black_clock,
+            limit.remaining_moves,
+        )
+    )
+
+
+class EvaluationCache:
+    """
+    Cache of engine evaluations, keyed by the position's Zobrist hash and the search
+    limit. Lookups go to an in-memory LRU first, then to an optional on-disk store.
+
+    Depth-limited results are stored once per position and satisfy any request for
+    the same or a shallower depth, so a deeper analysis is never repeated at a lower
+    depth. Results for other limits (time, nodes, etc.) only match the exact limit.
+
+    Note that the Zobrist hash ignores the move counters and repetition history.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        max_memory_entries: int = 100_000,
+        max_disk_bytes: int | None = 256 * 1024**2,
+    ):
+        """
+        Args:
+            path: Path to an SQLite file for the on-disk layer. If None, evaluations
+                are only cached in memory.
+            max_memory_entries: Maximum number of evaluations held in memory.
+            max_disk_bytes: Approximate maximum size of the on-disk layer. The least
+                recently used evaluations are evicted beyond this size.
+        """
+        self.memory: LRUCache[str, Evaluation] = LRUCache(max_memory_entries)
+        self.disk = SQLiteCache(path, max_disk_bytes) if path is not None else None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(board: chess.Board, limit: chess.engine.Limit) -> str:
+        position = f"{chess.polyglot.zobrist_hash(board):016x}"
+        if _is_depth_only(limit):
+            return f"{position}:depth"
+        return f"{position}:{limit!r}"
+
+    def _lookup(self, key: str) -> Evaluation | None:
+        evaluation = self.memory.get(key)
+        if evaluation is None and self.disk is not None:
+            data = self.disk.get(key)
+            if data is not None:
+                evaluation = Evaluation.from_json(data)
+                self.memory.put(key, evaluation)
+        return evaluation
+
+    def get(self, board: chess.Board, limit: chess.engine.Limit) -> Evaluation | None:
+        """Return a cached evaluation satisfying the limit, or None."""
+        evaluation = self._lookup(self._key(board, limit))
+        if evaluation is not None and _is_depth_only(limit):
+            assert limit.depth is not None
+            if evaluation.search_depth < limit.depth:
+                evaluation = None
+        if evaluation is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return evaluation
+
+    def put(self, board: chess.Board, limit: chess.engine.Limit, evaluation: Evaluation) -> None:
+        """Store an evaluation. A depth-limited result never replaces a deeper one."""
+        key = self._key(board, limit)
+        if _is_depth_only(limit):
+            evaluation = replace(evaluation, requested_depth=limit.depth)
+            existing = self._lookup(key)
+            if existing is not None and existing.search_depth >= evaluation.search_depth:
+                return
+        self.memory.put(key, evaluation)
+        if self.disk is not None:
+            self.disk.put(key, evaluation.to_json())
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+
+
+def analyse(
+    engine: chess.engine.SimpleEngine,
+    board: chess.Board,
+    limit: chess.engine.Limit,
+    cache: EvaluationCache | None = None,
+) -> Evaluation:
+    """
+    Analyse a position, skipping the engine if the cache already holds a result.
+
+    Args:
+        engine: The engine to analyse with on a cache miss.
+        board: The position to analyse.
+        limit: The search limit.
+        cache: Optional evaluation cache.
+
+    Returns:
+        The evaluation of the position.
+    """
+    if cache is not None:
+        evaluation = cache.get(board, limit)
+        if evaluation is not None:
+            return evaluation
+    evaluation = Evaluation.from_info(engine.analyse(board, limit))
+    if cache is not None:
+        cache.put(board, limit, evaluation)
+    return evaluation
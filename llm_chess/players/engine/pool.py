@@ -0,0 +1,152 @@
+import logging
+import os
+import threading
+
+import chess.engine
+
+from llm_chess.players.engine.stockfish import EngineConfig
+
+logger = logging.getLogger(__name__)
+
+
+class EnginePool:
+    """
+    A pool of warm Stockfish processes that are leased out per game.
+
+    Starting an engine process is slow relative to a single move, so rather than
+    spawning a process per game, engines are returned to the pool after each game and
+    reconfigured for the next one. The total number of processes is capped; callers
+    block until an engine is free once the cap is reached.
+
+    Engines handed out by the pool are reconfigured with the requested `EngineConfig`.
+    The engine is sent `ucinewgame` when it is next asked to play with a new `game`
+    key (see `chess.engine.SimpleEngine.play`), which is how `StockfishPlayer` resets
+    the engine at the start of each lease.
+    """
+
+    def __init__(self, engine_path: str | None = None, max_engines: int = 1):
+        """
+        Args:
+            engine_path: Path to the Stockfish binary. Defaults to the
+                `STOCKFISH_ENGINE_PATH` environment variable.
+            max_engines: Maximum number of engine processes the pool may run at once.
+        """
+        if max_engines < 1:
+            raise ValueError("max_engines must be at least 1.")
+        self.engine_path = engine_path or os.getenv("STOCKFISH_ENGINE_PATH")
+        self.max_engines = max_engines
+        self._idle: list[chess.engine.SimpleEngine] = []
+        self._leased: set[chess.engine.SimpleEngine] = set()
+        self._n_pending = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def n_engines(self) -> int:
+        """The number of engine processes currently owned by the pool."""
+        with self._condition:
+            return len(self._idle) + len(self._leased) + self._n_pending
+
+    def _start_engine(self) -> chess.engine.SimpleEngine:
+        if self.engine_path is None:
+            raise ValueError(
+                "STOCKFISH_ENGINE_PATH must be set in the environment or passed as argument."
+            )
+        return chess.engine.SimpleEngine.popen_uci(self.engine_path)
+
+    def _is_alive(self, engine: chess.engine.SimpleEngine) -> bool:
+        try:
+            engine.ping()
+            return True
+        except Exception:
+            return False
+
+    def acquire(
+        self, config: EngineConfig, timeout: float | None = None
+    ) -> chess.engine.SimpleEngine:
+        """
+        Lease an engine configured with the given settings.
+
+        Args:
+            config: The engine settings to apply.
+            timeout: Maximum time to wait for an engine to become free. If None, wait
+                indefinitely.
+
+        Returns:
+            A configured engine. It must be returned with `release`.
+
+        Raises:
+            TimeoutError: If no engine became free within the timeout.
+        """
+        engine = None
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Engine pool is closed.")
+                if self._idle:
+                    engine = self._idle.pop()
+                    break
+                if len(self._leased) + self._n_pending < self.max_engines:
+                    break
+                if not self._condition.wait(timeout):
+                    raise TimeoutError("Timed out waiting for a free engine.")
+            # Reserve the slot while the engine is (re)started and configured
+            self._n_pending += 1
+
+        try:
+            if engine is None or not self._is_alive(engine):
+                if engine is not None:
+                    self._quit(engine)
+                engine = None
+                engine = self._start_engine()
+            engine.configure(config.uci_options())
+        except Exception:
+            if engine is not None:
+                self._quit(engine)
+            with self._condition:
+                self._n_pending -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._n_pending -= 1
+            self._leased.add(engine)
+        return engine
+
+    def release(self, engine: chess.engine.SimpleEngine) -> None:
+        """Return a leased engine to the pool."""
+        with self._condition:
+            if engine not in self._leased:
+                raise ValueError("Engine was not leased from this pool.")
+            self._leased.remove(engine)
+            if self._closed:
+                self._quit(engine)
+            else:
+                self._idle.append(engine)
+            self._condition.notify()
+
+    def _quit(self, engine: chess.engine.SimpleEngine) -> None:
+        try:
+            engine.quit()
+        except Exception as e:
+            logger.warning(f"Failed to quit engine cleanly: {e}")
+
+    def close(self) -> None:
+        """Terminate idle engines. Leased engines are terminated when released."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for engine in idle:
+            self._quit(engine)
+
+    def __enter__(self) -> "EnginePool":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: object | None,
+    ) -> None:
+        self.close()
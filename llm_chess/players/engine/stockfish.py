@@ -1,10 +1,15 @@
+import asyncio
 import os
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 import chess
 import chess.engine
 
-from llm_chess.core.player import ChessPlayer
+from llm_chess.core.player import AsyncChessPlayer, ChessPlayer
+
+if TYPE_CHECKING:
+    from llm_chess.players.engine.pool import EnginePool
 
 
 @dataclass
@@ -14,6 +19,15 @@ class EngineConfig:
     threads: int = 1
     hash_mb: int = 64
 
+    def uci_options(self) -> dict[str, int | bool]:
+        """The UCI options that apply this config to an engine."""
+        return {
+            "Threads": self.threads,
+            "Hash": self.hash_mb,
+            "UCI_LimitStrength": True,
+            "UCI_Elo": self.elo,
+        }
+
 
 class StockfishPlayer(ChessPlayer):
 
@@ -25,30 +39,44 @@ class StockfishPlayer(ChessPlayer):
         movetime_ms: int = 1000,
         threads: int = 1,
         hash_mb: int = 64,
+        pool: "EnginePool | None" = None,
     ) -> None:
+        """
+        Args:
+            name: The player's name.
+            engine_path: Path to the Stockfish binary. Defaults to the
+                `STOCKFISH_ENGINE_PATH` environment variable. Ignored if a pool is given.
+            elo: Playing strength, between 1320 and 3190.
+            movetime_ms: Per-move search time in milliseconds.
+            threads: Number of search threads.
+            hash_mb: Hash table size in megabytes.
+            pool: Optional engine pool to lease the engine from, instead of spawning a
+                dedicated engine process. The engine is returned to the pool on exiting
+                the player's context manager.
+        """
         assert elo >= 1320 and elo <= 3190, "Elo must be between 1320 and 3190."
         super().__init__(name)
 
         self.elo = elo
         self.engine_path = engine_path or os.getenv("STOCKFISH_ENGINE_PATH")
         self.config = EngineConfig(elo, movetime_ms, threads, hash_mb)
+        self.pool = pool
+        self.game: object | None = None
+        self.engine: chess.engine.SimpleEngine | None = None
         self.engine = self._initialize_engine(self.engine_path)
 
     def _initialize_engine(self, engine_path: str | None) -> chess.engine.SimpleEngine:
         """Initialize and configure the chess engine."""
+        if self.pool is not None:
+            # A new game key makes the leased engine send `ucinewgame` on its next move
+            self.game = object()
+            return self.pool.acquire(self.config)
         if engine_path is None:
             raise ValueError(
                 "STOCKFISH_ENGINE_PATH must be set in the environment or passed as argument."
             )
         engine = chess.engine.SimpleEngine.popen_uci(engine_path)
-        engine.configure(
-            {
-                "Threads": self.config.threads,
-                "Hash": self.config.hash_mb,
-                "UCI_LimitStrength": True,
-                "UCI_Elo": self.config.elo,
-            }
-        )
+        engine.configure(self.config.uci_options())
         return engine
 
     def _get_move(
@@ -58,16 +86,26 @@ class StockfishPlayer(ChessPlayer):
         if self.engine is None:
             self.engine = self._initialize_engine(self.engine_path)
         limit = chess.engine.Limit(time=self.config.movetime_ms / 1000)
-        move = self.engine.play(board, limit).move
+        move = self.engine.play(board, limit, game=self.game).move
         if move is None:
             raise ValueError("Engine returned no move.")
         return move
 
+    def _release_engine(self) -> None:
+        """Return the engine to the pool, or terminate it if it is not pooled."""
+        engine, self.engine = self.engine, None
+        if engine is None:
+            return
+        if self.pool is not None:
+            self.pool.release(engine)
+        else:
+            engine.quit()
+
     def __del__(self) -> None:
-        """Cleanup: ensure engine process is terminated."""
-        if self.engine:
+        """Cleanup: ensure engine process is terminated or returned to the pool."""
+        if getattr(self, "engine", None):
             try:
-                self.engine.quit()
+                self._release_engine()
             except Exception:
                 pass
 
@@ -84,6 +122,78 @@ class StockfishPlayer(ChessPlayer):
         exc_tb: object | None,
     ) -> None:
         """Context manager exit."""
-        if self.engine:
-            self.engine.quit()
-            self.engine = None
+        self._release_engine()
+
+
+class AsyncStockfishPlayer(AsyncChessPlayer):
+    """
+    Stockfish player built on python-chess's asyncio engine API, so that searching does
+    not block the event loop. Intended for use with `AsyncGameManager`, where engine
+    moves can overlap with other games' API requests.
+
+    The engine process is started lazily on the first move, as it requires a running
+    event loop. Use the player as an async context manager, or call `aclose`, to
+    terminate it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        engine_path: str | None = None,
+        elo: int = 1320,
+        movetime_ms: int = 1000,
+        threads: int = 1,
+        hash_mb: int = 64,
+    ) -> None:
+        assert elo >= 1320 and elo <= 3190, "Elo must be between 1320 and 3190."
+        super().__init__(name)
+
+        self.elo = elo
+        self.engine_path = engine_path or os.getenv("STOCKFISH_ENGINE_PATH")
+        if self.engine_path is None:
+            raise ValueError(
+                "STOCKFISH_ENGINE_PATH must be set in the environment or passed as argument."
+            )
+        self.config = EngineConfig(elo, movetime_ms, threads, hash_mb)
+        self.engine: chess.engine.UciProtocol | None = None
+        self._lock = asyncio.Lock()
+
+    async def _initialize_engine(self) -> chess.engine.UciProtocol:
+        """Start and configure the chess engine."""
+        assert self.engine_path is not None
+        _, engine = await chess.engine.popen_uci(self.engine_path)
+        await engine.configure(self.config.uci_options())
+        return engine
+
+    async def _get_move(self, board: chess.Board) -> chess.Move:
+        # The lock serialises searches if the player is shared between games
+        async with self._lock:
+            if self.engine is None:
+                self.engine = await self._initialize_engine()
+            limit = chess.engine.Limit(time=self.config.movetime_ms / 1000)
+            move = (await self.engine.play(board, limit)).move
+        if move is None:
+            raise ValueError("Engine returned no move.")
+        return move
+
+    async def aclose(self) -> None:
+        """Terminate the engine process."""
+        engine, self.engine = self.engine, None
+        if engine is not None:
+            await engine.quit()
+
+    async def __aenter__(self) -> "AsyncStockfishPlayer":
+        """Async context manager entry."""
+        async with self._lock:
+            if self.engine is None:
+                self.engine = await self._initialize_engine()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: object | None,
+    ) -> None:
+        """Async context manager exit."""
+        await self.aclose()
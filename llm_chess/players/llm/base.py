@@ -1,18 +1,31 @@
+import logging
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from typing import Any
 
 import chess
 
-from llm_chess.core.player import ChessPlayer
+from llm_chess.core.player import AsyncChessPlayer, ChessPlayer
+from llm_chess.players.llm.cache import ResponseCache
 from llm_chess.prompts.base import PromptConfig
-from llm_chess.utils.format import convert_str_to_move
+from llm_chess.utils.format import MoveHistoryTracker, convert_str_to_move
+
+logger = logging.getLogger(__name__)
 
 
 class LLMPlayer(ChessPlayer, ABC):
     """Abstract base class for LLM-based players."""
 
-    def __init__(self, name: str, prompt_config: PromptConfig):
+    def __init__(
+        self,
+        name: str,
+        prompt_config: PromptConfig,
+        response_cache: ResponseCache | None = None,
+    ):
         super().__init__(name)
         self.prompt_config = prompt_config
+        self.response_cache = response_cache
+        self.move_history = MoveHistoryTracker()
 
     def _get_move(self, board: chess.Board) -> chess.Move:
         notation = self.prompt_config.move_notation
@@ -25,3 +38,89 @@ class LLMPlayer(ChessPlayer, ABC):
         board: chess.Board,
     ) -> str:
         pass
+
+    def get_moves_batch(self, boards: list[chess.Board]) -> list[chess.Move | None]:
+        notation = self.prompt_config.move_notation
+        moves: list[chess.Move | None] = []
+        for board, move_str in zip(boards, self._get_model_responses(boards), strict=True):
+            try:
+                move = convert_str_to_move(board, move_str, notation) if move_str else None
+            except ValueError as e:
+                logger.warning(f"{self.name} returned an invalid move: {e}")
+                move = None
+            moves.append(move if move is not None and board.is_legal(move) else None)
+        return moves
+
+    def _get_model_responses(self, boards: list[chess.Board]) -> list[str | None]:
+        """
+        Get the model's response for each of several positions, or None where there
+        was no response. Players whose APIs accept many prompts in one request override
+        this; by default, one request is made per position.
+        """
+        responses: list[str | None] = []
+        for board in boards:
+            try:
+                responses.append(self._get_model_response(board))
+            except Exception as e:
+                logger.warning(f"{self.name} failed to respond: {e}")
+                responses.append(None)
+        return responses
+
+    def _call_with_cache(self, request: dict[str, Any], call: Callable[[], str]) -> str:
+        """
+        Return the cached response to a request, or make the call and cache its result.
+
+        Args:
+            request: Everything that determines the response, e.g. the model, base URL,
+                temperature, messages and response schema. Requests with a non-zero
+                temperature are never cached.
+            call: Makes the API call on a cache miss.
+        """
+        if self.response_cache is None or request.get("temperature") != 0:
+            return call()
+        key = self.response_cache.key(request)
+        response = self.response_cache.get(key)
+        if response is None:
+            response = call()
+            self.response_cache.put(key, response)
+        return response
+
+
+class AsyncLLMPlayer(AsyncChessPlayer, ABC):
+    """Abstract base class for LLM-based players that call their models asynchronously."""
+
+    def __init__(
+        self,
+        name: str,
+        prompt_config: PromptConfig,
+        response_cache: ResponseCache | None = None,
+    ):
+        super().__init__(name)
+        self.prompt_config = prompt_config
+        self.response_cache = response_cache
+        self.move_history = MoveHistoryTracker()
+
+    async def _get_move(self, board: chess.Board) -> chess.Move:
+        notation = self.prompt_config.move_notation
+        move_str = await self._get_model_response(board)
+        return convert_str_to_move(board, move_str, notation)
+
+    @abstractmethod
+    async def _get_model_response(
+        self,
+        board: chess.Board,
+    ) -> str:
+        pass
+
+    async def _call_with_cache(
+        self, request: dict[str, Any], call: Callable[[], Awaitable[str]]
+    ) -> str:
+        """The async counterpart of `LLMPlayer._call_with_cache`."""
+        if self.response_cache is None or request.get("temperature") != 0:
+            return await call()
+        key = self.response_cache.key(request)
+        response = self.response_cache.get(key)
+        if response is None:
+            response = await call()
+            self.response_cache.put(key, response)
+        return response
@@ -0,0 +1,350 @@
+import io
+import json
+import logging
+import random
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+import chess
+import openai
+
+from llm_chess.core.game_manager import GameState
+from llm_chess.core.player import ChessPlayer
+from llm_chess.core.position import position_context
+from llm_chess.prompts.base import PromptConfig
+from llm_chess.utils.format import convert_str_to_move
+
+logger = logging.getLogger(__name__)
+
+# A single line of a batch input file, in the OpenAI Batch format:
+# {"custom_id": ..., "method": "POST", "url": ..., "body": {...}}
+BatchRequest = dict[str, Any]
+# A single line of a batch output file:
+# {"id": ..., "custom_id": ..., "response": {"status_code": ..., "body": {...}}, "error": ...}
+BatchResult = dict[str, Any]
+
+
+class BatchablePlayer(ABC):
+    """
+    Mixin for LLM players whose move requests can be submitted as part of a batch,
+    rather than sent one at a time.
+    """
+
+    prompt_config: PromptConfig
+
+    @abstractmethod
+    def _build_batch_request(self, board: chess.Board) -> tuple[str, dict[str, Any]]:
+        """Return the endpoint URL and request body for a move in the given position."""
+
+    @abstractmethod
+    def _parse_batch_response(self, body: dict[str, Any]) -> str:
+        """Extract the move string from a response body."""
+
+    def build_batch_request(self, board: chess.Board, custom_id: str) -> BatchRequest:
+        url, body = self._build_batch_request(board)
+        return {"custom_id": custom_id, "method": "POST", "url": url, "body": body}
+
+    def get_batch_move(self, board: chess.Board, result: BatchResult) -> chess.Move:
+        """
+        Convert a batch result into a move.
+
+        Raises:
+            RuntimeError: If the request failed.
+            ValueError: If the response does not contain a legal move.
+        """
+        response = result.get("response") or {}
+        if result.get("error") or response.get("status_code") != 200:
+            error = result.get("error") or response.get("body")
+            raise RuntimeError(f"Error during API call: {error}")
+        move_str = self._parse_batch_response(response["body"])
+        move = convert_str_to_move(board, move_str, self.prompt_config.move_notation)
+        if not position_context(board).is_legal(move):
+            raise ValueError(f"Invalid move: {move}")
+        return move
+
+
+def read_jsonl(path: str | Path) -> list[dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_jsonl(path: str | Path, lines: Iterable[dict[str, Any]]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(json.dumps(line) + "\n")
+
+
+class BatchBackend(ABC):
+    """Submits batches of requests and collects their results."""
+
+    @abstractmethod
+    def submit(self, requests: list[BatchRequest]) -> str:
+        """
+        Submit a batch of requests, all to the same endpoint.
+
+        Returns:
+            The batch ID, to be passed to `poll`.
+        """
+
+    @abstractmethod
+    def poll(self, batch_id: str) -> list[BatchResult] | None:
+        """
+        Return the results of a batch, or None if it has not finished yet.
+
+        Raises:
+            RuntimeError: If the batch failed, expired or was cancelled.
+        """
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """Submits batches to the OpenAI Batch API."""
+
+    def __init__(
+        self,
+        client: openai.OpenAI | None = None,
+        completion_window: str = "24h",
+    ):
+        """
+        Args:
+            client: The client to submit batches with. If None, one is created from the
+                `OPENAI_API_KEY` environment variable.
+            completion_window: The time frame within which each batch should complete.
+        """
+        self.client = client or openai.OpenAI()
+        self.completion_window = completion_window
+
+    def submit(self, requests: list[BatchRequest]) -> str:
+        urls = {request["url"] for request in requests}
+        if len(urls) != 1:
+            raise ValueError(f"All requests in a batch must share one endpoint, got: {urls}")
+        data = "".join(json.dumps(request) + "\n" for request in requests).encode()
+        batch_file = self.client.files.create(
+            file=("batch.jsonl", io.BytesIO(data)), purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=urls.pop(),
+            completion_window=self.completion_window,  # type: ignore[arg-type]
+        )
+        return batch.id
+
+    def poll(self, batch_id: str) -> list[BatchResult] | None:
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status in ("failed", "expired", "cancelled"):
+            raise RuntimeError(f"Batch {batch_id} {batch.status}: {batch.errors}")
+        if batch.status != "completed":
+            return None
+        results: list[BatchResult] = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id is not None:
+                text = self.client.files.content(file_id).text
+                results.extend(json.loads(line) for line in text.splitlines() if line.strip())
+        return results
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    File-based stand-in for a batch API, for testing the batch pipeline offline.
+
+    Each batch is written to `<batch_id>_input.jsonl` in the given directory. When the
+    batch is polled, every request is passed to `responder` and the results are written
+    to `<batch_id>_output.jsonl` in the OpenAI batch output format.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        responder: Callable[[BatchRequest], dict[str, Any]],
+    ):
+        """
+        Args:
+            directory: Directory in which to write the batch files.
+            responder: Callable that takes a request and returns its response body.
+                Exceptions are recorded as failed requests.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.responder = responder
+
+    def _input_path(self, batch_id: str) -> Path:
+        return self.directory / f"{batch_id}_input.jsonl"
+
+    def _output_path(self, batch_id: str) -> Path:
+        return self.directory / f"{batch_id}_output.jsonl"
+
+    def submit(self, requests: list[BatchRequest]) -> str:
+        batch_id = f"batch_{uuid.uuid4().hex}"
+        write_jsonl(self._input_path(batch_id), requests)
+        return batch_id
+
+    def poll(self, batch_id: str) -> list[BatchResult] | None:
+        output_path = self._output_path(batch_id)
+        if not output_path.exists():
+            write_jsonl(output_path, map(self._respond, read_jsonl(self._input_path(batch_id))))
+        return read_jsonl(output_path)
+
+    def _respond(self, request: BatchRequest) -> BatchResult:
+        result: BatchResult = {
+            "id": f"batch_req_{uuid.uuid4().hex}",
+            "custom_id": request["custom_id"],
+            "response": None,
+            "error": None,
+        }
+        try:
+            body = self.responder(request)
+            result["response"] = {"status_code": 200, "request_id": result["id"], "body": body}
+        except Exception as e:
+            result["error"] = {"code": type(e).__name__, "message": str(e)}
+        return result
+
+
+class BatchGameRunner:
+    """
+    Plays many games at once, collecting the move requests of every game whose batchable
+    player is to move into a single batch. When the batch completes, each game resumes
+    with its move and the next batch is built, until every game is over.
+
+    Players that do not support batching (e.g. engines) move immediately, as soon as it
+    is their turn.
+    """
+
+    def __init__(self, backend: BatchBackend, poll_interval: float = 30.0):
+        """
+        Args:
+            backend: The backend used to submit batches.
+            poll_interval: Seconds to wait between checks for batch completion.
+        """
+        self.backend = backend
+        self.poll_interval = poll_interval
+
+    def run_batch(self, requests: list[BatchRequest]) -> dict[str, BatchResult]:
+        """Submit requests, one batch per endpoint, and wait for all of their results."""
+        by_url: dict[str, list[BatchRequest]] = defaultdict(list)
+        for request in requests:
+            by_url[request["url"]].append(request)
+        batch_ids = [self.backend.submit(url_requests) for url_requests in by_url.values()]
+
+        results = {}
+        for batch_id in batch_ids:
+            while (batch_results := self.backend.poll(batch_id)) is None:
+                time.sleep(self.poll_interval)
+            results.update({result["custom_id"]: result for result in batch_results})
+        return results
+
+    def get_moves(
+        self, player: BatchablePlayer, boards: Iterable[chess.Board]
+    ) -> list[chess.Move | None]:
+        """
+        Request a move from the player in each position, as a single batch.
+
+        Returns:
+            The move for each position, in order, or None where no legal move was
+            returned.
+        """
+        boards = list(boards)
+        requests = [
+            player.build_batch_request(board, f"position-{i}") for i, board in enumerate(boards)
+        ]
+        results = self.run_batch(requests)
+        moves: list[chess.Move | None] = []
+        for request, board in zip(requests, boards, strict=True):
+            try:
+                moves.append(player.get_batch_move(board, results[request["custom_id"]]))
+            except Exception as e:
+                logger.warning(f"No move for {request['custom_id']}: {e}")
+                moves.append(None)
+        return moves
+
+    def play_games(
+        self,
+        games: Iterable[tuple[ChessPlayer, ChessPlayer, chess.Board | None]],
+        max_half_moves: int = 400,
+        n_randomised_starting_half_moves: int = 0,
+    ) -> list[tuple[chess.Board, str]]:
+        """
+        Plays many games, batching the moves of batchable players.
+
+        Args:
+            games: (white, black, board) triples, one per game.
+            max_half_moves: Maximum number of half-moves allowed in each game.
+            n_randomised_starting_half_moves: Number of random moves to make before
+                using the players' strategies.
+
+        Returns:
+            The final board state and result of each game, in the order supplied.
+        """
+        states = [
+            GameState(white, black, board if board is not None else chess.Board())
+            for white, black, board in games
+        ]
+        while True:
+            requests = []
+            for i, state in enumerate(states):
+                self._advance(state, max_half_moves, n_randomised_starting_half_moves)
+                if state.result is None:
+                    player = self._current_player(state)
+                    assert isinstance(player, BatchablePlayer)
+                    custom_id = f"game-{i}-ply-{len(state.board.move_stack)}"
+                    requests.append(player.build_batch_request(state.board, custom_id))
+                    state.custom_id = custom_id
+            if not requests:
+                break
+
+            results = self.run_batch(requests)
+            for state in states:
+                if state.result is not None:
+                    continue
+                player = self._current_player(state)
+                assert isinstance(player, BatchablePlayer) and state.custom_id is not None
+                try:
+                    move = player.get_batch_move(state.board, results[state.custom_id])
+                except Exception as e:
+                    print(f"Error: {e}")
+                    state.result = f"Illegal move by {player.name}"
+                    continue
+                state.board.push(move)
+                state.n_half_moves += 1
+
+        return [(state.board, state.result or state.board.result()) for state in states]
+
+    @staticmethod
+    def _current_player(state: GameState) -> ChessPlayer:
+        return state.white if state.board.turn == chess.WHITE else state.black
+
+    def _advance(
+        self, state: GameState, max_half_moves: int, n_randomised_starting_half_moves: int
+    ) -> None:
+        """
+        Play moves that don't need a batch until a batchable player is to move. Sets the
+        game's result if it ends.
+        """
+        board = state.board
+        while state.result is None:
+            if position_context(board).is_game_over or state.n_half_moves > max_half_moves:
+                state.result = board.result()
+                return
+
+            current_player = self._current_player(state)
+            move: chess.Move | None
+            if state.n_half_moves < n_randomised_starting_half_moves:
+                move = random.choice(position_context(board).legal_moves)
+            elif isinstance(current_player, BatchablePlayer):
+                return
+            else:
+                try:
+                    move = current_player.make_move(board)
+                except Exception as e:
+                    print(f"Error: {e}")
+                    state.result = f"Illegal move by {current_player.name}"
+                    return
+                if move is None:
+                    state.result = board.result()
+                    return
+
+            board.push(move)
+            state.n_half_moves += 1
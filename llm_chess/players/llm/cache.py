@@ -0,0 +1,72 @@
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from llm_chess.utils.cache import LRUCache, SQLiteCache
+
+
+class ResponseCache:
+    """
+    Cache of raw model responses, keyed by a hash of everything that determines the
+    response: the model, the endpoint, the sampling temperature, the rendered prompt
+    or messages, and the response schema. Lookups go to an in-memory LRU first, then
+    to an optional on-disk store that several processes can share.
+
+    Only deterministic requests, i.e. those with a temperature of zero, are cached, so
+    that sampling at a higher temperature still returns varied responses.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        max_memory_entries: int = 10_000,
+        max_disk_bytes: int | None = 256 * 1024**2,
+        ttl: float | None = None,
+    ):
+        """
+        Args:
+            path: Path to an SQLite file for the on-disk layer. If None, responses are
+                only cached in memory.
+            max_memory_entries: Maximum number of responses held in memory.
+            max_disk_bytes: Approximate maximum size of the on-disk layer. The least
+                recently used responses are evicted beyond this size.
+            ttl: Seconds after which a cached response expires. If None, responses
+                never expire.
+        """
+        self.memory: LRUCache[str, tuple[str, float]] = LRUCache(max_memory_entries)
+        self.disk = SQLiteCache(path, max_disk_bytes, ttl) if path is not None else None
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(request: dict[str, Any]) -> str:
+        """Hash a request. Values that aren't JSON serialisable are hashed by `repr`."""
+        data = json.dumps(request, sort_keys=True, default=repr)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        entry = self.memory.get(key)
+        if entry is not None and self.ttl is not None and entry[1] < time.time() - self.ttl:
+            entry = None
+        if entry is None and self.disk is not None:
+            # Keep the original write time, so the entry expires when it does on disk
+            entry = self.disk.get_entry(key)
+            if entry is not None:
+                self.memory.put(key, entry)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: str, response: str) -> None:
+        self.memory.put(key, (response, time.time()))
+        if self.disk is not None:
+            self.disk.put(key, response)
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
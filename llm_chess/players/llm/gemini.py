@@ -1,5 +1,6 @@
 import json
 import os
+from collections.abc import Callable
 from typing import Any
 
 import chess
@@ -7,60 +8,82 @@ from google import genai
 from google.genai import types
 
 from llm_chess.core.enums import APIResponseFormat
-from llm_chess.players.llm.base import LLMPlayer
+from llm_chess.core.position import position_context
+from llm_chess.players.llm.base import AsyncLLMPlayer, LLMPlayer
+from llm_chess.players.llm.cache import ResponseCache
+from llm_chess.players.llm.rate_limit import (
+    RateLimiter,
+    async_rate_limited,
+    estimate_tokens,
+    rate_limited,
+)
+from llm_chess.players.llm.schemas import schema_cache
+from llm_chess.players.llm.streaming import StreamingResponseMixin
+from llm_chess.players.llm.transport import Transport
 from llm_chess.prompts.base import PromptConfig
-from llm_chess.utils.format import format_legal_moves, format_moves_history
+from llm_chess.utils.format import MoveHistoryTracker, format_legal_moves
 
+GeminiContents = str | list[dict[str, Any]]
 
-class GeminiPlayer(LLMPlayer):
 
-    def __init__(
-        self,
-        name: str,
-        prompt_config: PromptConfig,
-        model: str = "gemini-2.0-flash-001",
-        api_key: str | None = None,
-        temperature: float = 0.0,
-    ):
-        super().__init__(name, prompt_config)
-        self.model = model
-        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
-        if self.api_key is None:
-            raise ValueError("GEMINI_API_KEY must be set in the environment or passed as argument.")
-        self.temperature = temperature
-        self.client = genai.Client(api_key=self.api_key)
-
-        self.response_handlers = {
-            APIResponseFormat.STRUCTURED: self._handle_structured_response,
-            APIResponseFormat.JSON: self._handle_structured_response,
-            APIResponseFormat.ENUM: self._handle_enum_response,
-            APIResponseFormat.TEXT: self._handle_enum_response,
-            APIResponseFormat.MULTI_TURN: self._handle_multi_turn_response,
-        }
+def _total_tokens(response: Any) -> int | None:
+    """The total token usage reported in a generate-content response, if any."""
+    usage = getattr(response, "usage_metadata", None)
+    total_tokens = getattr(usage, "total_token_count", None)
+    return total_tokens if isinstance(total_tokens, int) else None
 
-    def _get_model_response(self, board: chess.Board) -> str:
-        prompt = self.prompt_config.build_prompt(board)
+
+def _dump_config(config: types.GenerateContentConfig) -> Any:
+    """The JSON-compatible form of a generation config, reused if it came from the schema cache."""
+    compiled = schema_cache.find(config)
+    if compiled is not None:
+        return compiled.data
+    return config.model_dump(mode="json", exclude_none=True)
+
+
+class GeminiRequestMixin(StreamingResponseMixin):
+    """
+    Builds generate-content requests and parses their responses. Shared by the sync and
+    async Gemini players, which differ only in how the request is sent.
+    """
+
+    prompt_config: PromptConfig
+    temperature: float
+    move_history: MoveHistoryTracker
+
+    def _build_request(
+        self, prompt: str, board: chess.Board
+    ) -> tuple[GeminiContents, types.GenerateContentConfig]:
+        request_builders = {
+            APIResponseFormat.STRUCTURED: self._build_structured_request,
+            APIResponseFormat.JSON: self._build_structured_request,
+            APIResponseFormat.ENUM: self._build_enum_request,
+            APIResponseFormat.TEXT: self._build_enum_request,
+            APIResponseFormat.MULTI_TURN: self._build_multi_turn_request,
+        }
         try:
-            handler = self.response_handlers[self.prompt_config.api_response_format]
+            builder = request_builders[self.prompt_config.api_response_format]
         except KeyError as e:
             raise ValueError(
                 f"Unsupported API response format: {self.prompt_config.api_response_format}"
             ) from e
-        return handler(prompt, board)
+        return builder(prompt, board)
 
-    def _handle_multi_turn_response(self, prompt: str, board: chess.Board) -> str:
+    def _build_multi_turn_request(
+        self, prompt: str, board: chess.Board
+    ) -> tuple[GeminiContents, types.GenerateContentConfig]:
         notation = self.prompt_config.move_notation
-        formatted_moves_history = format_moves_history(board, notation)
+        formatted_moves_history = self.move_history.format(board, notation)
         formatted_legal_moves = format_legal_moves(board, notation)
-
-        config = types.GenerateContentConfig(
-            temperature=self.temperature,
-            response_mime_type="text/x.enum",
-            response_schema={"type": "STRING", "enum": formatted_legal_moves},
+        config = self._response_config(
+            "text/x.enum",
+            formatted_legal_moves,
+            False,
+            lambda: {"type": "STRING", "enum": formatted_legal_moves},
         )
 
         model_is_white = len(formatted_moves_history) % 2 == 0
-        chat_history = [
+        chat_history: list[dict[str, Any]] = [
             {
                 "role": "user",
                 "parts": [{"text": prompt}],
@@ -80,52 +103,228 @@ class GeminiPlayer(LLMPlayer):
             author = "model" if is_model_turn else "user"
             chat_history.append({"role": author, "parts": [{"text": move}]})
 
-        return self._call_model(chat_history, config)
+        return chat_history, config
 
-    def _handle_enum_response(self, prompt: str, board: chess.Board) -> str:
-        notation = self.prompt_config.move_notation
-        legal_moves = format_legal_moves(
-            board, notation, self.prompt_config.move_response_has_leading_space
+    def _build_enum_request(
+        self, prompt: str, board: chess.Board
+    ) -> tuple[GeminiContents, types.GenerateContentConfig]:
+        leading_space = self.prompt_config.move_response_has_leading_space
+        legal_moves = format_legal_moves(board, self.prompt_config.move_notation, leading_space)
+        config = self._response_config(
+            "text/x.enum",
+            legal_moves,
+            leading_space,
+            lambda: {"type": "STRING", "enum": legal_moves},
         )
+        return prompt, config
 
-        config = types.GenerateContentConfig(
-            temperature=self.temperature,
-            response_mime_type="text/x.enum",
-            response_schema={"type": "STRING", "enum": legal_moves},
-        )
-        return self._call_model(prompt, config)
-
-    def _handle_structured_response(self, prompt: str, board: chess.Board) -> str:
-        notation = self.prompt_config.move_notation
-        legal_moves = format_legal_moves(
-            board, notation, self.prompt_config.move_response_has_leading_space
-        )
-
-        config = types.GenerateContentConfig(
-            temperature=self.temperature,
-            response_mime_type="application/json",
-            response_schema={
+    def _build_structured_request(
+        self, prompt: str, board: chess.Board
+    ) -> tuple[GeminiContents, types.GenerateContentConfig]:
+        leading_space = self.prompt_config.move_response_has_leading_space
+        legal_moves = format_legal_moves(board, self.prompt_config.move_notation, leading_space)
+        config = self._response_config(
+            "application/json",
+            legal_moves,
+            leading_space,
+            lambda: {
                 "type": "object",
                 "properties": {"move": {"type": "string", "enum": legal_moves}},
             },
         )
-        response = self._call_model(prompt, config)
+        return prompt, config
+
+    def _response_config(
+        self,
+        mime_type: str,
+        legal_moves: list[str],
+        leading_space: bool,
+        build_schema: Callable[[], dict[str, Any]],
+    ) -> types.GenerateContentConfig:
+        """The generation config that constrains the response to the legal moves, cached."""
+        compiled = schema_cache.get(
+            ("gemini", mime_type, self.temperature),
+            self.prompt_config.move_notation,
+            leading_space,
+            legal_moves,
+            lambda: types.GenerateContentConfig(
+                temperature=self.temperature,
+                response_mime_type=mime_type,
+                response_schema=build_schema(),
+            ),
+            dump=lambda config: config.model_dump(mode="json", exclude_none=True),
+        )
+        return compiled.value
+
+    def _parse_response(self, response: str) -> str:
+        if not self._is_structured():
+            return response
         try:
             return str(json.loads(response)["move"])
         except (json.JSONDecodeError, KeyError) as e:
             raise ValueError("Invalid response format from the model") from e
 
+
+class GeminiPlayer(GeminiRequestMixin, LLMPlayer):
+
+    def __init__(
+        self,
+        name: str,
+        prompt_config: PromptConfig,
+        model: str = "gemini-2.0-flash-001",
+        api_key: str | None = None,
+        temperature: float = 0.0,
+        response_cache: ResponseCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        transport: Transport | None = None,
+        stream: bool = False,
+    ):
+        super().__init__(name, prompt_config, response_cache)
+        self.model = model
+        self.rate_limiter = rate_limiter
+        self.stream = stream
+        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        if self.api_key is None:
+            raise ValueError("GEMINI_API_KEY must be set in the environment or passed as argument.")
+        self.temperature = temperature
+        self.client = (
+            transport.gemini_client(self.api_key)
+            if transport is not None
+            else genai.Client(api_key=self.api_key)
+        )
+
+    def _get_model_response(self, board: chess.Board) -> str:
+        prompt = position_context(board).prompt(self.prompt_config)
+        contents, config = self._build_request(prompt, board)
+        request = {
+            "model": self.model,
+            "temperature": self.temperature,
+            "contents": contents,
+            "config": _dump_config(config),
+        }
+        response = self._call_with_cache(request, lambda: self._call_model(contents, config))
+        return self._parse_response(response)
+
     def _call_model(
         self,
-        contents: str | list[dict[str, Any]],
+        contents: GeminiContents,
         generation_config: types.GenerateContentConfig,
     ) -> str:
+        estimated_tokens = estimate_tokens(
+            json.dumps(contents),
+            schema_cache.serialise(
+                generation_config, lambda config: config.model_dump_json(exclude_none=True)
+            ),
+        )
         try:
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=contents,
-                config=generation_config,
-            )
+            with rate_limited(self.rate_limiter, estimated_tokens) as lease:
+                if self.stream:
+                    return self._stream_model(contents, generation_config)
+                response = self.client.models.generate_content(
+                    model=self.model,
+                    contents=contents,
+                    config=generation_config,
+                )
+                lease.tokens = _total_tokens(response)
             return str(response.text).strip()
         except Exception as e:
             raise RuntimeError(f"Error during API call: {e}") from e
+
+    def _stream_model(
+        self,
+        contents: GeminiContents,
+        generation_config: types.GenerateContentConfig,
+    ) -> str:
+        """Stream the response, closing the stream as soon as the move is complete."""
+        stream = self.client.models.generate_content_stream(
+            model=self.model,
+            contents=contents,
+            config=generation_config,
+        )
+        try:
+            return self._read_stream(chunk.text or "" for chunk in stream).strip()
+        finally:
+            stream.close()  # type: ignore[attr-defined]
+
+
+class AsyncGeminiPlayer(GeminiRequestMixin, AsyncLLMPlayer):
+    """Gemini player that uses the client's async interface."""
+
+    def __init__(
+        self,
+        name: str,
+        prompt_config: PromptConfig,
+        model: str = "gemini-2.0-flash-001",
+        api_key: str | None = None,
+        temperature: float = 0.0,
+        response_cache: ResponseCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        transport: Transport | None = None,
+        stream: bool = False,
+    ):
+        super().__init__(name, prompt_config, response_cache)
+        self.model = model
+        self.rate_limiter = rate_limiter
+        self.stream = stream
+        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        if self.api_key is None:
+            raise ValueError("GEMINI_API_KEY must be set in the environment or passed as argument.")
+        self.temperature = temperature
+        self.client = (
+            transport.gemini_client(self.api_key)
+            if transport is not None
+            else genai.Client(api_key=self.api_key)
+        )
+
+    async def _get_model_response(self, board: chess.Board) -> str:
+        prompt = position_context(board).prompt(self.prompt_config)
+        contents, config = self._build_request(prompt, board)
+        request = {
+            "model": self.model,
+            "temperature": self.temperature,
+            "contents": contents,
+            "config": _dump_config(config),
+        }
+        response = await self._call_with_cache(request, lambda: self._call_model(contents, config))
+        return self._parse_response(response)
+
+    async def _call_model(
+        self,
+        contents: GeminiContents,
+        generation_config: types.GenerateContentConfig,
+    ) -> str:
+        estimated_tokens = estimate_tokens(
+            json.dumps(contents),
+            schema_cache.serialise(
+                generation_config, lambda config: config.model_dump_json(exclude_none=True)
+            ),
+        )
+        try:
+            async with async_rate_limited(self.rate_limiter, estimated_tokens) as lease:
+                if self.stream:
+                    return await self._stream_model(contents, generation_config)
+                response = await self.client.aio.models.generate_content(
+                    model=self.model,
+                    contents=contents,
+                    config=generation_config,
+                )
+                lease.tokens = _total_tokens(response)
+            return str(response.text).strip()
+        except Exception as e:
+            raise RuntimeError(f"Error during API call: {e}") from e
+
+    async def _stream_model(
+        self,
+        contents: GeminiContents,
+        generation_config: types.GenerateContentConfig,
+    ) -> str:
+        """Stream the response, closing the stream as soon as the move is complete."""
+        stream = await self.client.aio.models.generate_content_stream(
+            model=self.model,
+            contents=contents,
+            config=generation_config,
+        )
+        try:
+            return (await self._aread_stream(chunk.text or "" async for chunk in stream)).strip()
+        finally:
+            await stream.aclose()  # type: ignore[attr-defined]
@@ -1,15 +1,35 @@
+import logging
 import os
+from collections.abc import Callable
 from enum import Enum
+from typing import Any
 
 import chess
 from pydantic import BaseModel, Field
 from xai_sdk import Client
-from xai_sdk.chat import user
+from xai_sdk.chat import assistant, user
 
-from llm_chess.core.enums import APIResponseFormat
+from llm_chess.core.enums import APIResponseFormat, ContextPolicy, MoveNotation
+from llm_chess.core.position import position_context
 from llm_chess.players.llm.base import LLMPlayer
+from llm_chess.players.llm.cache import ResponseCache
+from llm_chess.players.llm.schemas import schema_cache
 from llm_chess.prompts.base import PromptConfig
-from llm_chess.utils.format import format_legal_moves
+from llm_chess.utils.format import convert_move_to_str, convert_str_to_move, format_legal_moves
+
+logger = logging.getLogger(__name__)
+
+
+def _move_response_model(
+    notation: MoveNotation, formatted_legal_moves: list[str]
+) -> type[BaseModel]:
+    """A response model whose move must be one of the legal moves."""
+    Move = Enum("Move", {move: move for move in formatted_legal_moves}, type=str)  # type: ignore
+
+    class MoveResponse(BaseModel):  # type: ignore
+        move: Move = Field(..., description=f"The move to play in {notation.value} format.")
+
+    return MoveResponse
 
 
 class GrokPlayer(LLMPlayer):
@@ -29,6 +49,21 @@ class GrokPlayer(LLMPlayer):
         prompt_config=pgn_prompt_config,
     )
     ```
+
+    `context_policy` controls what the model sees of the game so far:
+
+    - APPEND (the default): every prompt is appended to a single chat kept for the
+      player's lifetime, without the model's responses.
+    - STATELESS: each move is a new chat holding only the current prompt. Best for
+      prompts that already contain the whole game, e.g. PGN.
+    - SLIDING_WINDOW: the last `context_window` prompts and responses precede the
+      current prompt.
+    - MULTI_TURN: the first prompt of a game is sent once, and each later move appends
+      only the opponent's moves since the player's last move, in the prompt's notation.
+
+    Except under APPEND, a new game is detected when the board's moves don't continue
+    the previous game, so the player can be reused across games. `input_token_counts`
+    records the input tokens of each API call, so the growth of the context is visible.
     """
 
     def __init__(
@@ -39,13 +74,25 @@ class GrokPlayer(LLMPlayer):
         api_key: str | None = None,
         temperature: float = 0.0,
         timeout: int = 3600,
+        response_cache: ResponseCache | None = None,
+        context_policy: ContextPolicy = ContextPolicy.APPEND,
+        context_window: int = 4,
     ):
-        super().__init__(name, prompt_config)
+        super().__init__(name, prompt_config, response_cache)
+        self.context_policy = context_policy
+        self.context_window = context_window
+        self.model = model
+        self.temperature = temperature
         self.api_key = api_key or os.getenv("GROK_API_KEY")
         if self.api_key is None:
             raise ValueError("GROK_API_KEY must be set in the environment or passed as argument.")
         self.client = Client(api_key=self.api_key, timeout=timeout)
-        self.chat = self.client.chat.create(model=model, temperature=temperature)
+        # (user message, response) pairs of the current game, or of the player's
+        # lifetime under APPEND
+        self.exchanges: list[tuple[str, str]] = []
+        # The board's moves when the player last moved, followed by its move
+        self._game_moves: list[chess.Move] = []
+        self.input_token_counts: list[int] = []
 
         self.response_handlers = {
             # APIResponseFormat.STRUCTURED: self._handle_structured_response,
@@ -56,7 +103,7 @@ class GrokPlayer(LLMPlayer):
         }
 
     def _get_model_response(self, board: chess.Board) -> str:
-        prompt = self.prompt_config.build_prompt(board)
+        prompt = position_context(board).prompt(self.prompt_config)
         try:
             handler = self.response_handlers[self.prompt_config.api_response_format]
         except KeyError as e:
@@ -65,20 +112,108 @@ class GrokPlayer(LLMPlayer):
             ) from e
         return handler(prompt, board)
 
+    def _user_message(self, prompt: str, board: chess.Board) -> str:
+        """The next user message, starting a new game if the board doesn't continue it."""
+        n_previous = len(self._game_moves)
+        new_game = board.move_stack[:n_previous] != self._game_moves or n_previous == 0
+        if new_game and self.context_policy != ContextPolicy.APPEND:
+            self.exchanges = []
+        if self.context_policy != ContextPolicy.MULTI_TURN or not self.exchanges:
+            return prompt
+
+        # Format the opponent's moves since the player's last move
+        new_moves = board.move_stack[n_previous:]
+        before = board.copy()
+        for _ in new_moves:
+            before.pop()
+        formatted_moves = []
+        for move in new_moves:
+            formatted_moves.append(
+                convert_move_to_str(before, move, self.prompt_config.move_notation)
+            )
+            before.push(move)
+        return " ".join(formatted_moves)
+
+    def _messages(self, user_message: str) -> list[tuple[str, str]]:
+        """The (role, content) messages to send, under the context policy."""
+        if self.context_policy == ContextPolicy.APPEND:
+            user_contents = [user_content for user_content, _ in self.exchanges]
+            return [("user", content) for content in [*user_contents, user_message]]
+        if self.context_policy == ContextPolicy.STATELESS:
+            exchanges = []
+        elif self.context_policy == ContextPolicy.SLIDING_WINDOW:
+            exchanges = self.exchanges[-self.context_window :] if self.context_window else []
+        else:
+            exchanges = self.exchanges
+        messages = []
+        for user_content, assistant_content in exchanges:
+            messages += [("user", user_content), ("assistant", assistant_content)]
+        return messages + [("user", user_message)]
+
+    def _create_chat(self, messages: list[tuple[str, str]]) -> Any:
+        return self.client.chat.create(
+            model=self.model,
+            temperature=self.temperature,
+            messages=[
+                user(content) if role == "user" else assistant(content)
+                for role, content in messages
+            ],
+        )
+
+    def _record_usage(self, response: Any) -> None:
+        input_tokens = int(response.usage.prompt_tokens)
+        self.input_token_counts.append(input_tokens)
+        logger.info(f"{self.name} sent {input_tokens} input tokens.")
+
+    def _respond(
+        self, prompt: str, board: chess.Board, response_format: str, call: Callable[[Any], str]
+    ) -> str:
+        """
+        Send the messages for this move under the context policy and record the
+        exchange.
+
+        Args:
+            call: Samples a move from a chat holding the messages.
+        """
+        user_message = self._user_message(prompt, board)
+        messages = self._messages(user_message)
+        request = {
+            "model": self.model,
+            "temperature": self.temperature,
+            "messages": messages,
+            "response_format": response_format,
+        }
+        response = self._call_with_cache(request, lambda: call(self._create_chat(messages)))
+        self.exchanges.append((user_message, response))
+        try:
+            move = convert_str_to_move(board, response, self.prompt_config.move_notation)
+            self._game_moves = [*board.move_stack, move]
+        except ValueError:
+            self._game_moves = []
+        return response
+
     def _handle_text_response(self, prompt: str, board: chess.Board) -> str:
-        self.chat.append(user(prompt))
-        response = self.chat.sample()
-        return str(response.content.strip())
+        def call_model(chat: Any) -> str:
+            response = chat.sample()
+            self._record_usage(response)
+            return str(response.content.strip())
+
+        return self._respond(prompt, board, "text", call_model)
 
     def _handle_enum_response(self, prompt: str, board: chess.Board) -> str:
         notation = self.prompt_config.move_notation
         formatted_legal_moves = format_legal_moves(board, notation)
+        MoveResponse = schema_cache.get(
+            "grok",
+            notation,
+            False,
+            formatted_legal_moves,
+            lambda: _move_response_model(notation, formatted_legal_moves),
+        ).value
 
-        Move = Enum("Move", {move: move for move in formatted_legal_moves}, type=str)  # type: ignore
-
-        class MoveResponse(BaseModel):  # type: ignore
-            move: Move = Field(..., description=f"The move to play in {notation.value} format.")
+        def call_model(chat: Any) -> str:
+            response, move_response = chat.parse(MoveResponse)
+            self._record_usage(response)
+            return str(move_response.move.value)
 
-        self.chat.append(user(prompt))
-        _, move_response = self.chat.parse(MoveResponse)
-        return str(move_response.move)
+        return self._respond(prompt, board, f"enum:{','.join(formatted_legal_moves)}", call_model)
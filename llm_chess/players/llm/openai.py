@@ -6,53 +6,88 @@ import backoff
 import chess
 import openai
 
-from llm_chess.core.enums import APIResponseFormat
-from llm_chess.players.llm.base import LLMPlayer
+from llm_chess.core.enums import APIResponseFormat, MoveNotation
+from llm_chess.core.position import position_context
+from llm_chess.players.llm.base import AsyncLLMPlayer, LLMPlayer
+from llm_chess.players.llm.batch import BatchablePlayer
+from llm_chess.players.llm.cache import ResponseCache
+from llm_chess.players.llm.rate_limit import (
+    RateLimiter,
+    async_rate_limited,
+    estimate_tokens,
+    is_rate_limit_error,
+    rate_limited,
+)
+from llm_chess.players.llm.schemas import CompiledSchema, schema_cache
+from llm_chess.players.llm.streaming import StreamingResponseMixin
+from llm_chess.players.llm.transport import Transport
 from llm_chess.prompts.base import PromptConfig
-from llm_chess.utils.format import format_legal_moves, format_moves_history
+from llm_chess.utils.format import MoveHistoryTracker, format_legal_moves
 
 
-class OpenAIPlayer(LLMPlayer):
+def _total_tokens(response: Any) -> int | None:
+    """The total token usage reported in a completion response, if any."""
+    usage = getattr(response, "usage", None)
+    total_tokens = getattr(usage, "total_tokens", None)
+    return total_tokens if isinstance(total_tokens, int) else None
 
-    def __init__(
-        self,
-        name: str,
-        prompt_config: PromptConfig,
-        model: str = "gpt-4o-mini",
-        api_key: str | None = None,
-        temperature: float = 0.0,
-        base_url: str = "https://api.openai.com/v1",
-    ):
-        super().__init__(name, prompt_config)
-        self.model = model
-        self.temperature = temperature
-        self.base_url = base_url
 
-        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
-        if self.api_key is None:
-            raise ValueError("OPENAI_API_KEY must be set in the environment or passed as argument.")
-        self.client = openai.OpenAI(api_key=self.api_key, base_url=self.base_url)
+def _move_response_format(
+    notation: MoveNotation, formatted_legal_moves: list[str]
+) -> dict[str, Any]:
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": f"{notation.value.lower()}_chess_move",
+            "description": f"A valid chess move in {notation.value} format.",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "required": ["move"],
+                "properties": {
+                    "move": {
+                        "type": "string",
+                        "enum": formatted_legal_moves,
+                        "description": f"The chess move in {notation.value} format",
+                    }
+                },
+                "additionalProperties": False,
+            },
+        },
+    }
 
-        self.response_handlers = {
-            APIResponseFormat.STRUCTURED: self._handle_structured_response,
-            APIResponseFormat.JSON: self._handle_structured_response,
-            APIResponseFormat.TEXT: self._handle_text_response,
-            APIResponseFormat.MULTI_TURN: self._handle_multi_turn_response,
-        }
 
-    def _get_model_response(self, board: chess.Board) -> str:
-        prompt = self.prompt_config.build_prompt(board)
+class OpenAIRequestMixin(StreamingResponseMixin):
+    """
+    Builds chat completion requests and parses their responses. Shared by the sync and
+    async OpenAI players, which differ only in how the request is sent.
+    """
+
+    prompt_config: PromptConfig
+    move_history: MoveHistoryTracker
+
+    def _build_request(
+        self, prompt: str, board: chess.Board
+    ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+        request_builders = {
+            APIResponseFormat.STRUCTURED: self._build_structured_request,
+            APIResponseFormat.JSON: self._build_structured_request,
+            APIResponseFormat.TEXT: self._build_text_request,
+            APIResponseFormat.MULTI_TURN: self._build_multi_turn_request,
+        }
         try:
-            handler = self.response_handlers[self.prompt_config.api_response_format]
+            builder = request_builders[self.prompt_config.api_response_format]
         except KeyError as e:
             raise ValueError(
                 f"Unsupported API response format: {self.prompt_config.api_response_format}"
             ) from e
-        return handler(prompt, board)
+        return builder(prompt, board)
 
-    def _handle_multi_turn_response(self, prompt: str, board: chess.Board) -> str:
+    def _build_multi_turn_request(
+        self, prompt: str, board: chess.Board
+    ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
         notation = self.prompt_config.move_notation
-        formatted_moves_history = format_moves_history(board, notation)
+        formatted_moves_history = self.move_history.format(board, notation)
 
         messages = [
             {
@@ -74,20 +109,21 @@ class OpenAIPlayer(LLMPlayer):
             author = "assistant" if is_model_turn else "user"
             messages.append({"role": author, "content": move})
 
-        config = self._get_structured_response_config(board)
-        response = self._call_model(messages, config)
-        return str(response)
+        return messages, self._get_structured_response_config(board)
+
+    def _build_text_request(
+        self, prompt: str, board: chess.Board
+    ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+        return [{"role": "user", "content": prompt}], {"type": "text"}
 
-    def _handle_text_response(self, prompt: str, board: chess.Board) -> str:
-        config = {"type": "text"}
-        messages = [{"role": "user", "content": prompt}]
-        response = self._call_model(messages, config)
-        return str(response)
+    def _build_structured_request(
+        self, prompt: str, board: chess.Board
+    ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+        return [{"role": "user", "content": prompt}], self._get_structured_response_config(board)
 
-    def _handle_structured_response(self, prompt: str, board: chess.Board) -> str:
-        config = self._get_structured_response_config(board)
-        messages = [{"role": "user", "content": prompt}]
-        response = self._call_model(messages, config)
+    def _parse_response(self, response: str) -> str:
+        if not self._is_structured():
+            return str(response)
         try:
             response_dict = json.loads(response)
             return str(response_dict["move"].strip())
@@ -96,39 +132,202 @@ class OpenAIPlayer(LLMPlayer):
 
     def _get_structured_response_config(self, board: chess.Board) -> dict[str, Any]:
         notation = self.prompt_config.move_notation
-        formatted_legal_moves = format_legal_moves(
-            board, notation, self.prompt_config.move_response_has_leading_space
+        leading_space = self.prompt_config.move_response_has_leading_space
+        formatted_legal_moves = format_legal_moves(board, notation, leading_space)
+        compiled: CompiledSchema[dict[str, Any]] = schema_cache.get(
+            "openai",
+            notation,
+            leading_space,
+            formatted_legal_moves,
+            lambda: _move_response_format(notation, formatted_legal_moves),
+            dump=lambda response_format: response_format,
         )
-        return {
-            "type": "json_schema",
-            "json_schema": {
-                "name": f"{notation.value.lower()}_chess_move",
-                "description": f"A valid chess move in {notation.value} format.",
-                "strict": True,
-                "schema": {
-                    "type": "object",
-                    "required": ["move"],
-                    "properties": {
-                        "move": {
-                            "type": "string",
-                            "enum": formatted_legal_moves,
-                            "description": f"The chess move in {notation.value} format",
-                        }
-                    },
-                    "additionalProperties": False,
-                },
-            },
+        return compiled.value
+
+
+class OpenAIPlayer(OpenAIRequestMixin, BatchablePlayer, LLMPlayer):
+
+    def __init__(
+        self,
+        name: str,
+        prompt_config: PromptConfig,
+        model: str = "gpt-4o-mini",
+        api_key: str | None = None,
+        temperature: float = 0.0,
+        base_url: str = "https://api.openai.com/v1",
+        response_cache: ResponseCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        transport: Transport | None = None,
+        stream: bool = False,
+    ):
+        super().__init__(name, prompt_config, response_cache)
+        self.model = model
+        self.temperature = temperature
+        self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self.stream = stream
+
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if self.api_key is None:
+            raise ValueError("OPENAI_API_KEY must be set in the environment or passed as argument.")
+        self.client = (
+            transport.openai_client(self.api_key, self.base_url)
+            if transport is not None
+            else openai.OpenAI(api_key=self.api_key, base_url=self.base_url)
+        )
+
+    def _get_model_response(self, board: chess.Board) -> str:
+        prompt = position_context(board).prompt(self.prompt_config)
+        messages, response_format = self._build_request(prompt, board)
+        request = {
+            "model": self.model,
+            "base_url": self.base_url,
+            "temperature": self.temperature,
+            "messages": messages,
+            "response_format": response_format,
+        }
+        response = self._call_with_cache(
+            request, lambda: self._call_model(messages, response_format)
+        )
+        return self._parse_response(response)
+
+    def _build_batch_request(self, board: chess.Board) -> tuple[str, dict[str, Any]]:
+        prompt = position_context(board).prompt(self.prompt_config)
+        messages, response_format = self._build_request(prompt, board)
+        return "/v1/chat/completions", {
+            "model": self.model,
+            "messages": messages,
+            "temperature": self.temperature,
+            "response_format": response_format,
         }
 
+    def _parse_batch_response(self, body: dict[str, Any]) -> str:
+        return self._parse_response(str(body["choices"][0]["message"]["content"]))
+
     @backoff.on_exception(backoff.expo, openai.RateLimitError, max_tries=5)
     def _call_model(self, messages: list[dict[str, Any]], response_format: dict[str, Any]) -> str:
+        estimated_tokens = estimate_tokens(
+            json.dumps(messages), schema_cache.serialise(response_format)
+        )
+        try:
+            with rate_limited(self.rate_limiter, estimated_tokens) as lease:
+                if self.stream:
+                    return self._stream_model(messages, response_format)
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=self.temperature,
+                    response_format=response_format,
+                )
+                lease.tokens = _total_tokens(response)
+            return str(response.choices[0].message.content)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                raise  # Retried by `backoff`
+            raise RuntimeError(f"Error during API call: {e}") from e
+
+    def _stream_model(self, messages: list[dict[str, Any]], response_format: dict[str, Any]) -> str:
+        """Stream the response, closing the stream as soon as the move is complete."""
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature,
+            response_format=response_format,
+            stream=True,
+        )
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=self.temperature,
-                response_format=response_format,
+            return self._read_stream(
+                chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices
             )
+        finally:
+            stream.close()
+
+
+class AsyncOpenAIPlayer(OpenAIRequestMixin, AsyncLLMPlayer):
+    """OpenAI player that uses the async client, for use with `AsyncGameManager`."""
+
+    def __init__(
+        self,
+        name: str,
+        prompt_config: PromptConfig,
+        model: str = "gpt-4o-mini",
+        api_key: str | None = None,
+        temperature: float = 0.0,
+        base_url: str = "https://api.openai.com/v1",
+        response_cache: ResponseCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        transport: Transport | None = None,
+        stream: bool = False,
+    ):
+        super().__init__(name, prompt_config, response_cache)
+        self.model = model
+        self.temperature = temperature
+        self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self.stream = stream
+
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if self.api_key is None:
+            raise ValueError("OPENAI_API_KEY must be set in the environment or passed as argument.")
+        self.client = (
+            transport.async_openai_client(self.api_key, self.base_url)
+            if transport is not None
+            else openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+        )
+
+    async def _get_model_response(self, board: chess.Board) -> str:
+        prompt = position_context(board).prompt(self.prompt_config)
+        messages, response_format = self._build_request(prompt, board)
+        request = {
+            "model": self.model,
+            "base_url": self.base_url,
+            "temperature": self.temperature,
+            "messages": messages,
+            "response_format": response_format,
+        }
+        response = await self._call_with_cache(
+            request, lambda: self._call_model(messages, response_format)
+        )
+        return self._parse_response(response)
+
+    @backoff.on_exception(backoff.expo, openai.RateLimitError, max_tries=5)
+    async def _call_model(
+        self, messages: list[dict[str, Any]], response_format: dict[str, Any]
+    ) -> str:
+        estimated_tokens = estimate_tokens(
+            json.dumps(messages), schema_cache.serialise(response_format)
+        )
+        try:
+            async with async_rate_limited(self.rate_limiter, estimated_tokens) as lease:
+                if self.stream:
+                    return await self._stream_model(messages, response_format)
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=self.temperature,
+                    response_format=response_format,
+                )
+                lease.tokens = _total_tokens(response)
             return str(response.choices[0].message.content)
         except Exception as e:
+            if is_rate_limit_error(e):
+                raise  # Retried by `backoff`
             raise RuntimeError(f"Error during API call: {e}") from e
+
+    async def _stream_model(
+        self, messages: list[dict[str, Any]], response_format: dict[str, Any]
+    ) -> str:
+        """Stream the response, closing the stream as soon as the move is complete."""
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature,
+            response_format=response_format,
+            stream=True,
+        )
+        try:
+            return await self._aread_stream(
+                chunk.choices[0].delta.content or "" async for chunk in stream if chunk.choices
+            )
+        finally:
+            await stream.close()
@@ -1,20 +1,272 @@
+import json
 import logging
 import os
+from collections import Counter
+from typing import Any
 
 import backoff
 import chess
 import openai
+from openai.types import Completion
 
-from llm_chess.players.llm.base import LLMPlayer
+from llm_chess.core.enums import CandidateSelection, MoveNotation
+from llm_chess.core.position import position_context
+from llm_chess.players.llm.base import AsyncLLMPlayer, LLMPlayer
+from llm_chess.players.llm.batch import BatchablePlayer
+from llm_chess.players.llm.cache import ResponseCache
+from llm_chess.players.llm.openai import _total_tokens
+from llm_chess.players.llm.rate_limit import (
+    RateLimiter,
+    async_rate_limited,
+    estimate_tokens,
+    is_rate_limit_error,
+    rate_limited,
+)
+from llm_chess.players.llm.scoring import MoveScore, continuation_logprob, rank_moves
+from llm_chess.players.llm.streaming import FirstTokenParser, aread_stream, read_stream
+from llm_chess.players.llm.transport import Transport
 from llm_chess.prompts.base import PromptConfig
 from llm_chess.prompts.pgn import PGNPromptConfig
+from llm_chess.utils.format import convert_str_to_move, format_legal_moves
 
 PGN_PROMPT_CONFIG = PGNPromptConfig(move_response_has_leading_space=True)
 
 logger = logging.getLogger(__name__)
 
 
-class GPT3p5TurboInstructPlayer(LLMPlayer):
+def _extract_move(response: Completion) -> str | None:
+    """Return the first whitespace-delimited token of a completion, if there is one."""
+    try:
+        response_text = response.choices[0].text
+    except Exception as e:
+        raise RuntimeError(f"Error during move extraction: {e}") from e
+    return _extract_move_from_text(response_text)
+
+
+def _extract_move_from_text(response_text: str | None) -> str | None:
+    try:
+        if response_text and response_text != "\n":
+            return str(response_text.strip().split()[0])
+        return None
+    except Exception as e:
+        raise RuntimeError(f"Error during move extraction: {e}") from e
+
+
+def _extract_candidates(response: Completion) -> list[str | None]:
+    """
+    Return the first token of each completion choice, in choice order. Choices are
+    either candidates for one prompt or, for a list of prompts, one per prompt.
+    """
+    try:
+        choices = sorted(response.choices, key=lambda choice: choice.index)
+        return [_extract_move_from_text(choice.text) for choice in choices]
+    except RuntimeError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Error during move extraction: {e}") from e
+
+
+def _extract_logprobs(response: Completion, prompt_length: int) -> list[float]:
+    """Return the log probability of each echoed continuation, in choice order."""
+    try:
+        choices = sorted(response.choices, key=lambda choice: choice.index)
+        logprobs = []
+        for choice in choices:
+            if choice.logprobs is None:
+                raise RuntimeError("Endpoint didn't return logprobs.")
+            logprobs.append(
+                continuation_logprob(
+                    choice.logprobs.tokens or [],
+                    choice.logprobs.token_logprobs or [],
+                    choice.logprobs.text_offset or [],
+                    prompt_length,
+                )
+            )
+        return logprobs
+    except RuntimeError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Error during logprob extraction: {e}") from e
+
+
+def _select_candidate(
+    board: chess.Board,
+    candidates: list[str | None],
+    notation: MoveNotation,
+    selection: CandidateSelection,
+) -> tuple[int | None, str]:
+    """
+    Choose a move from several candidate completions.
+
+    Returns:
+        The index of the chosen candidate, or None if no candidate was a legal move,
+        and the chosen move string. If no candidate is legal, the first non-empty
+        candidate is returned, so that the illegal move is reported as usual.
+
+    Raises:
+        RuntimeError: If every candidate is empty.
+    """
+    legal_candidates = []
+    for index, candidate in enumerate(candidates):
+        if candidate is None:
+            continue
+        try:
+            move = convert_str_to_move(board, candidate, notation)
+        except ValueError:
+            continue
+        legal_candidates.append((index, candidate, move))
+
+    if not legal_candidates:
+        fallback = next((candidate for candidate in candidates if candidate is not None), None)
+        if fallback is None:
+            raise RuntimeError(
+                f"Model returned empty or invalid response in all {len(candidates)} candidates."
+            )
+        return None, fallback
+
+    if selection == CandidateSelection.MAJORITY:
+        # Ties go to the move that appeared first
+        votes = Counter(move for _, _, move in legal_candidates)
+        majority_move = max(votes, key=lambda move: votes[move])
+        return next(
+            (index, candidate)
+            for index, candidate, move in legal_candidates
+            if move == majority_move
+        )
+    index, candidate, _ = legal_candidates[0]
+    return index, candidate
+
+
+class InstructRequestMixin:
+    """
+    Builds completion requests and parses their responses. Shared by the sync and async
+    instruct players, which differ only in how the request is sent.
+    """
+
+    prompt_config: PromptConfig
+    model: str
+    temperature: float
+    base_url: str
+
+    def _set_options(
+        self,
+        stream: bool,
+        n_candidates: int,
+        best_of: int | None,
+        candidate_selection: CandidateSelection,
+        scoring: bool,
+    ) -> None:
+        if stream and (n_candidates > 1 or best_of is not None):
+            raise ValueError("Streaming can't be combined with multiple candidates.")
+        if best_of is not None and best_of < n_candidates:
+            raise ValueError("best_of must be at least n_candidates.")
+        if scoring and (stream or n_candidates > 1 or best_of is not None):
+            raise ValueError("Scoring can't be combined with streaming or multiple candidates.")
+        self.stream = stream
+        self.n_candidates = n_candidates
+        self.best_of = best_of
+        self.candidate_selection = candidate_selection
+        self.candidate_index_counts: Counter[int | None] = Counter()
+        self.scoring = scoring
+        self.last_move_scores: list[MoveScore] | None = None
+
+    @property
+    def _uses_candidates(self) -> bool:
+        return self.n_candidates > 1 or self.best_of is not None
+
+    def _cache_request(self, prompt: str) -> dict[str, Any]:
+        """Everything that determines the response to a prompt, for the response cache."""
+        request = {
+            "model": self.model,
+            "base_url": self.base_url,
+            "temperature": self.temperature,
+            "prompt": prompt,
+        }
+        if self._uses_candidates:
+            request.update(
+                n=self.n_candidates, best_of=self.best_of, selection=self.candidate_selection.value
+            )
+        return request
+
+    def _completion_request(self, prompt: str | list[str]) -> tuple[dict[str, Any], int]:
+        """The arguments of a completion request for the first token, and its token estimate."""
+        prompts = [prompt] if isinstance(prompt, str) else prompt
+        kwargs = {
+            "model": self.model,
+            "prompt": prompt,
+            "temperature": self.temperature,
+            "max_tokens": 7,
+        }
+        return kwargs, estimate_tokens(*prompts) + 7 * len(prompts)
+
+    def _candidates_request(self, prompt: str) -> tuple[dict[str, Any], int]:
+        """The arguments of a request for `n_candidates` completions, and its token estimate."""
+        kwargs, _ = self._completion_request(prompt)
+        kwargs.update(n=self.n_candidates, best_of=self.best_of)
+        return kwargs, estimate_tokens(prompt) + 7 * (self.best_of or self.n_candidates)
+
+    def _scoring_request(self, board: chess.Board) -> tuple[str, list[str], dict[str, Any]]:
+        """The prompt, the formatted legal moves to score and the request for the cache."""
+        prompt = position_context(board).prompt(self.prompt_config)
+        move_strs = format_legal_moves(
+            board,
+            self.prompt_config.move_notation,
+            self.prompt_config.move_response_has_leading_space,
+        )
+        request = {
+            "model": self.model,
+            "base_url": self.base_url,
+            # Scoring reads the probabilities of fixed text, so it's deterministic
+            "temperature": 0,
+            "prompt": prompt,
+            "moves": move_strs,
+        }
+        return prompt, move_strs, request
+
+    def _scores_request(self, prompt: str, move_strs: list[str]) -> tuple[dict[str, Any], int]:
+        """
+        The arguments of a request echoing the prompt followed by each move, with no
+        completion, and its token estimate.
+        """
+        kwargs = {
+            "model": self.model,
+            "prompt": [prompt + move_str for move_str in move_strs],
+            "max_tokens": 0,
+            "echo": True,
+            "logprobs": 0,
+        }
+        return kwargs, estimate_tokens(prompt) * len(move_strs)
+
+    def _rank_moves(
+        self, board: chess.Board, move_strs: list[str], response: str
+    ) -> list[MoveScore]:
+        """Rank the moves by the log probabilities in a scores response."""
+        self.last_move_scores = rank_moves(board, move_strs, json.loads(response))
+        return self.last_move_scores
+
+    def _pick_candidate(self, board: chess.Board, candidates: list[str | None]) -> str:
+        index, move = _select_candidate(
+            board, candidates, self.prompt_config.move_notation, self.candidate_selection
+        )
+        self.candidate_index_counts[index] += 1
+        return move
+
+
+class GPT3p5TurboInstructPlayer(InstructRequestMixin, BatchablePlayer, LLMPlayer):
+    """
+    Setting `n_candidates` above one requests several completions in a single call and
+    picks one locally, either the first that is a legal move or the most common legal
+    move. This replaces sequential retries on empty completions with one round trip,
+    and is intended for use with a non-zero temperature. `best_of` has the server
+    generate that many completions and return the `n_candidates` most likely.
+    `candidate_index_counts` records how often each candidate index was chosen.
+
+    `score_moves` scores every legal move of a position in a single request, by echoing
+    the prompt followed by each move and reading back the log probabilities, which
+    requires an endpoint that supports `echo` with `logprobs`. With `scoring`, the
+    player plays the most likely legal move, so it never makes an illegal move. The
+    ranking of the last scored position is kept in `last_move_scores` for analysis.
+    """
 
     def __init__(
         self,
@@ -24,40 +276,289 @@ class GPT3p5TurboInstructPlayer(LLMPlayer):
         api_key: str | None = None,
         temperature: float = 0.0,
         base_url: str = "https://api.openai.com/v1",
+        response_cache: ResponseCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        transport: Transport | None = None,
+        stream: bool = False,
+        n_candidates: int = 1,
+        best_of: int | None = None,
+        candidate_selection: CandidateSelection = CandidateSelection.FIRST_LEGAL,
+        scoring: bool = False,
     ):
-        super().__init__(name, prompt_config)
+        super().__init__(name, prompt_config, response_cache)
         self.model = model
         self.temperature = temperature
         self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self._set_options(stream, n_candidates, best_of, candidate_selection, scoring)
 
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if self.api_key is None:
             raise ValueError("OPENAI_API_KEY must be set in the environment or passed as argument.")
-        self.client = openai.OpenAI(api_key=self.api_key, base_url=self.base_url)
+        self.client = (
+            transport.openai_client(self.api_key, self.base_url)
+            if transport is not None
+            else openai.OpenAI(api_key=self.api_key, base_url=self.base_url)
+        )
 
     def _get_model_response(self, board: chess.Board) -> str:
-        prompt = self.prompt_config.build_prompt(board)
-        return str(self._call_model(prompt))
+        if self.scoring:
+            return self.score_moves(board)[0].move_str
+        prompt = position_context(board).prompt(self.prompt_config)
+        if not self._uses_candidates:
+            return self._call_with_cache(
+                self._cache_request(prompt), lambda: self._call_model(prompt)
+            )
+        return self._call_with_cache(
+            self._cache_request(prompt), lambda: self._choose_candidate(board, prompt)
+        )
+
+    def score_moves(self, board: chess.Board) -> list[MoveScore]:
+        """
+        Score every legal move of the position in a single request.
+
+        Returns:
+            The legal moves ranked from most to least likely.
+        """
+        prompt, move_strs, request = self._scoring_request(board)
+        response = self._call_with_cache(
+            request, lambda: self._call_model_scores(prompt, move_strs)
+        )
+        return self._rank_moves(board, move_strs, response)
+
+    @backoff.on_exception(backoff.expo, openai.RateLimitError, max_tries=5)
+    def _call_model_scores(self, prompt: str, move_strs: list[str]) -> str:
+        """Score the moves in one request, returning the log probabilities as JSON."""
+        kwargs, estimated_tokens = self._scores_request(prompt, move_strs)
+        try:
+            with rate_limited(self.rate_limiter, estimated_tokens) as lease:
+                response = self.client.completions.create(**kwargs)
+                lease.tokens = _total_tokens(response)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                raise  # Retried by `backoff`
+            raise RuntimeError(f"Error during API call: {e}") from e
+        return json.dumps(_extract_logprobs(response, len(prompt)))
+
+    def _choose_candidate(self, board: chess.Board, prompt: str) -> str:
+        return self._pick_candidate(board, self._call_model_candidates(prompt))
+
+    @backoff.on_exception(backoff.expo, openai.RateLimitError, max_tries=5)
+    def _call_model_candidates(self, prompt: str) -> list[str | None]:
+        """Request `n_candidates` completions in a single call."""
+        kwargs, estimated_tokens = self._candidates_request(prompt)
+        try:
+            with rate_limited(self.rate_limiter, estimated_tokens) as lease:
+                response = self.client.completions.create(**kwargs)
+                lease.tokens = _total_tokens(response)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                raise  # Retried by `backoff`
+            raise RuntimeError(f"Error during API call: {e}") from e
+        return _extract_candidates(response)
+
+    def _get_model_responses(self, boards: list[chess.Board]) -> list[str | None]:
+        """
+        Complete the prompts of every position in a single request. Positions whose
+        completion is empty are retried individually.
+        """
+        if self.scoring or self.stream or self._uses_candidates:
+            return super()._get_model_responses(boards)
+        prompts = [position_context(board).prompt(self.prompt_config) for board in boards]
+        try:
+            responses: list[str | None] = self._call_model_batch(prompts)
+        except RuntimeError as e:
+            logger.warning(f"Batched request failed, falling back to one per position: {e}")
+            return super()._get_model_responses(boards)
+        retry = [i for i, response in enumerate(responses) if response is None]
+        retried = super()._get_model_responses([boards[i] for i in retry])
+        for i, response in zip(retry, retried, strict=True):
+            responses[i] = response
+        return responses
+
+    @backoff.on_exception(backoff.expo, openai.RateLimitError, max_tries=5)
+    def _call_model_batch(self, prompts: list[str]) -> list[str | None]:
+        """Complete several prompts in one request, returning the first token of each."""
+        kwargs, estimated_tokens = self._completion_request(prompts)
+        try:
+            with rate_limited(self.rate_limiter, estimated_tokens) as lease:
+                response = self.client.completions.create(**kwargs)
+                lease.tokens = _total_tokens(response)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                raise  # Retried by `backoff`
+            raise RuntimeError(f"Error during API call: {e}") from e
+        return _extract_candidates(response)
+
+    def _build_batch_request(self, board: chess.Board) -> tuple[str, dict[str, Any]]:
+        prompt = position_context(board).prompt(self.prompt_config)
+        kwargs, _ = self._completion_request(prompt)
+        return "/v1/completions", kwargs
+
+    def _parse_batch_response(self, body: dict[str, Any]) -> str:
+        move = _extract_move_from_text(body["choices"][0]["text"])
+        if move is None:
+            raise RuntimeError("Model returned empty or invalid response.")
+        return move
 
     @backoff.on_exception(backoff.expo, openai.RateLimitError, max_tries=5)
     def _call_model(self, prompt: str, n_attempts: int = 3) -> str:
+        kwargs, estimated_tokens = self._completion_request(prompt)
         for attempt in range(1, n_attempts + 1):
             try:
-                response = self.client.completions.create(
-                    model=self.model,
-                    prompt=prompt,
-                    temperature=self.temperature,
-                    max_tokens=7,
-                )
+                with rate_limited(self.rate_limiter, estimated_tokens) as lease:
+                    if self.stream:
+                        move = self._stream_model(kwargs)
+                    else:
+                        response = self.client.completions.create(**kwargs)
+                        lease.tokens = _total_tokens(response)
             except Exception as e:
+                if is_rate_limit_error(e):
+                    raise  # Retried by `backoff`
                 raise RuntimeError(f"Error during API call: {e}") from e
 
+            if not self.stream:
+                move = _extract_move(response)
+            if move is not None:
+                return move
+            logger.info(f"Invalid response on attempt {attempt}. Retrying...")
+
+        raise RuntimeError("Model returned empty or invalid response after 3 attempts.")
+
+    def _stream_model(self, kwargs: dict[str, Any]) -> str | None:
+        """Stream the completion, closing the stream once the first token is complete."""
+        stream = self.client.completions.create(**kwargs, stream=True)
+        try:
+            chunks = (chunk.choices[0].text for chunk in stream if chunk.choices)
+            return read_stream(chunks, FirstTokenParser())
+        finally:
+            stream.close()
+
+
+class AsyncGPT3p5TurboInstructPlayer(InstructRequestMixin, AsyncLLMPlayer):
+    """
+    GPT-3.5 Turbo Instruct player that uses the async client. Supports the same
+    multi-candidate and scoring options as `GPT3p5TurboInstructPlayer`.
+    """
+
+    def __init__(
+        self,
+        name: str = "GPT-3.5 Turbo Instruct",
+        prompt_config: PromptConfig = PGN_PROMPT_CONFIG,
+        model: str = "gpt-3.5-turbo-instruct",
+        api_key: str | None = None,
+        temperature: float = 0.0,
+        base_url: str = "https://api.openai.com/v1",
+        response_cache: ResponseCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        transport: Transport | None = None,
+        stream: bool = False,
+        n_candidates: int = 1,
+        best_of: int | None = None,
+        candidate_selection: CandidateSelection = CandidateSelection.FIRST_LEGAL,
+        scoring: bool = False,
+    ):
+        super().__init__(name, prompt_config, response_cache)
+        self.model = model
+        self.temperature = temperature
+        self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self._set_options(stream, n_candidates, best_of, candidate_selection, scoring)
+
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if self.api_key is None:
+            raise ValueError("OPENAI_API_KEY must be set in the environment or passed as argument.")
+        self.client = (
+            transport.async_openai_client(self.api_key, self.base_url)
+            if transport is not None
+            else openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+        )
+
+    async def _get_model_response(self, board: chess.Board) -> str:
+        if self.scoring:
+            return (await self.score_moves(board))[0].move_str
+        prompt = position_context(board).prompt(self.prompt_config)
+        if not self._uses_candidates:
+            return await self._call_with_cache(
+                self._cache_request(prompt), lambda: self._call_model(prompt)
+            )
+        return await self._call_with_cache(
+            self._cache_request(prompt), lambda: self._choose_candidate(board, prompt)
+        )
+
+    async def score_moves(self, board: chess.Board) -> list[MoveScore]:
+        """
+        Score every legal move of the position in a single request.
+
+        Returns:
+            The legal moves ranked from most to least likely.
+        """
+        prompt, move_strs, request = self._scoring_request(board)
+        response = await self._call_with_cache(
+            request, lambda: self._call_model_scores(prompt, move_strs)
+        )
+        return self._rank_moves(board, move_strs, response)
+
+    @backoff.on_exception(backoff.expo, openai.RateLimitError, max_tries=5)
+    async def _call_model_scores(self, prompt: str, move_strs: list[str]) -> str:
+        """Score the moves in one request, returning the log probabilities as JSON."""
+        kwargs, estimated_tokens = self._scores_request(prompt, move_strs)
+        try:
+            async with async_rate_limited(self.rate_limiter, estimated_tokens) as lease:
+                response = await self.client.completions.create(**kwargs)
+                lease.tokens = _total_tokens(response)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                raise  # Retried by `backoff`
+            raise RuntimeError(f"Error during API call: {e}") from e
+        return json.dumps(_extract_logprobs(response, len(prompt)))
+
+    async def _choose_candidate(self, board: chess.Board, prompt: str) -> str:
+        return self._pick_candidate(board, await self._call_model_candidates(prompt))
+
+    @backoff.on_exception(backoff.expo, openai.RateLimitError, max_tries=5)
+    async def _call_model_candidates(self, prompt: str) -> list[str | None]:
+        """Request `n_candidates` completions in a single call."""
+        kwargs, estimated_tokens = self._candidates_request(prompt)
+        try:
+            async with async_rate_limited(self.rate_limiter, estimated_tokens) as lease:
+                response = await self.client.completions.create(**kwargs)
+                lease.tokens = _total_tokens(response)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                raise  # Retried by `backoff`
+            raise RuntimeError(f"Error during API call: {e}") from e
+        return _extract_candidates(response)
+
+    @backoff.on_exception(backoff.expo, openai.RateLimitError, max_tries=5)
+    async def _call_model(self, prompt: str, n_attempts: int = 3) -> str:
+        kwargs, estimated_tokens = self._completion_request(prompt)
+        for attempt in range(1, n_attempts + 1):
             try:
-                response_text = response.choices[0].text
-                if response_text and response_text != "\n":
-                    return str(response_text.strip().split()[0])
-                logger.info(f"Invalid response on attempt {attempt}. Retrying...")
+                async with async_rate_limited(self.rate_limiter, estimated_tokens) as lease:
+                    if self.stream:
+                        move = await self._stream_model(kwargs)
+                    else:
+                        response = await self.client.completions.create(**kwargs)
+                        lease.tokens = _total_tokens(response)
             except Exception as e:
-                raise RuntimeError(f"Error during move extraction: {e}") from e
+                if is_rate_limit_error(e):
+                    raise  # Retried by `backoff`
+                raise RuntimeError(f"Error during API call: {e}") from e
+
+            if not self.stream:
+                move = _extract_move(response)
+            if move is not None:
+                return move
+            logger.info(f"Invalid response on attempt {attempt}. Retrying...")
 
         raise RuntimeError("Model returned empty or invalid response after 3 attempts.")
+
+    async def _stream_model(self, kwargs: dict[str, Any]) -> str | None:
+        """Stream the completion, closing the stream once the first token is complete."""
+        stream = await self.client.completions.create(**kwargs, stream=True)
+        try:
+            chunks = (chunk.choices[0].text async for chunk in stream if chunk.choices)
+            return await aread_stream(chunks, FirstTokenParser())
+        finally:
+            await stream.close()
@@ -0,0 +1,247 @@
+import asyncio
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+# How long to wait before retrying when every concurrency slot is in use
+_SLOT_POLL_INTERVAL = 0.05
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Roughly estimate the number of tokens in some text, at four characters per token."""
+    return sum(len(text) for text in texts) // 4 + 1
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an exception, or the exception that caused it, is an HTTP 429 error."""
+    while error is not None:
+        if 429 in (getattr(error, "status_code", None), getattr(error, "code", None)):
+            return True
+        error = error.__cause__  # type: ignore[assignment]
+    return False
+
+
+class TokenBucket:
+    """
+    Budget of a resource (requests or tokens) that refills at a steady rate. Not thread
+    safe; `RateLimiter` guards its buckets with a lock.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float = 10.0):
+        """
+        Args:
+            per_minute: The refill rate.
+            burst_seconds: The bucket holds this many seconds' worth of budget, which
+                bounds how far a burst can run ahead of the steady rate.
+        """
+        self.rate = per_minute / 60
+        self.capacity = max(self.rate * burst_seconds, 1.0)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be consumed. Zero if it can be consumed now."""
+        self._refill(now)
+        # Requests larger than the bucket only need to wait for a full bucket
+        amount = min(amount, self.capacity)
+        return max(amount - self.level, 0.0) / self.rate
+
+    def consume(self, amount: float) -> None:
+        """Remove budget. The level may go negative, e.g. when usage was underestimated."""
+        self.level -= amount
+
+
+@dataclass
+class RateLimitLease:
+    """
+    Permission to make one request. Set `tokens` to the actual usage reported by the
+    API, so the limiter can correct its estimate.
+    """
+
+    estimated_tokens: int
+    tokens: int | None = None
+
+
+class RateLimiter:
+    """
+    Client-side rate limiter for an API, shared by every player that calls it.
+
+    Requests wait for budget in a requests-per-minute and a tokens-per-minute bucket,
+    and for a free concurrency slot. The number of slots adapts to the API's response
+    (additive increase, multiplicative decrease): it grows by about one for each round
+    of successful requests, halves when a request is rate limited, and shrinks gently
+    when latency exceeds the target. A rate limit error also pauses all requests
+    briefly, so that concurrent callers don't all retry at once.
+
+    Use `get_rate_limiter` to share one limiter between all players of a provider and
+    model. Limiters are per process: when games run in several processes, divide the
+    quota between them.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        max_concurrency: int = 32,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        target_latency: float | None = None,
+        headroom: float = 0.9,
+        cooldown: float = 1.0,
+    ):
+        """
+        Args:
+            requests_per_minute: The provider's request quota. If None, unlimited.
+            tokens_per_minute: The provider's token quota. If None, unlimited.
+            max_concurrency: Upper bound on requests in flight.
+            initial_concurrency: Requests in flight allowed before any feedback.
+            min_concurrency: Lower bound on requests in flight.
+            target_latency: Seconds per request above which concurrency is reduced.
+                If None, latency is ignored.
+            headroom: Fraction of each quota to use, leaving a margin for estimation
+                error and other clients.
+            cooldown: Seconds to pause after a rate limit error. Decreases in
+                concurrency are also limited to one per cooldown, as a burst of
+                errors from requests already in flight reflects a single overload.
+        """
+        if not 1 <= min_concurrency <= initial_concurrency <= max_concurrency:
+            raise ValueError(
+                "Concurrency bounds must satisfy 1 <= min <= initial <= max, got "
+                f"{min_concurrency}, {initial_concurrency}, {max_concurrency}."
+            )
+        self.request_bucket = (
+            TokenBucket(requests_per_minute * headroom) if requests_per_minute else None
+        )
+        self.token_bucket = TokenBucket(tokens_per_minute * headroom) if tokens_per_minute else None
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency = float(initial_concurrency)
+        self.target_latency = target_latency
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.n_rate_limited = 0
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._lock = threading.Lock()
+
+    def _try_acquire(self, lease: RateLimitLease) -> float:
+        """Take a slot and budget for the lease, or return the seconds to wait first."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self.in_flight >= int(self.concurrency):
+                return _SLOT_POLL_INTERVAL
+            wait = 0.0
+            if self.request_bucket is not None:
+                wait = max(wait, self.request_bucket.wait_time(1, now))
+            if self.token_bucket is not None:
+                wait = max(wait, self.token_bucket.wait_time(lease.estimated_tokens, now))
+            if wait > 0:
+                return wait
+
+            if self.request_bucket is not None:
+                self.request_bucket.consume(1)
+            if self.token_bucket is not None:
+                self.token_bucket.consume(lease.estimated_tokens)
+            self.in_flight += 1
+            return 0.0
+
+    def _release(self, lease: RateLimitLease, latency: float, error: BaseException | None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self.in_flight -= 1
+            if self.token_bucket is not None and lease.tokens is not None:
+                self.token_bucket.consume(lease.tokens - lease.estimated_tokens)
+
+            if error is not None and is_rate_limit_error(error):
+                self.n_rate_limited += 1
+                self._paused_until = max(self._paused_until, now + self.cooldown)
+                self._decrease(now, 0.5)
+            elif error is not None:
+                return
+            elif self.target_latency is not None and latency > self.target_latency:
+                self._decrease(now, 0.9)
+            else:
+                self.concurrency = min(
+                    self.concurrency + 1 / self.concurrency, float(self.max_concurrency)
+                )
+
+    def _decrease(self, now: float, factor: float) -> None:
+        if now - self._last_decrease < self.cooldown:
+            return
+        self.concurrency = max(self.concurrency * factor, float(self.min_concurrency))
+        self._last_decrease = now
+
+    @contextmanager
+    def limit(self, estimated_tokens: int = 0) -> Iterator[RateLimitLease]:
+        """Block until a request may be made, then make it within the context."""
+        lease = RateLimitLease(estimated_tokens)
+        while (wait := self._try_acquire(lease)) > 0:
+            time.sleep(wait)
+        start = time.monotonic()
+        try:
+            yield lease
+        except BaseException as e:
+            self._release(lease, time.monotonic() - start, e)
+            raise
+        self._release(lease, time.monotonic() - start, None)
+
+    @asynccontextmanager
+    async def alimit(self, estimated_tokens: int = 0) -> AsyncIterator[RateLimitLease]:
+        """Async version of `limit`, which waits without blocking the event loop."""
+        lease = RateLimitLease(estimated_tokens)
+        while (wait := self._try_acquire(lease)) > 0:
+            await asyncio.sleep(wait)
+        start = time.monotonic()
+        try:
+            yield lease
+        except BaseException as e:
+            self._release(lease, time.monotonic() - start, e)
+            raise
+        self._release(lease, time.monotonic() - start, None)
+
+
+_rate_limiters: dict[tuple[str, str], RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str, model: str, **kwargs: Any) -> RateLimiter:
+    """
+    Return the process-wide rate limiter for a provider and model, creating it with the
+    given `RateLimiter` arguments on first use. Later calls return the same limiter and
+    ignore their arguments.
+    """
+    with _rate_limiters_lock:
+        if (provider, model) not in _rate_limiters:
+            _rate_limiters[(provider, model)] = RateLimiter(**kwargs)
+        return _rate_limiters[(provider, model)]
+
+
+@contextmanager
+def rate_limited(limiter: RateLimiter | None, estimated_tokens: int) -> Iterator[RateLimitLease]:
+    """Apply the limiter if there is one, otherwise run the request immediately."""
+    if limiter is None:
+        yield RateLimitLease(estimated_tokens)
+        return
+    with limiter.limit(estimated_tokens) as lease:
+        yield lease
+
+
+@asynccontextmanager
+async def async_rate_limited(
+    limiter: RateLimiter | None, estimated_tokens: int
+) -> AsyncIterator[RateLimitLease]:
+    """Async version of `rate_limited`."""
+    if limiter is None:
+        yield RateLimitLease(estimated_tokens)
+        return
+    async with limiter.alimit(estimated_tokens) as lease:
+        yield lease
@@ -0,0 +1,127 @@
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from llm_chess.core.enums import MoveNotation
+
+V = TypeVar("V")
+
+SchemaKey = tuple[Hashable, MoveNotation, bool, tuple[str, ...]]
+
+
+@dataclass(frozen=True)
+class CompiledSchema(Generic[V]):
+    """
+    A response schema built for a set of legal moves, e.g. a JSON schema, an SDK config
+    object or a pydantic model class, with its JSON-compatible form and serialisation
+    if it has them. Compiled schemas are shared, so they must not be modified.
+    """
+
+    value: V
+    data: Any = None
+    serialised: str | None = None
+
+
+class SchemaCache:
+    """
+    A thread-safe LRU cache of response schemas, keyed by the provider, the move
+    notation, whether moves have a leading space and the legal moves themselves.
+
+    Structured-output players constrain the response to the legal moves of the
+    position, so they need a new schema for each position. Positions, and hence sets of
+    legal moves, recur often over many games, particularly in the opening, and the
+    schemas can be expensive to build. Evicting the least recently used schemas keeps
+    memory bounded over long runs.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Args:
+            maxsize: Maximum number of schemas held.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._schemas: OrderedDict[SchemaKey, CompiledSchema[Any]] = OrderedDict()
+        # Compiled schemas by the id of their value, to find serialisations of values
+        # returned by `get`. The entries hold the values, so ids can't be reused.
+        self._by_id: dict[int, CompiledSchema[Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        provider: Hashable,
+        move_notation: MoveNotation,
+        move_response_has_leading_space: bool,
+        legal_moves: list[str] | tuple[str, ...],
+        build: Callable[[], V],
+        dump: Callable[[V], Any] | None = None,
+    ) -> CompiledSchema[V]:
+        """
+        Return the cached schema for the legal moves, building it if absent.
+
+        Args:
+            provider: Identifies the kind of schema, along with anything other than the
+                legal moves that it depends on, e.g. `("gemini", "enum", temperature)`.
+            move_notation: The notation of the legal moves.
+            move_response_has_leading_space: Whether the legal moves have a leading
+                space.
+            legal_moves: The formatted legal moves.
+            build: Builds the schema.
+            dump: Converts the schema to a JSON-compatible form, which is serialised
+                once. If None, the schema is not serialised.
+        """
+        key = (provider, move_notation, move_response_has_leading_space, tuple(legal_moves))
+        with self._lock:
+            compiled = self._schemas.get(key)
+            if compiled is not None:
+                self._schemas.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        # Build outside the lock; if two threads race, the first schema stored wins
+        value = build()
+        data = dump(value) if dump is not None else None
+        serialised = json.dumps(data) if dump is not None else None
+        compiled = CompiledSchema(value, data, serialised)
+        with self._lock:
+            if key in self._schemas:
+                return self._schemas[key]
+            self._schemas[key] = compiled
+            self._by_id[id(value)] = compiled
+            while len(self._schemas) > self.maxsize:
+                _, evicted = self._schemas.popitem(last=False)
+                self._by_id.pop(id(evicted.value), None)
+        return compiled
+
+    def find(self, value: Any) -> CompiledSchema[Any] | None:
+        """The cached schema whose value is the given object, if any."""
+        with self._lock:
+            compiled = self._by_id.get(id(value))
+        return compiled if compiled is not None and compiled.value is value else None
+
+    def serialise(self, value: Any, default: Callable[[Any], str] = json.dumps) -> str:
+        """
+        Serialise a schema, reusing the serialisation from the cache if the schema was
+        returned by `get`, and otherwise calling `default`.
+        """
+        compiled = self.find(value)
+        if compiled is not None and compiled.serialised is not None:
+            return compiled.serialised
+        return default(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._schemas.clear()
+            self._by_id.clear()
+
+    def __len__(self) -> int:
+        return len(self._schemas)
+
+
+# Shared by all players, as the schemas only depend on the key
+schema_cache = SchemaCache()
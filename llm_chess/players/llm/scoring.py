@@ -0,0 +1,69 @@
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import chess
+
+
+@dataclass(frozen=True)
+class MoveScore:
+    """
+    A legal move with the model's log probability of responding with it.
+
+    `probability` is normalised over the legal moves of the position, so the
+    probabilities of a ranking sum to one.
+    """
+
+    move: chess.Move
+    move_str: str
+    logprob: float
+    probability: float
+
+
+def continuation_logprob(
+    tokens: Sequence[str],
+    token_logprobs: Sequence[float | None],
+    text_offsets: Sequence[int],
+    prompt_length: int,
+) -> float:
+    """
+    Sum the log probabilities of the tokens of an echoed completion that cover the
+    continuation, i.e. the text after the first `prompt_length` characters.
+
+    A token that straddles the end of the prompt is counted as part of the
+    continuation, so that a move merged into the prompt's last token isn't scored as
+    certain.
+    """
+    return sum(
+        logprob or 0.0
+        for token, logprob, offset in zip(tokens, token_logprobs, text_offsets, strict=True)
+        if offset + len(token) > prompt_length
+    )
+
+
+def rank_moves(board: chess.Board, move_strs: list[str], logprobs: list[float]) -> list[MoveScore]:
+    """
+    Rank the legal moves of a position by the model's log probabilities.
+
+    Args:
+        board: The position.
+        move_strs: The legal moves, formatted by `format_legal_moves`, in the order of
+            `board.legal_moves`.
+        logprobs: The log probability of each move string.
+
+    Returns:
+        The moves from most to least likely.
+    """
+    if not move_strs:
+        return []
+    # Softmax over the legal moves, shifted by the maximum for numerical stability
+    max_logprob = max(logprobs)
+    weights = [math.exp(logprob - max_logprob) for logprob in logprobs]
+    total = sum(weights)
+    scores = [
+        MoveScore(move, move_str.strip(), logprob, weight / total)
+        for move, move_str, logprob, weight in zip(
+            board.legal_moves, move_strs, logprobs, weights, strict=True
+        )
+    ]
+    return sorted(scores, key=lambda score: score.logprob, reverse=True)
@@ -1,4 +1,9 @@
 import logging
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
 
 import chess
 from sglang import (
@@ -6,26 +11,81 @@ from sglang import (
     assistant,
     function,
     gen,
-    set_default_backend,
     system,
     user,
 )
 from sglang.utils import launch_server_cmd, terminate_process, wait_for_server
 
 from llm_chess.core.enums import APIResponseFormat
+from llm_chess.core.position import position_context
 from llm_chess.players.llm.base import LLMPlayer
 from llm_chess.prompts.base import PromptConfig
-from llm_chess.utils.format import format_legal_moves, format_moves_history
+from llm_chess.utils.format import (
+    convert_move_to_str,
+    convert_str_to_move,
+    format_legal_moves,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def _select_move(s, prompt: str, formatted_legal_moves: list[str]):
+    s += system("You are a chess engine.")
+    s += user(prompt)
+    s += assistant(gen("move", choices=formatted_legal_moves))
+
+
+def _select_move_multi_turn(
+    s,
+    prompt: str,
+    model_is_white: bool,
+    formatted_moves_history: list[str],
+    formatted_legal_moves: list[str],
+):
+    s += system("You are a chess engine.")
+    s += user(prompt)
+    if not model_is_white:
+        s += assistant("Understood. Let's play.")
+    for idx, move in enumerate(formatted_moves_history):
+        is_model_turn = (idx % 2 == 0) if model_is_white else (idx % 2 != 0)
+        s += assistant(move) if is_model_turn else user(move)
+    s += assistant(gen("move", choices=formatted_legal_moves))
+
+
+@dataclass
+class SGLangReplica:
+    """A server replica. Its load, used to route new games, counts pinned games."""
+
+    url: str
+    backend: Any
+    process: Any = None
+    n_sessions: int = 0
+    n_in_flight: int = 0
+
+    @property
+    def load(self) -> int:
+        return self.n_sessions + self.n_in_flight
+
+
 class SGLangPlayer(LLMPlayer):
     """
     A player that uses a local model served using SGLang.
 
-    Supplying a model path will start a local server to serve the model. If no model
-    path is supplied, the player will assume the server is already running.
+    Supplying a model path will start a local server to serve the model, or
+    `n_replicas` servers on consecutive ports, each on its own GPU. If no model path is
+    supplied, the player will assume the server is already running, or attach to the
+    replicas at `urls`. Each player holds its own backends, so players in one process
+    can use different servers.
+
+    With the multi-turn format, the player keeps a session per game: the program state
+    after each of its moves is forked for the next move, and only the opponent's reply
+    and a new generation are appended. The history isn't rebuilt each move, and each
+    request extends the text of the last one, so the server's radix cache serves the
+    shared prefix. Sessions are keyed by the game's moves, and the least recently used
+    are dropped beyond `max_sessions`.
+
+    New games are routed to the least-loaded replica, and a game stays on that replica
+    for as long as its session lives, so its prefix stays in one replica's cache.
     """
 
     def __init__(
@@ -35,22 +95,32 @@ class SGLangPlayer(LLMPlayer):
         model_path: str | None = None,
         host: str = "0.0.0.0",
         port: int | None = 30000,
+        max_sessions: int = 1024,
+        n_replicas: int = 1,
+        urls: list[str] | None = None,
     ):
         super().__init__(name, prompt_config)
+        if model_path and urls:
+            raise ValueError("Supply either a model path to launch servers or urls to attach to.")
+        self.max_sessions = max_sessions
+        # Games with identical histories have interchangeable sessions, so each
+        # history holds a list of them
+        self._sessions: OrderedDict[tuple[chess.Move, ...], list[tuple[Any, SGLangReplica]]] = (
+            OrderedDict()
+        )
+        self._n_sessions = 0
+        self._lock = threading.Lock()
         self.model_path = model_path
         self.host = host
         self.port = port
-        self.server_process = None
-        if self.model_path:
-            try:
-                self.server_process, self.port = self._initialize_server(
-                    self.model_path, self.host, self.port
-                )
-            except Exception as e:
-                logger.error(f"Failed to initialize server: {e}")
-                raise
-        set_default_backend(RuntimeEndpoint(f"http://{self.host}:{port}"))
+        self.n_replicas = n_replicas
+        self.urls = urls
+        self.replicas: list[SGLangReplica] = []
+        self._start_replicas()
 
+        # Declared once, so that positions using the same program can be batched
+        self._enum_program = function(_select_move)
+        self._multi_turn_program = function(_select_move_multi_turn)
         self.response_handlers = {
             APIResponseFormat.STRUCTURED: self._handle_enum_response,
             APIResponseFormat.JSON: self._handle_enum_response,
@@ -59,22 +129,80 @@ class SGLangPlayer(LLMPlayer):
             APIResponseFormat.MULTI_TURN: self._handle_multi_turn_response,
         }
 
-    def _initialize_server(self, model_path: str, host: str, port: int | None) -> tuple:
+    def _start_replicas(self) -> None:
+        """Launch the servers, if there is a model path, and connect to each replica."""
+        if self.urls:
+            self.replicas = [SGLangReplica(url, RuntimeEndpoint(url)) for url in self.urls]
+            return
+        if not self.model_path:
+            url = f"http://{self.host}:{self.port}"
+            self.replicas = [SGLangReplica(url, RuntimeEndpoint(url))]
+            return
+        try:
+            for i in range(self.n_replicas):
+                port = self.port + i if self.port is not None else None
+                base_gpu_id = i if self.n_replicas > 1 else None
+                process, port = self._initialize_server(
+                    self.model_path, self.host, port, base_gpu_id
+                )
+                url = f"http://{self.host}:{port}"
+                self.replicas.append(SGLangReplica(url, RuntimeEndpoint(url), process))
+        except Exception as e:
+            logger.error(f"Failed to initialize server: {e}")
+            self._terminate_replicas()
+            raise
+
+    def _initialize_server(
+        self, model_path: str, host: str, port: int | None, base_gpu_id: int | None = None
+    ) -> tuple:
+        command = f"python -m sglang.launch_server --model-path {model_path}"
+        if base_gpu_id is not None:
+            command += f" --base-gpu-id {base_gpu_id}"
         try:
-            server_process, port = launch_server_cmd(
-                f"python -m sglang.launch_server --model-path {model_path}",
-                host=self.host,
-                port=self.port,
-            )
-            wait_for_server(f"http://{self.host}:{port}")
-            logger.info(f"Server initialized at http://{self.host}:{port}")
+            server_process, port = launch_server_cmd(command, host=host, port=port)
+            wait_for_server(f"http://{host}:{port}")
+            logger.info(f"Server initialized at http://{host}:{port}")
             return server_process, port
         except Exception as e:
             logger.error(f"Error initializing server: {e}")
             raise
 
+    def _terminate_replicas(self) -> None:
+        for replica in self.replicas:
+            if replica.process is None:
+                continue
+            try:
+                terminate_process(replica.process)
+                logger.info(f"Server process at {replica.url} terminated.")
+            except Exception as e:
+                logger.warning(f"Failed to terminate process cleanly: {e}")
+        self.replicas = []
+        self._clear_sessions()
+
+    def _clear_sessions(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+            self._n_sessions = 0
+            for replica in self.replicas:
+                replica.n_sessions = 0
+
+    @property
+    def server_processes(self) -> list[Any]:
+        return [replica.process for replica in self.replicas if replica.process is not None]
+
+    def _acquire_replica(self) -> SGLangReplica:
+        """Route a new game, or a request without a session, to the least-loaded replica."""
+        with self._lock:
+            replica = min(self.replicas, key=lambda replica: replica.load)
+            replica.n_in_flight += 1
+            return replica
+
+    def _release_replica(self, replica: SGLangReplica) -> None:
+        with self._lock:
+            replica.n_in_flight -= 1
+
     def _get_model_response(self, board: chess.Board) -> str:
-        prompt = self.prompt_config.build_prompt(board)
+        prompt = position_context(board).prompt(self.prompt_config)
         try:
             handler = self.response_handlers[self.prompt_config.api_response_format]
         except KeyError as e:
@@ -83,57 +211,171 @@ class SGLangPlayer(LLMPlayer):
             ) from e
         return handler(prompt, board)
 
-    def _handle_multi_turn_response(self, prompt: str, board: chess.Board) -> str:
-        notation = self.prompt_config.move_notation
-        formatted_moves_history = format_moves_history(board, notation)
-        formatted_legal_moves = format_legal_moves(board, notation)
-
-        @function
-        def select_move(s, prompt: str, model_is_white: bool, formatted_legal_moves: list[str]):
-            s += system("You are a chess engine.")
-            s += user(prompt)
-            if not model_is_white:
-                s += assistant("Understood. Let's play.")
-            for idx, move in enumerate(formatted_moves_history):
-                is_model_turn = (idx % 2 == 0) if model_is_white else (idx % 2 != 0)
-                s += assistant(move) if is_model_turn else user(move)
-            s += assistant(gen("move", choices=formatted_legal_moves))
+    def _get_model_responses(self, boards: list[chess.Board]) -> list[str | None]:
+        """
+        Run the programs of every position as a batch per replica. Multi-turn positions
+        with a session are continued on their replica instead; their generations run
+        concurrently with the batches.
+        """
+        multi_turn = self.prompt_config.api_response_format == APIResponseFormat.MULTI_TURN
+        if multi_turn:
+            program, build_arguments = self._multi_turn_program, self._multi_turn_arguments
+            sessions = [self._continue_session(board) for board in boards]
+        else:
+            program, build_arguments = self._enum_program, self._enum_arguments
+            sessions = [None] * len(boards)
 
+        states: list[Any] = [session[0] if session else None for session in sessions]
+        replicas = [session[1] if session else self._acquire_replica() for session in sessions]
+        responses: list[str | None] = [None] * len(boards)
         try:
-            state = select_move.run(
-                prompt=prompt,
-                model_is_white=len(formatted_moves_history) % 2 == 0,
-                formatted_legal_moves=formatted_legal_moves,
-            )
+            by_replica: dict[int, list[int]] = defaultdict(list)
+            for i, state in enumerate(states):
+                if state is None:
+                    by_replica[id(replicas[i])].append(i)
+
+            def run_batch(indices: list[int]) -> None:
+                arguments = [
+                    build_arguments(
+                        position_context(boards[i]).prompt(self.prompt_config), boards[i]
+                    )
+                    for i in indices
+                ]
+                try:
+                    backend = replicas[indices[0]].backend
+                    batch_states = program.run_batch(arguments, backend=backend)
+                    for i, state in zip(indices, batch_states, strict=True):
+                        states[i] = state
+                except Exception as e:
+                    logger.warning(f"Batched request failed, falling back to one per position: {e}")
+                    fallback = super(SGLangPlayer, self)._get_model_responses(
+                        [boards[i] for i in indices]
+                    )
+                    for i, response in zip(indices, fallback, strict=True):
+                        responses[i] = response
+
+            with ThreadPoolExecutor(max(len(by_replica), 1)) as executor:
+                list(executor.map(run_batch, by_replica.values()))
+
+            for i, (board, state) in enumerate(zip(boards, states, strict=True)):
+                if state is None:
+                    continue
+                try:
+                    responses[i] = (
+                        self._save_session(state, board, replicas[i])
+                        if multi_turn
+                        else state["move"]
+                    )
+                except Exception as e:
+                    logger.warning(f"Error getting model response: {e}")
+        finally:
+            for replica in replicas:
+                self._release_replica(replica)
+        return responses
+
+    def _run_program(self, program: Any, arguments: dict[str, Any]) -> str:
+        replica = self._acquire_replica()
+        try:
+            state = program.run(**arguments, backend=replica.backend)
             return state["move"]
         except Exception as e:
             logger.error(f"Error getting model response: {e}")
             raise RuntimeError("Error getting model response") from e
+        finally:
+            self._release_replica(replica)
 
-    def _handle_enum_response(self, prompt: str, board: chess.Board) -> str:
+    def _multi_turn_arguments(self, prompt: str, board: chess.Board) -> dict[str, Any]:
         notation = self.prompt_config.move_notation
-        legal_moves = format_legal_moves(board, notation)
-
-        @function
-        def select_move(s, prompt: str, formatted_legal_moves: list[str]):
-            s += system("You are a chess engine.")
-            s += user(prompt)
-            s += assistant(gen("move", choices=formatted_legal_moves))
+        formatted_moves_history = self.move_history.format(board, notation)
+        return {
+            "prompt": prompt,
+            "model_is_white": len(formatted_moves_history) % 2 == 0,
+            "formatted_moves_history": formatted_moves_history,
+            "formatted_legal_moves": format_legal_moves(board, notation),
+        }
 
+    def _handle_multi_turn_response(self, prompt: str, board: chess.Board) -> str:
+        session = self._continue_session(board)
+        state, replica = session if session else (None, self._acquire_replica())
         try:
-            state = select_move.run(prompt=prompt, formatted_legal_moves=legal_moves)
-            return state["move"]
+            if state is None:
+                arguments = self._multi_turn_arguments(prompt, board)
+                state = self._multi_turn_program.run(**arguments, backend=replica.backend)
+            return self._save_session(state, board, replica)
         except Exception as e:
             logger.error(f"Error getting model response: {e}")
             raise RuntimeError("Error getting model response") from e
+        finally:
+            self._release_replica(replica)
+
+    def _continue_session(self, board: chess.Board) -> tuple[Any, SGLangReplica] | None:
+        """
+        Fork the state left by the player's previous move in this game, appending the
+        opponent's reply and a generation of the next move. The fork keeps the state's
+        backend, so the game stays on its replica. Returns None if the game has no
+        session.
+        """
+        if not board.move_stack:
+            return None
+        key = tuple(board.move_stack[:-1])
+        with self._lock:
+            sessions = self._sessions.get(key)
+            if not sessions:
+                return None
+            state, replica = sessions.pop()
+            if not sessions:
+                del self._sessions[key]
+            self._n_sessions -= 1
+            replica.n_sessions -= 1
+            replica.n_in_flight += 1
+        notation = self.prompt_config.move_notation
+        before_reply = board.copy(stack=1)
+        reply = before_reply.pop()
+        continued = state.fork(1)[0]
+        continued += user(convert_move_to_str(before_reply, reply, notation))
+        continued += assistant(gen("move", choices=format_legal_moves(board, notation)))
+        return continued, replica
+
+    def _save_session(self, state: Any, board: chess.Board, replica: SGLangReplica) -> str:
+        """
+        Read the generated move, keeping the state to continue from next move. The
+        state's executor is ended, as each holds a worker thread until it ends; forking
+        copies the text and messages, so an ended state can still be continued.
+        """
+        move_str: str = state["move"]
+        state.sync()
+        state.stream_executor.end()
+        try:
+            move = convert_str_to_move(board, move_str, self.prompt_config.move_notation)
+        except ValueError:
+            return move_str
+        key = (*board.move_stack, move)
+        with self._lock:
+            self._sessions.setdefault(key, []).append((state, replica))
+            self._sessions.move_to_end(key)
+            self._n_sessions += 1
+            replica.n_sessions += 1
+            while self._n_sessions > self.max_sessions:
+                oldest_key, oldest = next(iter(self._sessions.items()))
+                _, evicted_replica = oldest.pop(0)
+                if not oldest:
+                    del self._sessions[oldest_key]
+                self._n_sessions -= 1
+                evicted_replica.n_sessions -= 1
+        return move_str
+
+    def _enum_arguments(self, prompt: str, board: chess.Board) -> dict[str, Any]:
+        notation = self.prompt_config.move_notation
+        return {"prompt": prompt, "formatted_legal_moves": format_legal_moves(board, notation)}
+
+    def _handle_enum_response(self, prompt: str, board: chess.Board) -> str:
+        return self._run_program(self._enum_program, self._enum_arguments(prompt, board))
 
     def __enter__(self):
         """Context manager entry."""
-        if self.model_path and not self.server_process:
+        if self.model_path and not self.server_processes:
             try:
-                self.server_process, self.port = self._initialize_server(
-                    self.model_path, self.host, self.port
-                )
+                self._start_replicas()
             except Exception as e:
                 logger.error(f"Failed to initialise server in context manager: {e}")
                 raise
@@ -141,11 +383,7 @@ class SGLangPlayer(LLMPlayer):
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
-        if self.server_process:
-            try:
-                terminate_process(self.server_process)
-                logger.info("Server process terminated on exit.")
-            except Exception as e:
-                logger.warning(f"Failed to terminate process cleanly: {e}")
-            finally:
-                self.server_process = None
+        if self.server_processes:
+            self._terminate_replicas()
+        else:
+            self._clear_sessions()
@@ -0,0 +1,120 @@
+import json
+import re
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterable, Iterable
+
+from llm_chess.core.enums import APIResponseFormat
+from llm_chess.prompts.base import PromptConfig
+
+
+class StreamParser(ABC):
+    """
+    Incrementally parses a move from a streamed response, so that the stream can be
+    closed as soon as the move is known rather than when the model stops generating.
+    """
+
+    def __init__(self) -> None:
+        self.text = ""
+
+    def feed(self, chunk: str) -> str | None:
+        """Add a chunk of the response. Returns the move once it is complete."""
+        self.text += chunk
+        return self._parse()
+
+    @abstractmethod
+    def _parse(self) -> str | None:
+        """Return the move if the text so far contains all of it, otherwise None."""
+
+    def finish(self) -> str | None:
+        """Return the move at the end of the stream, if there is one."""
+        return self._parse()
+
+
+class FirstTokenParser(StreamParser):
+    """Parses the first whitespace-delimited token, e.g. from a PGN continuation."""
+
+    _TOKEN = re.compile(r"\s*(\S+)\s")
+
+    def _parse(self) -> str | None:
+        match = self._TOKEN.match(self.text)
+        return match.group(1) if match else None
+
+    def finish(self) -> str | None:
+        tokens = self.text.split()
+        return tokens[0] if tokens else None
+
+
+class JSONFieldParser(StreamParser):
+    """Parses a string field from a JSON object, as soon as its closing quote arrives."""
+
+    def __init__(self, field: str = "move"):
+        super().__init__()
+        self._pattern = re.compile(rf'"{re.escape(field)}"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+    def _parse(self) -> str | None:
+        match = self._pattern.search(self.text)
+        return str(json.loads(match.group(1))).strip() if match else None
+
+
+class FullTextParser(StreamParser):
+    """Reads the whole response, for formats where the move can't be found early."""
+
+    def _parse(self) -> str | None:
+        return None
+
+    def finish(self) -> str | None:
+        return self.text.strip() or None
+
+
+def read_stream(chunks: Iterable[str], parser: StreamParser) -> str | None:
+    """Feed chunks to the parser until it finds a move. Remaining chunks aren't read."""
+    for chunk in chunks:
+        move = parser.feed(chunk)
+        if move is not None:
+            return move
+    return parser.finish()
+
+
+async def aread_stream(chunks: AsyncIterable[str], parser: StreamParser) -> str | None:
+    """Async version of `read_stream`."""
+    async for chunk in chunks:
+        move = parser.feed(chunk)
+        if move is not None:
+            return move
+    return parser.finish()
+
+
+class StreamingResponseMixin:
+    """
+    Reads model responses from a stream of text chunks. Structured responses are JSON
+    objects with a "move" field, so the stream can stop once that field is complete;
+    other responses are read in full.
+    """
+
+    prompt_config: PromptConfig
+
+    def _is_structured(self) -> bool:
+        return self.prompt_config.api_response_format in (
+            APIResponseFormat.STRUCTURED,
+            APIResponseFormat.JSON,
+        )
+
+    def _stream_parser(self) -> StreamParser:
+        return JSONFieldParser("move") if self._is_structured() else FullTextParser()
+
+    def _streamed_response(self, move: str | None, parser: StreamParser) -> str:
+        """
+        Rebuild the response from a stream that was closed early, in the form that
+        `_parse_response` expects.
+        """
+        if move is not None and self._is_structured():
+            return json.dumps({"move": move})
+        return parser.text
+
+    def _read_stream(self, chunks: Iterable[str]) -> str:
+        parser = self._stream_parser()
+        return self._streamed_response(read_stream(chunks, parser), parser)
+
+    async def _aread_stream(self, chunks: AsyncIterable[str]) -> str:
+        parser = self._stream_parser()
+        return self._streamed_response(await aread_stream(chunks, parser), parser)
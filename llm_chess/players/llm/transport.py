@@ -0,0 +1,149 @@
+import importlib.util
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+import openai
+from google import genai
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    """Connection pool settings for the HTTP clients handed out by a `Transport`."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    timeout: float = 600.0
+    http2: bool = True
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+class Transport:
+    """
+    Registry of API clients that share connection pools.
+
+    Each player normally builds its own client, and with it its own connection pool.
+    Players given the same `Transport` instead share one pooled client per provider,
+    base URL and API key, so connections (and their TLS sessions) are reused across
+    players and idle sockets are capped.
+
+    HTTP/2 requires the optional `h2` package (`pip install httpx[http2]`); without it,
+    clients fall back to HTTP/1.1.
+
+    Async clients are bound to the event loop they are first used on, so a transport
+    that hands out async clients should only be used within a single event loop.
+    """
+
+    def __init__(self, config: TransportConfig | None = None):
+        """
+        Args:
+            config: Connection pool settings. If None, the defaults are used.
+        """
+        self.config = config or TransportConfig()
+        self._http2 = self.config.http2 and importlib.util.find_spec("h2") is not None
+        if self.config.http2 and not self._http2:
+            logger.warning("HTTP/2 requires the `h2` package. Falling back to HTTP/1.1.")
+        self._clients: dict[tuple[str, str, str], Any] = {}
+        # Pooled HTTP clients, closed with the transport
+        self._sync_http_clients: list[Any] = []
+        self._async_http_clients: list[Any] = []
+        self._lock = threading.Lock()
+
+    def _client_args(self) -> dict[str, Any]:
+        return {
+            "limits": self.config.limits(),
+            "timeout": self.config.timeout,
+            "http2": self._http2,
+        }
+
+    def openai_client(self, api_key: str, base_url: str) -> openai.OpenAI:
+        """The shared OpenAI client for an API key and base URL."""
+        with self._lock:
+            key = ("openai", base_url, api_key)
+            if key not in self._clients:
+                http_client = openai.DefaultHttpxClient(**self._client_args())
+                self._sync_http_clients.append(http_client)
+                self._clients[key] = openai.OpenAI(
+                    api_key=api_key, base_url=base_url, http_client=http_client
+                )
+            client: openai.OpenAI = self._clients[key]
+            return client
+
+    def async_openai_client(self, api_key: str, base_url: str) -> openai.AsyncOpenAI:
+        """The shared async OpenAI client for an API key and base URL."""
+        with self._lock:
+            key = ("openai-async", base_url, api_key)
+            if key not in self._clients:
+                http_client = openai.DefaultAsyncHttpxClient(**self._client_args())
+                self._async_http_clients.append(http_client)
+                self._clients[key] = openai.AsyncOpenAI(
+                    api_key=api_key, base_url=base_url, http_client=http_client
+                )
+            client: openai.AsyncOpenAI = self._clients[key]
+            return client
+
+    def gemini_client(self, api_key: str) -> genai.Client:
+        """The shared Gemini client for an API key, with sync and async pools."""
+        with self._lock:
+            key = ("gemini", "", api_key)
+            if key not in self._clients:
+                http_client = httpx.Client(**self._client_args())
+                async_http_client = httpx.AsyncClient(**self._client_args())
+                self._sync_http_clients.append(http_client)
+                self._async_http_clients.append(async_http_client)
+                self._clients[key] = genai.Client(
+                    api_key=api_key,
+                    http_options=types.HttpOptions(
+                        httpx_client=http_client, httpx_async_client=async_http_client
+                    ),
+                )
+            client: genai.Client = self._clients[key]
+            return client
+
+    def close(self) -> None:
+        """Close the sync connection pools. Async pools are closed with `aclose`."""
+        with self._lock:
+            for http_client in self._sync_http_clients:
+                http_client.close()
+
+    async def aclose(self) -> None:
+        """Close all connection pools."""
+        self.close()
+        for http_client in self._async_http_clients:
+            await http_client.aclose()
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: object | None,
+    ) -> None:
+        self.close()
+
+
+_default_transport: Transport | None = None
+_default_transport_lock = threading.Lock()
+
+
+def get_default_transport() -> Transport:
+    """The process-wide transport, created with default settings on first use."""
+    global _default_transport
+    with _default_transport_lock:
+        if _default_transport is None:
+            _default_transport = Transport()
+        return _default_transport
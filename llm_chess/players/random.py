@@ -3,11 +3,11 @@ import random
 import chess
 
 from llm_chess.core.player import ChessPlayer
+from llm_chess.core.position import position_context
 
 
 class RandomPlayer(ChessPlayer):
     """Random player interface."""
 
     def _get_move(self, board: chess.Board) -> chess.Move:
-        legal_moves = list(board.legal_moves)
-        return random.choice(legal_moves)
+        return random.choice(position_context(board).legal_moves)
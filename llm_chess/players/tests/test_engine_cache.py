@@ -0,0 +1,82 @@
+from pathlib import Path
+from unittest.mock import Mock
+
+import chess
+import chess.engine
+import pytest
+
+from llm_chess.players.engine.cache import Evaluation, EvaluationCache, analyse
+
+
+def info(depth: int, cp: int = 30) -> chess.engine.InfoDict:
+    return {
+        "score": chess.engine.PovScore(chess.engine.Cp(cp), chess.BLACK),
+        "pv": [chess.Move.from_uci("e7e5"), chess.Move.from_uci("g1f3")],
+        "depth": depth,
+        "nodes": 1000 * depth,
+    }
+
+
+@pytest.fixture
+def board(starting_board: chess.Board) -> chess.Board:
+    starting_board.push_san("e4")
+    return starting_board
+
+
+def test_evaluation_from_info_is_white_relative() -> None:
+    evaluation = Evaluation.from_info(info(depth=10, cp=30))
+    assert evaluation.cp == -30
+    assert evaluation.score.pov(chess.BLACK) == chess.engine.Cp(30)
+    assert evaluation.best_move == chess.Move.from_uci("e7e5")
+    assert Evaluation.from_json(evaluation.to_json()) == evaluation
+
+
+def test_deeper_results_satisfy_shallower_requests(board: chess.Board) -> None:
+    cache = EvaluationCache()
+    cache.put(board, chess.engine.Limit(depth=12), Evaluation.from_info(info(depth=12)))
+
+    assert cache.get(board, chess.engine.Limit(depth=10)) is not None
+    assert cache.get(board, chess.engine.Limit(depth=12)) is not None
+    assert cache.get(board, chess.engine.Limit(depth=14)) is None
+    assert cache.get(board, chess.engine.Limit(time=0.1)) is None
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_shallower_results_do_not_replace_deeper(board: chess.Board) -> None:
+    cache = EvaluationCache()
+    cache.put(board, chess.engine.Limit(depth=12), Evaluation.from_info(info(depth=12)))
+    cache.put(board, chess.engine.Limit(depth=8), Evaluation.from_info(info(depth=8)))
+
+    evaluation = cache.get(board, chess.engine.Limit(depth=1))
+    assert evaluation is not None and evaluation.depth == 12
+
+
+def test_mates_reported_at_a_shallow_depth_are_returned(board: chess.Board) -> None:
+    # Engines report a shallow depth, or none, for mates and terminal positions
+    cache = EvaluationCache()
+    mate: chess.engine.InfoDict = {
+        "score": chess.engine.PovScore(chess.engine.Mate(1), chess.WHITE),
+        "depth": 0,
+    }
+    cache.put(board, chess.engine.Limit(depth=12), Evaluation.from_info(mate))
+
+    evaluation = cache.get(board, chess.engine.Limit(depth=12))
+    assert evaluation is not None and evaluation.mate == 1
+    assert cache.get(board, chess.engine.Limit(depth=14)) is None
+
+
+def test_analyse_skips_engine_on_hit(tmp_path: Path, board: chess.Board) -> None:
+    engine = Mock()
+    engine.analyse.return_value = info(depth=15)
+    limit = chess.engine.Limit(depth=15)
+
+    cache = EvaluationCache(tmp_path / "evals.sqlite")
+    first = analyse(engine, board, limit, cache)
+    assert analyse(engine, board, limit, cache) == first
+    engine.analyse.assert_called_once()
+    cache.close()
+
+    # A new cache reads the result back from disk
+    reopened = EvaluationCache(tmp_path / "evals.sqlite")
+    assert analyse(engine, board, chess.engine.Limit(depth=10), reopened) == first
+    engine.analyse.assert_called_once()
@@ -0,0 +1,81 @@
+import threading
+from typing import cast
+from unittest.mock import Mock
+
+import pytest
+
+from llm_chess.players.engine.pool import EnginePool
+from llm_chess.players.engine.stockfish import EngineConfig, StockfishPlayer
+
+
+def acquire(pool: EnginePool, config: EngineConfig | None = None) -> Mock:
+    return cast(Mock, pool.acquire(config or EngineConfig()))
+
+
+@pytest.fixture
+def pool(monkeypatch: pytest.MonkeyPatch) -> EnginePool:
+    pool = EnginePool(engine_path="stockfish", max_engines=2)
+    monkeypatch.setattr(pool, "_start_engine", Mock(side_effect=lambda: Mock()))
+    return pool
+
+
+def test_acquire_configures_engine(pool: EnginePool) -> None:
+    config = EngineConfig(elo=1500, threads=2, hash_mb=32)
+    engine = acquire(pool, config)
+    engine.configure.assert_called_once_with(
+        {"Threads": 2, "Hash": 32, "UCI_LimitStrength": True, "UCI_Elo": 1500}
+    )
+
+
+def test_released_engines_are_reused(pool: EnginePool) -> None:
+    engine = acquire(pool)
+    pool.release(engine)
+    assert acquire(pool, EngineConfig(elo=2000)) is engine
+    assert pool._start_engine.call_count == 1  # type: ignore[attr-defined]
+
+
+def test_dead_engines_are_replaced(pool: EnginePool) -> None:
+    engine = acquire(pool)
+    pool.release(engine)
+    engine.ping.side_effect = Exception("Engine terminated")
+
+    new_engine = acquire(pool)
+    assert new_engine is not engine
+    engine.quit.assert_called_once()
+    assert pool.n_engines == 1
+
+
+def test_process_count_is_capped(pool: EnginePool) -> None:
+    engines = [acquire(pool) for _ in range(2)]
+    with pytest.raises(TimeoutError):
+        pool.acquire(EngineConfig(), timeout=0.01)
+
+    threading.Timer(0.05, pool.release, args=(engines[0],)).start()
+    assert pool.acquire(EngineConfig(), timeout=5) is engines[0]
+    assert pool.n_engines == 2
+
+
+def test_close_quits_engines(pool: EnginePool) -> None:
+    idle, leased = acquire(pool), acquire(pool)
+    pool.release(idle)
+    pool.close()
+    idle.quit.assert_called_once()
+    leased.quit.assert_not_called()
+
+    pool.release(leased)
+    leased.quit.assert_called_once()
+    with pytest.raises(RuntimeError):
+        acquire(pool)
+
+
+def test_stockfish_player_leases_from_pool(pool: EnginePool) -> None:
+    with StockfishPlayer(name="PooledStockfish", elo=1600, pool=pool) as player:
+        engine = cast(Mock, player.engine)
+        assert engine is not None
+        assert pool.n_engines == 1
+    assert player.engine is None
+    engine.quit.assert_not_called()
+
+    next_player = StockfishPlayer(name="PooledStockfish", pool=pool)
+    assert next_player.engine is engine
+    assert next_player.game is not player.game
@@ -0,0 +1,115 @@
+import importlib
+import sys
+from collections.abc import Iterator
+from types import ModuleType
+from typing import Any
+from unittest.mock import Mock
+
+import chess
+import pytest
+
+from llm_chess.core.enums import APIResponseFormat, ContextPolicy, MoveNotation
+from llm_chess.prompts.base import PromptConfig
+
+
+class FakeChat:
+    """A chat that answers with the next scripted move and counts one token per word."""
+
+    def __init__(self, messages: list[tuple[str, str]], responses: list[str]):
+        self.messages = messages
+        self.responses = responses
+
+    def sample(self) -> Mock:
+        response = Mock(content=self.responses.pop(0))
+        response.usage.prompt_tokens = sum(len(content.split()) for _, content in self.messages)
+        return response
+
+
+class MovesPromptConfig(PromptConfig):
+    """Prompts with the UCI moves so far, so the prompt changes every move."""
+
+    def __init__(self) -> None:
+        super().__init__(MoveNotation.UCI, APIResponseFormat.TEXT)
+
+    def build_prompt(self, board: chess.Board) -> str:
+        return " ".join(["Moves:", *(move.uci() for move in board.move_stack)])
+
+
+@pytest.fixture
+def grok_module(monkeypatch: pytest.MonkeyPatch) -> Iterator[Any]:
+    """The grok module, imported against a stub of xai_sdk, which needn't be installed."""
+    xai_sdk = ModuleType("xai_sdk")
+    xai_sdk.Client = Mock()  # type: ignore[attr-defined]
+    xai_sdk_chat = ModuleType("xai_sdk.chat")
+    xai_sdk_chat.user = lambda content: ("user", content)  # type: ignore[attr-defined]
+    xai_sdk_chat.assistant = lambda content: ("assistant", content)  # type: ignore[attr-defined]
+    monkeypatch.setitem(sys.modules, "xai_sdk", xai_sdk)
+    monkeypatch.setitem(sys.modules, "xai_sdk.chat", xai_sdk_chat)
+    monkeypatch.delitem(sys.modules, "llm_chess.players.llm.grok", raising=False)
+    yield importlib.import_module("llm_chess.players.llm.grok")
+    # Don't leave the module bound to the stub for later imports
+    del sys.modules["llm_chess.players.llm.grok"]
+
+
+def play(grok_module: Any, policy: ContextPolicy, **kwargs: Any) -> tuple[Any, list[FakeChat]]:
+    """Play e2e4 and d2d4 for white against e7e5, returning the player and its chats."""
+    chats: list[FakeChat] = []
+    responses = ["e2e4", "d2d4"]
+
+    def create(model: str, temperature: float, messages: list[tuple[str, str]]) -> FakeChat:
+        chats.append(FakeChat(messages, responses))
+        return chats[-1]
+
+    player = grok_module.GrokPlayer(
+        "Grok", MovesPromptConfig(), api_key="test_key", context_policy=policy, **kwargs
+    )
+    player.client.chat.create.side_effect = create
+    board = chess.Board()
+    board.push(player.make_move(board))
+    board.push_uci("e7e5")
+    board.push(player.make_move(board))
+    return player, chats
+
+
+def test_append_is_the_default(grok_module: Any) -> None:
+    player = grok_module.GrokPlayer("Grok", MovesPromptConfig(), api_key="test_key")
+    assert player.context_policy == ContextPolicy.APPEND
+
+
+def test_append_sends_every_prompt_without_responses(grok_module: Any) -> None:
+    player, chats = play(grok_module, ContextPolicy.APPEND)
+    assert chats[1].messages == [("user", "Moves:"), ("user", "Moves: e2e4 e7e5")]
+    assert player.input_token_counts == [1, 4]
+
+    # The chat carries over to the next game
+    player.client.chat.create.side_effect = lambda **kwargs: FakeChat(kwargs["messages"], ["e2e4"])
+    player.make_move(chess.Board())
+    assert player.input_token_counts[-1] == 5
+
+
+def test_stateless_sends_only_the_prompt(grok_module: Any) -> None:
+    player, chats = play(grok_module, ContextPolicy.STATELESS)
+    assert chats[1].messages == [("user", "Moves: e2e4 e7e5")]
+    assert player.input_token_counts == [1, 3]
+
+
+def test_sliding_window_keeps_the_last_exchanges(grok_module: Any) -> None:
+    player, chats = play(grok_module, ContextPolicy.SLIDING_WINDOW, context_window=1)
+    assert chats[1].messages == [
+        ("user", "Moves:"),
+        ("assistant", "e2e4"),
+        ("user", "Moves: e2e4 e7e5"),
+    ]
+    assert player.input_token_counts == [1, 5]
+
+
+def test_multi_turn_sends_only_new_moves(grok_module: Any) -> None:
+    player, chats = play(grok_module, ContextPolicy.MULTI_TURN)
+    assert chats[1].messages == [("user", "Moves:"), ("assistant", "e2e4"), ("user", "e7e5")]
+    assert player.input_token_counts == [1, 3]
+
+    # A board that doesn't continue the game starts a new one
+    player.client.chat.create.side_effect = lambda **kwargs: FakeChat(kwargs["messages"], ["e2e4"])
+    player.make_move(chess.Board())
+    assert player.exchanges == [("Moves:", "e2e4")]
+    assert player.input_token_counts[-1] == 1
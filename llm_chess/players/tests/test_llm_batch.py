@@ -0,0 +1,112 @@
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock
+
+import chess
+import pytest
+
+from llm_chess.players.llm.batch import (
+    BatchGameRunner,
+    BatchRequest,
+    LocalBatchBackend,
+    OpenAIBatchBackend,
+    read_jsonl,
+)
+from llm_chess.players.llm.openai import OpenAIPlayer
+from llm_chess.players.llm.openai_instruct import GPT3p5TurboInstructPlayer
+from llm_chess.players.random import RandomPlayer
+from llm_chess.prompts.base import PromptConfig
+
+
+def first_legal_move(request: BatchRequest) -> dict[str, Any]:
+    """Responder that plays the first move in the structured output schema's enum."""
+    schema = request["body"]["response_format"]["json_schema"]["schema"]
+    move = schema["properties"]["move"]["enum"][0]
+    return {"choices": [{"message": {"content": json.dumps({"move": move})}}]}
+
+
+@pytest.fixture
+def player(monkeypatch: pytest.MonkeyPatch, mock_prompt_config: PromptConfig) -> OpenAIPlayer:
+    monkeypatch.setattr("llm_chess.players.llm.openai.openai", Mock())
+    return OpenAIPlayer(name="Batch", prompt_config=mock_prompt_config, api_key="test_key")
+
+
+def test_build_batch_request(player: OpenAIPlayer, starting_board: chess.Board) -> None:
+    request = player.build_batch_request(starting_board, "id-1")
+
+    assert request["custom_id"] == "id-1"
+    assert request["method"] == "POST"
+    assert request["url"] == "/v1/chat/completions"
+    assert request["body"]["model"] == "gpt-4o-mini"
+    assert request["body"]["messages"] == [{"role": "user", "content": "Mock prompt"}]
+
+
+def test_play_games_local_backend(player: OpenAIPlayer, tmp_path: Path) -> None:
+    runner = BatchGameRunner(LocalBatchBackend(tmp_path, first_legal_move), poll_interval=0)
+    games = [(player, RandomPlayer("Random"), None), (RandomPlayer("Random"), player, None)]
+
+    results = runner.play_games(games, max_half_moves=10)
+
+    assert len(results) == 2
+    for board, result in results:
+        assert len(board.move_stack) == 11
+        assert result == "*"
+    # The model moves 6 times as white and 5 times as black, in a total of 6 batches
+    input_files = list(tmp_path.glob("*_input.jsonl"))
+    assert len(input_files) == 6
+    assert sum(len(read_jsonl(path)) for path in input_files) == 11
+    assert len(list(tmp_path.glob("*_output.jsonl"))) == 6
+
+
+def test_play_games_failed_request(player: OpenAIPlayer, tmp_path: Path) -> None:
+    def fail(request: BatchRequest) -> dict[str, Any]:
+        raise RuntimeError("Server error")
+
+    runner = BatchGameRunner(LocalBatchBackend(tmp_path, fail), poll_interval=0)
+    [(board, result)] = runner.play_games([(player, RandomPlayer("Random"), None)])
+
+    assert result == "Illegal move by Batch"
+    assert board.move_stack == []
+
+
+def test_get_moves_instruct_player(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, mock_prompt_config: PromptConfig
+) -> None:
+    monkeypatch.setattr("llm_chess.players.llm.openai_instruct.openai", Mock())
+    player = GPT3p5TurboInstructPlayer(prompt_config=mock_prompt_config, api_key="test_key")
+    responses = iter([" e2e4 e7e5", "\n", " a1a8"])
+
+    def respond(request: BatchRequest) -> dict[str, Any]:
+        assert request["url"] == "/v1/completions"
+        return {"choices": [{"text": next(responses)}]}
+
+    runner = BatchGameRunner(LocalBatchBackend(tmp_path, respond), poll_interval=0)
+    moves = runner.get_moves(player, [chess.Board()] * 3)
+
+    assert moves == [chess.Move.from_uci("e2e4"), None, None]
+
+
+def test_openai_backend() -> None:
+    client = Mock()
+    client.files.create.return_value.id = "file-in"
+    client.batches.create.return_value.id = "batch-1"
+    backend = OpenAIBatchBackend(client)
+    requests = [{"custom_id": "a", "method": "POST", "url": "/v1/completions", "body": {}}]
+
+    assert backend.submit(requests) == "batch-1"
+    assert client.batches.create.call_args.kwargs["input_file_id"] == "file-in"
+    assert client.batches.create.call_args.kwargs["endpoint"] == "/v1/completions"
+
+    client.batches.retrieve.return_value.status = "in_progress"
+    assert backend.poll("batch-1") is None
+
+    client.batches.retrieve.return_value.status = "completed"
+    client.batches.retrieve.return_value.output_file_id = "file-out"
+    client.batches.retrieve.return_value.error_file_id = None
+    client.files.content.return_value.text = '{"custom_id": "a"}\n'
+    assert backend.poll("batch-1") == [{"custom_id": "a"}]
+
+    client.batches.retrieve.return_value.status = "expired"
+    with pytest.raises(RuntimeError):
+        backend.poll("batch-1")
@@ -0,0 +1,120 @@
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import chess
+import pytest
+
+from llm_chess.players.llm.cache import ResponseCache
+from llm_chess.players.llm.openai import AsyncOpenAIPlayer, OpenAIPlayer
+from llm_chess.prompts.base import PromptConfig
+
+
+@pytest.fixture
+def mock_openai(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    mock_openai_module = Mock()
+    response = Mock()
+    response.choices = [Mock()]
+    response.choices[0].message.content = '{"move": "e2e4"}'
+    mock_openai_module.OpenAI.return_value.chat.completions.create.return_value = response
+    monkeypatch.setattr("llm_chess.players.llm.openai.openai", mock_openai_module)
+    return mock_openai_module
+
+
+def make_player(
+    prompt_config: PromptConfig, cache: ResponseCache, temperature: float = 0.0
+) -> OpenAIPlayer:
+    return OpenAIPlayer(
+        name="Cached",
+        prompt_config=prompt_config,
+        api_key="test_key",
+        temperature=temperature,
+        response_cache=cache,
+    )
+
+
+def test_key_depends_on_request() -> None:
+    request = {"model": "gpt-4o-mini", "temperature": 0.0, "messages": ["a"]}
+    assert ResponseCache.key(request) == ResponseCache.key(dict(reversed(request.items())))
+    assert ResponseCache.key(request) != ResponseCache.key({**request, "model": "gpt-4o"})
+
+
+def test_player_reuses_cached_response(
+    mock_openai: Mock, mock_prompt_config: PromptConfig, starting_board: chess.Board
+) -> None:
+    cache = ResponseCache()
+    player = make_player(mock_prompt_config, cache)
+
+    assert player.make_move(starting_board) == chess.Move.from_uci("e2e4")
+    assert player.make_move(starting_board) == chess.Move.from_uci("e2e4")
+
+    create = mock_openai.OpenAI.return_value.chat.completions.create
+    assert create.call_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_player_skips_cache_when_sampling(
+    mock_openai: Mock, mock_prompt_config: PromptConfig, starting_board: chess.Board
+) -> None:
+    cache = ResponseCache()
+    player = make_player(mock_prompt_config, cache, temperature=0.7)
+
+    player.make_move(starting_board)
+    player.make_move(starting_board)
+
+    assert mock_openai.OpenAI.return_value.chat.completions.create.call_count == 2
+    assert len(cache.memory) == 0
+
+
+def test_async_player_reuses_cached_response(
+    mock_openai: Mock, mock_prompt_config: PromptConfig, starting_board: chess.Board
+) -> None:
+    create = AsyncMock(return_value=mock_openai.OpenAI.return_value.chat.completions.create())
+    mock_openai.AsyncOpenAI.return_value.chat.completions.create = create
+    cache = ResponseCache()
+    player = AsyncOpenAIPlayer(
+        name="Cached", prompt_config=mock_prompt_config, api_key="test_key", response_cache=cache
+    )
+
+    assert asyncio.run(player.make_move(starting_board)) == chess.Move.from_uci("e2e4")
+    assert asyncio.run(player.make_move(starting_board)) == chess.Move.from_uci("e2e4")
+
+    assert create.call_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_disk_cache_is_shared(tmp_path: Path) -> None:
+    path = tmp_path / "responses.sqlite"
+    first = ResponseCache(path)
+    first.put("key", "response")
+
+    second = ResponseCache(path)
+    assert second.get("key") == "response"
+    assert second.get("missing") is None
+    assert (second.hits, second.misses) == (1, 1)
+
+
+def test_memory_entries_expire(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = ResponseCache(ttl=60)
+    monkeypatch.setattr("llm_chess.players.llm.cache.time.time", lambda: 1000.0)
+    cache.put("key", "response")
+
+    monkeypatch.setattr("llm_chess.players.llm.cache.time.time", lambda: 1030.0)
+    assert cache.get("key") == "response"
+    monkeypatch.setattr("llm_chess.players.llm.cache.time.time", lambda: 1100.0)
+    assert cache.get("key") is None
+
+
+def test_disk_entries_expire_from_their_write_time(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "responses.sqlite"
+    monkeypatch.setattr("llm_chess.utils.cache.time.time", lambda: 1000.0)
+    ResponseCache(path, ttl=60).put("key", "response")
+
+    cache = ResponseCache(path, ttl=60)
+    monkeypatch.setattr("llm_chess.utils.cache.time.time", lambda: 1050.0)
+    monkeypatch.setattr("llm_chess.players.llm.cache.time.time", lambda: 1050.0)
+    assert cache.get("key") == "response"
+    monkeypatch.setattr("llm_chess.players.llm.cache.time.time", lambda: 1070.0)
+    assert cache.get("key") is None
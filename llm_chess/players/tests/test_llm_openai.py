@@ -1,10 +1,11 @@
+import asyncio
 from typing import Any
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 import chess
 import pytest
 
-from llm_chess.players.llm.openai import OpenAIPlayer
+from llm_chess.players.llm.openai import AsyncOpenAIPlayer, OpenAIPlayer
 from llm_chess.prompts.base import PromptConfig
 
 
@@ -107,3 +108,23 @@ def test_make_move_invalid(
 
     with pytest.raises(ValueError):
         player.make_move(starting_board)
+
+
+def test_async_player_make_move(
+    monkeypatch: pytest.MonkeyPatch,
+    api_key: str,
+    mock_openai_response: Mock,
+    mock_prompt_config: PromptConfig,
+    starting_board: chess.Board,
+) -> None:
+    mock_client = Mock()
+    mock_client.chat.completions.create = AsyncMock(return_value=mock_openai_response)
+    mock_openai_module = Mock()
+    mock_openai_module.AsyncOpenAI.return_value = mock_client
+    monkeypatch.setattr("llm_chess.players.llm.openai.openai", mock_openai_module)
+
+    player = AsyncOpenAIPlayer(name="TestAsyncOpenAI", prompt_config=mock_prompt_config)
+    move = asyncio.run(player.make_move(starting_board))
+
+    assert move == chess.Move.from_uci("e2e4")
+    mock_client.chat.completions.create.assert_awaited_once()
@@ -0,0 +1,169 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import chess
+import pytest
+
+from llm_chess.core.enums import CandidateSelection, MoveNotation
+from llm_chess.players.llm.cache import ResponseCache
+from llm_chess.players.llm.openai_instruct import (
+    AsyncGPT3p5TurboInstructPlayer,
+    GPT3p5TurboInstructPlayer,
+    _select_candidate,
+)
+from llm_chess.players.llm.scoring import continuation_logprob, rank_moves
+
+
+def completion(*texts: str) -> Mock:
+    response = Mock()
+    response.choices = [Mock(index=i, text=text) for i, text in enumerate(texts)]
+    response.usage.total_tokens = 10
+    return response
+
+
+@pytest.fixture
+def mock_openai_module(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    mock_openai_module = Mock()
+    monkeypatch.setattr("llm_chess.players.llm.openai_instruct.openai", mock_openai_module)
+    return mock_openai_module
+
+
+@pytest.mark.parametrize(
+    "selection,expected",
+    [
+        (CandidateSelection.FIRST_LEGAL, (1, "e4")),
+        (CandidateSelection.MAJORITY, (2, "d4")),
+    ],
+)
+def test_select_candidate(
+    starting_board: chess.Board, selection: CandidateSelection, expected: tuple[int, str]
+) -> None:
+    candidates = [None, "e4", "d4", "Ke2", "d4"]
+    assert _select_candidate(starting_board, candidates, MoveNotation.SAN, selection) == expected
+
+
+def test_select_candidate_without_legal_moves(starting_board: chess.Board) -> None:
+    selection = CandidateSelection.FIRST_LEGAL
+    assert _select_candidate(starting_board, [None, "Ke2"], MoveNotation.SAN, selection) == (
+        None,
+        "Ke2",
+    )
+    with pytest.raises(RuntimeError):
+        _select_candidate(starting_board, [None, None], MoveNotation.SAN, selection)
+
+
+def test_player_requests_candidates_in_one_call(
+    mock_openai_module: Mock, starting_board: chess.Board
+) -> None:
+    create = mock_openai_module.OpenAI.return_value.completions.create
+    create.return_value = completion("\n", " Nf3 Nf6", " e4 e5")
+    player = GPT3p5TurboInstructPlayer(api_key="test_key", temperature=1.0, n_candidates=3)
+
+    assert player.make_move(starting_board) == chess.Move.from_uci("g1f3")
+    assert create.call_count == 1
+    assert create.call_args.kwargs["n"] == 3
+    assert player.candidate_index_counts == {1: 1}
+
+
+def test_async_player_requests_candidates_in_one_call(
+    mock_openai_module: Mock, starting_board: chess.Board
+) -> None:
+    create = AsyncMock(return_value=completion("\n", " Nf3 Nf6", " e4 e5"))
+    mock_openai_module.AsyncOpenAI.return_value.completions.create = create
+    player = AsyncGPT3p5TurboInstructPlayer(api_key="test_key", temperature=1.0, n_candidates=3)
+
+    assert asyncio.run(player.make_move(starting_board)) == chess.Move.from_uci("g1f3")
+    assert create.call_count == 1
+    assert create.call_args.kwargs["n"] == 3
+    assert player.candidate_index_counts == {1: 1}
+
+
+def test_player_rejects_streaming_candidates(mock_openai_module: Mock) -> None:
+    with pytest.raises(ValueError):
+        GPT3p5TurboInstructPlayer(api_key="test_key", stream=True, n_candidates=2)
+
+
+def echoed_completion(prompt: str, move_logprobs: list[list[float]]) -> Mock:
+    """An echoed completion per move, with the prompt as one token and a token per logprob."""
+    response = Mock()
+    response.choices = []
+    for i, logprobs in enumerate(move_logprobs):
+        tokens = [prompt] + ["x"] * len(logprobs)
+        offsets = [0] + [len(prompt) + j for j in range(len(logprobs))]
+        choice = Mock(index=i)
+        choice.logprobs.tokens = tokens
+        choice.logprobs.token_logprobs = [None, *logprobs]
+        choice.logprobs.text_offset = offsets
+        response.choices.append(choice)
+    response.usage.total_tokens = 10
+    return response
+
+
+def test_continuation_logprob() -> None:
+    # The second token straddles the end of the prompt, so it's part of the continuation
+    tokens = ["1.", " e", "4"]
+    assert continuation_logprob(tokens, [None, -1.0, -0.5], [0, 2, 4], 3) == -1.5
+    assert continuation_logprob(tokens, [None, -1.0, -0.5], [0, 2, 4], 4) == -0.5
+
+
+def test_rank_moves(starting_board: chess.Board) -> None:
+    move_strs = [" " + starting_board.san(move) for move in starting_board.legal_moves]
+    logprobs = [-10.0] * len(move_strs)
+    logprobs[move_strs.index(" e4")] = -1.0
+    scores = rank_moves(starting_board, move_strs, logprobs)
+    assert scores[0].move == chess.Move.from_uci("e2e4")
+    assert scores[0].move_str == "e4"
+    assert sum(score.probability for score in scores) == pytest.approx(1.0)
+
+
+def test_player_scores_legal_moves_in_one_call(
+    mock_openai_module: Mock, starting_board: chess.Board
+) -> None:
+    starting_board.push_san("e4")
+    player = GPT3p5TurboInstructPlayer(api_key="test_key", scoring=True)
+    prompt = player.prompt_config.build_prompt(starting_board)
+    legal_moves = list(starting_board.legal_moves)
+    move_logprobs = [[-5.0, -1.0] for _ in legal_moves]
+    move_logprobs[legal_moves.index(chess.Move.from_uci("e7e5"))] = [-0.1, -0.2]
+    create = mock_openai_module.OpenAI.return_value.completions.create
+    create.return_value = echoed_completion(prompt, move_logprobs)
+
+    assert player.make_move(starting_board) == chess.Move.from_uci("e7e5")
+    assert create.call_count == 1
+    assert len(create.call_args.kwargs["prompt"]) == len(legal_moves)
+    assert create.call_args.kwargs["echo"] is True
+    assert player.last_move_scores is not None
+    assert player.last_move_scores[0].logprob == pytest.approx(-0.3)
+
+
+def test_async_player_scores_through_the_response_cache(
+    mock_openai_module: Mock, starting_board: chess.Board
+) -> None:
+    cache = ResponseCache()
+    player = AsyncGPT3p5TurboInstructPlayer(api_key="test_key", scoring=True, response_cache=cache)
+    prompt = player.prompt_config.build_prompt(starting_board)
+    move_logprobs = [[-5.0] for _ in starting_board.legal_moves]
+    create = AsyncMock(return_value=echoed_completion(prompt, move_logprobs))
+    mock_openai_module.AsyncOpenAI.return_value.completions.create = create
+
+    first = asyncio.run(player.score_moves(starting_board))
+    assert asyncio.run(player.score_moves(starting_board)) == first
+    assert create.call_count == 1
+    assert create.call_args.kwargs["echo"] is True
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_player_batches_positions_in_one_call(
+    mock_openai_module: Mock, starting_board: chess.Board
+) -> None:
+    create = mock_openai_module.OpenAI.return_value.completions.create
+    create.side_effect = [completion(" e4", "\n", " Ke2"), completion(" Nf6")]
+    player = GPT3p5TurboInstructPlayer(api_key="test_key")
+    board_black = starting_board.copy()
+    board_black.push_san("d4")
+
+    moves = player.get_moves_batch([starting_board, board_black, starting_board])
+    assert moves == [chess.Move.from_uci("e2e4"), chess.Move.from_uci("g8f6"), None]
+    # The empty completion is retried on its own
+    assert create.call_count == 2
+    assert len(create.call_args_list[0].kwargs["prompt"]) == 3
@@ -0,0 +1,43 @@
+from unittest.mock import Mock
+
+from llm_chess.core.enums import MoveNotation
+from llm_chess.players.llm.schemas import SchemaCache
+
+
+def test_schemas_are_built_once_per_key() -> None:
+    cache = SchemaCache()
+    build = Mock(side_effect=lambda: {"enum": ["e4", "d4"]})
+
+    first = cache.get("openai", MoveNotation.SAN, False, ["e4", "d4"], build, dump=dict)
+    second = cache.get("openai", MoveNotation.SAN, False, ("e4", "d4"), build, dump=dict)
+    assert second is first
+    assert build.call_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.get("openai", MoveNotation.SAN, True, ["e4", "d4"], build)
+    cache.get("gemini", MoveNotation.SAN, False, ["e4", "d4"], build)
+    assert build.call_count == 3
+
+
+def test_serialise_reuses_cached_serialisation() -> None:
+    cache = SchemaCache()
+    schema = cache.get(
+        "openai", MoveNotation.UCI, False, ["e2e4"], lambda: {"enum": ["e2e4"]}, dict
+    )
+    default = Mock(return_value="default")
+
+    assert cache.serialise(schema.value, default) == '{"enum": ["e2e4"]}'
+    assert cache.serialise({"enum": ["e2e4"]}, default) == "default"
+
+
+def test_least_recently_used_schemas_are_evicted() -> None:
+    cache = SchemaCache(maxsize=2)
+    a = cache.get("openai", MoveNotation.UCI, False, ["a"], lambda: ["a"], list)
+    cache.get("openai", MoveNotation.UCI, False, ["b"], lambda: ["b"])
+    cache.get("openai", MoveNotation.UCI, False, ["a"], lambda: ["a"])
+    cache.get("openai", MoveNotation.UCI, False, ["c"], lambda: ["c"])
+
+    assert len(cache) == 2
+    assert cache.find(a.value) is a
+    assert cache.get("openai", MoveNotation.UCI, False, ["b"], lambda: ["new"]).value == ["new"]
+    assert cache.find(a.value) is None
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from llm_chess.players.llm.rate_limit import (
+    RateLimiter,
+    RateLimitLease,
+    TokenBucket,
+    get_rate_limiter,
+    is_rate_limit_error,
+)
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def test_token_bucket_wait_time() -> None:
+    bucket = TokenBucket(per_minute=600, burst_seconds=1)  # 10 per second, holds 10
+    assert bucket.wait_time(10, bucket.updated) == 0
+    bucket.consume(10)
+    assert bucket.wait_time(5, bucket.updated) == pytest.approx(0.5)
+    assert bucket.wait_time(5, bucket.updated + 0.5) == 0
+    # Requests larger than the bucket wait for a full bucket
+    assert bucket.wait_time(100, bucket.updated) == pytest.approx(0.5)
+
+
+def test_is_rate_limit_error() -> None:
+    assert is_rate_limit_error(RateLimitError())
+    assert not is_rate_limit_error(ValueError())
+    try:
+        raise RuntimeError("Error during API call") from RateLimitError()
+    except RuntimeError as e:
+        assert is_rate_limit_error(e)
+
+
+def test_request_budget_blocks_when_exhausted() -> None:
+    limiter = RateLimiter(requests_per_minute=60, headroom=1.0, max_concurrency=100)
+    assert limiter.request_bucket is not None
+    limiter.request_bucket.level = 1
+    assert limiter._try_acquire(RateLimitLease(0)) == 0
+    assert limiter._try_acquire(RateLimitLease(0)) > 0
+
+
+def test_concurrency_limit() -> None:
+    limiter = RateLimiter(initial_concurrency=2)
+    assert limiter._try_acquire(RateLimitLease(0)) == 0
+    assert limiter._try_acquire(RateLimitLease(0)) == 0
+    assert limiter._try_acquire(RateLimitLease(0)) > 0
+    assert limiter.in_flight == 2
+
+
+def test_concurrency_adapts() -> None:
+    limiter = RateLimiter(initial_concurrency=4, max_concurrency=8)
+    for _ in range(4):
+        with limiter.limit():
+            pass
+    assert limiter.concurrency == pytest.approx(5, abs=0.2)
+
+    # A burst of errors from requests in flight only decreases concurrency once
+    leases = [RateLimitLease(0) for _ in range(3)]
+    for lease in leases:
+        assert limiter._try_acquire(lease) == 0
+    for lease in leases:
+        limiter._release(lease, 0.1, RateLimitError())
+    assert limiter.concurrency == pytest.approx(2.5, abs=0.1)
+    assert limiter.n_rate_limited == 3
+    assert limiter.in_flight == 0
+    # Requests are paused while the limiter cools down
+    assert limiter._try_acquire(RateLimitLease(0)) > 0
+
+
+def test_latency_above_target_decreases_concurrency() -> None:
+    limiter = RateLimiter(initial_concurrency=4, target_latency=0.0)
+    with limiter.limit():
+        pass
+    assert limiter.concurrency == pytest.approx(3.6)
+
+
+def test_token_usage_corrects_estimate() -> None:
+    limiter = RateLimiter(tokens_per_minute=6000, headroom=1.0)
+    assert limiter.token_bucket is not None
+    start = limiter.token_bucket.level
+    with limiter.limit(estimated_tokens=100) as lease:
+        lease.tokens = 300
+    assert limiter.token_bucket.level == pytest.approx(start - 300, abs=1)
+
+
+def test_async_limit() -> None:
+    limiter = RateLimiter(initial_concurrency=1, max_concurrency=1)
+
+    async def request(i: int) -> int:
+        async with limiter.alimit():
+            assert limiter.in_flight == 1
+            await asyncio.sleep(0)
+            return i
+
+    async def main() -> list[int]:
+        return await asyncio.gather(*(request(i) for i in range(3)))
+
+    assert asyncio.run(main()) == [0, 1, 2]
+
+
+def test_get_rate_limiter_is_shared() -> None:
+    limiter = get_rate_limiter("test-provider", "model", requests_per_minute=100)
+    assert get_rate_limiter("test-provider", "model") is limiter
+    assert get_rate_limiter("test-provider", "other-model") is not limiter
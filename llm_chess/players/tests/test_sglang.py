@@ -1,9 +1,11 @@
 import sys
+from typing import Any
 from unittest.mock import Mock
 
 import chess
 import pytest
 
+from llm_chess.conftest import MockPromptConfig
 from llm_chess.core.enums import APIResponseFormat
 from llm_chess.players.llm.sglang import SGLangPlayer
 
@@ -12,10 +14,8 @@ from llm_chess.players.llm.sglang import SGLangPlayer
 def mock_sglang(monkeypatch: pytest.MonkeyPatch) -> Mock:
     import llm_chess.players.llm.sglang as sglang_module
 
-    monkeypatch.setattr(sglang_module, "RuntimeEndpoint", lambda url: url)
-
-    set_default_backend_mock = Mock()
-    monkeypatch.setattr(sglang_module, "set_default_backend", set_default_backend_mock)
+    runtime_endpoint_mock = Mock(side_effect=lambda url: url)
+    monkeypatch.setattr(sglang_module, "RuntimeEndpoint", runtime_endpoint_mock)
 
     def fake_function_decorator(func):
         class Wrapper:  # pylint: disable=too-few-public-methods
@@ -29,6 +29,12 @@ def mock_sglang(monkeypatch: pytest.MonkeyPatch) -> Mock:
             def run(*_args, **_kwargs):
                 return {"move": "e2e4"}
 
+            @staticmethod
+            def run_batch(
+                batch_kwargs: list[dict[str, Any]], *_args: Any, **_kwargs: Any
+            ) -> list[dict[str, str]]:
+                return [{"move": "e2e4"} for _ in batch_kwargs]
+
         return Wrapper(func)
 
     monkeypatch.setattr(sglang_module, "function", fake_function_decorator)
@@ -36,7 +42,7 @@ def mock_sglang(monkeypatch: pytest.MonkeyPatch) -> Mock:
     for name in ("assistant", "system", "user", "gen"):
         monkeypatch.setattr(sglang_module, name, lambda *args, **kwargs: None)
 
-    return set_default_backend_mock
+    return runtime_endpoint_mock
 
 
 @pytest.fixture
@@ -107,3 +113,113 @@ def test_make_move_invalid(
 
     with pytest.raises(ValueError):
         player.make_move(starting_board)
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="Test only runs on Linux systems")
+def test_get_moves_batch(player: SGLangPlayer, starting_board: chess.Board) -> None:
+    """Positions are served by a single batch, and illegal replies give None."""
+    starting_board_black = starting_board.copy()
+    starting_board_black.push_san("e4")
+    moves = player.get_moves_batch([starting_board, starting_board_black])
+    assert moves == [chess.Move.from_uci("e2e4"), None]
+
+
+class FakeProgramState:
+    """Program state that generates a scripted move on each fork."""
+
+    def __init__(self, moves: list[str]):
+        self.moves = moves
+        self.n_appended = 0
+        self.stream_executor = Mock()
+
+    def sync(self) -> None:
+        pass
+
+    def fork(self, size: int) -> list["FakeProgramState"]:
+        return [FakeProgramState(self.moves[1:]) for _ in range(size)]
+
+    def __iadd__(self, expr: object) -> "FakeProgramState":
+        self.n_appended += 1
+        return self
+
+    def __getitem__(self, name: str) -> str:
+        return self.moves[0]
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="Test only runs on Linux systems")
+def test_multi_turn_session_is_continued(
+    mock_prompt_config: MockPromptConfig, mock_sglang: Mock, starting_board: chess.Board
+) -> None:
+    """Later moves fork the game's session rather than replaying the history."""
+    mock_prompt_config.api_response_format = APIResponseFormat.MULTI_TURN
+    player = SGLangPlayer(name="TestSGLang", prompt_config=mock_prompt_config)
+    program = Mock()
+    program.run.return_value = FakeProgramState(["e2e4", "g1f3"])
+    player._multi_turn_program = program
+
+    assert player._get_model_response(starting_board) == "e2e4"
+    starting_board.push_uci("e2e4")
+    starting_board.push_uci("e7e5")
+    assert player._get_model_response(starting_board) == "g1f3"
+    assert program.run.call_count == 1
+    [[(state, _)]] = player._sessions.values()
+    assert state.n_appended == 2
+
+    # A position from another game starts a new session
+    assert player._get_model_response(chess.Board()) == "e2e4"
+    assert program.run.call_count == 2
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="Test only runs on Linux systems")
+def test_games_are_pinned_to_replicas(
+    mock_prompt_config: MockPromptConfig, mock_sglang: Mock, starting_board: chess.Board
+) -> None:
+    """New games go to the least-loaded replica and stay there."""
+    mock_prompt_config.api_response_format = APIResponseFormat.MULTI_TURN
+    urls = ["http://replica-0:30000", "http://replica-1:30000"]
+    player = SGLangPlayer(name="TestSGLang", prompt_config=mock_prompt_config, urls=urls)
+    program = Mock()
+    program.run.side_effect = [
+        FakeProgramState(["e2e4", "g1f3"]),
+        FakeProgramState(["d2d4", "g1f3"]),
+    ]
+    player._multi_turn_program = program
+
+    other_board = chess.Board()
+    player._get_model_response(starting_board)
+    player._get_model_response(other_board)
+    backends = [call.kwargs["backend"] for call in program.run.call_args_list]
+    assert backends == urls
+    assert [replica.load for replica in player.replicas] == [1, 1]
+
+    starting_board.push_uci("e2e4")
+    starting_board.push_uci("e7e5")
+    player._get_model_response(starting_board)
+    assert program.run.call_count == 2
+    [(_, replica)] = player._sessions[(*starting_board.move_stack, chess.Move.from_uci("g1f3"))]
+    assert replica is player.replicas[0]
+    assert [replica.load for replica in player.replicas] == [1, 1]
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="Test only runs on Linux systems")
+def test_sessions_do_not_hold_executor_threads(
+    mock_prompt_config: MockPromptConfig, mock_sglang: Mock, starting_board: chess.Board
+) -> None:
+    """Saved states have their executors ended, and sessions are cleared on exit."""
+    mock_prompt_config.api_response_format = APIResponseFormat.MULTI_TURN
+    urls = ["http://replica-0:30000"]
+    with SGLangPlayer(name="TestSGLang", prompt_config=mock_prompt_config, urls=urls) as player:
+        program = Mock()
+        program.run.return_value = FakeProgramState(["e2e4", "g1f3"])
+        player._multi_turn_program = program
+
+        player._get_model_response(starting_board)
+        starting_board.push_uci("e2e4")
+        starting_board.push_uci("e7e5")
+        player._get_model_response(starting_board)
+        [[(state, _)]] = player._sessions.values()
+        state.stream_executor.end.assert_called_once()
+        program.run.return_value.stream_executor.end.assert_called_once()
+
+    assert not player._sessions
+    assert player.replicas[0].load == 0
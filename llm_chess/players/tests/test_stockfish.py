@@ -1,7 +1,10 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
 import chess
 import pytest
 
-from llm_chess.players.engine.stockfish import StockfishPlayer
+from llm_chess.players.engine.stockfish import AsyncStockfishPlayer, StockfishPlayer
 
 
 @pytest.fixture
@@ -39,3 +42,32 @@ def test_context_manager(player: StockfishPlayer) -> None:
     with player as p:
         assert p.engine is not None
     assert player.engine is None
+
+
+@pytest.fixture
+def mock_uci_protocol(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    protocol = Mock()
+    protocol.configure = AsyncMock()
+    protocol.play = AsyncMock(return_value=Mock(move=chess.Move.from_uci("e2e4")))
+    protocol.quit = AsyncMock()
+    popen_uci = AsyncMock(return_value=(Mock(), protocol))
+    monkeypatch.setattr("llm_chess.players.engine.stockfish.chess.engine.popen_uci", popen_uci)
+    return protocol
+
+
+def test_async_player_starts_engine_lazily(
+    mock_uci_protocol: Mock, starting_board: chess.Board
+) -> None:
+    player = AsyncStockfishPlayer(name="AsyncStockfish", engine_path="stockfish", elo=1500)
+    assert player.engine is None
+
+    async def play() -> chess.Move | None:
+        async with player:
+            return await player.make_move(starting_board)
+
+    move = asyncio.run(play())
+
+    assert move == chess.Move.from_uci("e2e4")
+    mock_uci_protocol.configure.assert_awaited_once_with(player.config.uci_options())
+    mock_uci_protocol.quit.assert_awaited_once()
+    assert player.engine is None
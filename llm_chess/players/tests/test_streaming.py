@@ -0,0 +1,106 @@
+from collections.abc import Iterator
+from unittest.mock import Mock
+
+import chess
+import pytest
+
+from llm_chess.players.llm.openai import OpenAIPlayer
+from llm_chess.players.llm.openai_instruct import GPT3p5TurboInstructPlayer
+from llm_chess.players.llm.streaming import (
+    FirstTokenParser,
+    FullTextParser,
+    JSONFieldParser,
+    read_stream,
+)
+from llm_chess.prompts.base import PromptConfig
+
+
+class MockStream:
+    """A stream of completion chunks that records how many were read."""
+
+    def __init__(self, chunks: list[Mock]):
+        self.chunks = chunks
+        self.n_read = 0
+        self.closed = False
+
+    def __iter__(self) -> Iterator[Mock]:
+        for chunk in self.chunks:
+            self.n_read += 1
+            yield chunk
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def chat_chunk(text: str) -> Mock:
+    chunk = Mock()
+    chunk.choices = [Mock()]
+    chunk.choices[0].delta.content = text
+    return chunk
+
+
+def completion_chunk(text: str) -> Mock:
+    chunk = Mock()
+    chunk.choices = [Mock()]
+    chunk.choices[0].text = text
+    return chunk
+
+
+@pytest.mark.parametrize(
+    "chunks,expected",
+    [
+        ([" e", "4", " e5"], "e4"),
+        (["\n", " Nf3", "\n"], "Nf3"),
+        ([" O-O"], "O-O"),  # Stream ends before any trailing whitespace
+        (["\n"], None),
+    ],
+)
+def test_first_token_parser(chunks: list[str], expected: str | None) -> None:
+    assert read_stream(chunks, FirstTokenParser()) == expected
+
+
+def test_json_field_parser_stops_at_closing_quote() -> None:
+    chunks = iter(['{"mo', 've": "e', "2e4", '"', ', "reasoning": "..."}'])
+    assert read_stream(chunks, JSONFieldParser("move")) == "e2e4"
+    assert next(chunks) == ', "reasoning": "..."}'
+
+
+def test_json_field_parser_handles_escapes() -> None:
+    assert read_stream(['{"move": "a\\"b"}'], JSONFieldParser("move")) == 'a"b'
+    assert read_stream(['{"other": "e4"}'], JSONFieldParser("move")) is None
+
+
+def test_full_text_parser() -> None:
+    assert read_stream(["e2", "e4 "], FullTextParser()) == "e2e4"
+
+
+def test_openai_player_closes_stream_early(
+    monkeypatch: pytest.MonkeyPatch, mock_prompt_config: PromptConfig, starting_board: chess.Board
+) -> None:
+    mock_openai_module = Mock()
+    stream = MockStream([chat_chunk(text) for text in ['{"move": "e2', 'e4"', "}", ""]])
+    mock_openai_module.OpenAI.return_value.chat.completions.create.return_value = stream
+    monkeypatch.setattr("llm_chess.players.llm.openai.openai", mock_openai_module)
+    player = OpenAIPlayer("Streaming", mock_prompt_config, api_key="test_key", stream=True)
+
+    assert player.make_move(starting_board) == chess.Move.from_uci("e2e4")
+    assert stream.n_read == 2
+    assert stream.closed
+    create = mock_openai_module.OpenAI.return_value.chat.completions.create
+    assert create.call_args.kwargs["stream"] is True
+
+
+def test_instruct_player_streams_first_token(
+    monkeypatch: pytest.MonkeyPatch, mock_prompt_config: PromptConfig
+) -> None:
+    mock_openai_module = Mock()
+    stream = MockStream([completion_chunk(text) for text in [" e", "4 ", "e5"]])
+    mock_openai_module.OpenAI.return_value.completions.create.return_value = stream
+    monkeypatch.setattr("llm_chess.players.llm.openai_instruct.openai", mock_openai_module)
+    player = GPT3p5TurboInstructPlayer(
+        prompt_config=mock_prompt_config, api_key="test_key", stream=True
+    )
+
+    assert player._call_model("1.") == "e4"
+    assert stream.n_read == 2
+    assert stream.closed
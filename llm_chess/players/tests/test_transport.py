@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from llm_chess.players.llm.gemini import GeminiPlayer
+from llm_chess.players.llm.openai import OpenAIPlayer
+from llm_chess.players.llm.openai_instruct import GPT3p5TurboInstructPlayer
+from llm_chess.players.llm.transport import Transport, TransportConfig
+from llm_chess.prompts.base import PromptConfig
+
+
+@pytest.fixture
+def transport() -> Transport:
+    return Transport(TransportConfig(max_connections=4, http2=False))
+
+
+def test_clients_are_shared_per_key(transport: Transport) -> None:
+    client = transport.openai_client("key", "https://api.openai.com/v1")
+
+    assert transport.openai_client("key", "https://api.openai.com/v1") is client
+    assert transport.openai_client("other-key", "https://api.openai.com/v1") is not client
+    assert transport.openai_client("key", "https://api.x.ai/v1") is not client
+
+
+def test_players_share_client(transport: Transport, mock_prompt_config: PromptConfig) -> None:
+    chat = OpenAIPlayer("Chat", mock_prompt_config, api_key="key", transport=transport)
+    instruct = GPT3p5TurboInstructPlayer(
+        prompt_config=mock_prompt_config, api_key="key", transport=transport
+    )
+    gemini_1 = GeminiPlayer("Gemini 1", mock_prompt_config, api_key="key", transport=transport)
+    gemini_2 = GeminiPlayer("Gemini 2", mock_prompt_config, api_key="key", transport=transport)
+
+    assert chat.client is instruct.client
+    assert gemini_1.client is gemini_2.client
+
+
+def test_close(transport: Transport) -> None:
+    client = transport.openai_client("key", "https://api.openai.com/v1")
+    transport.async_openai_client("key", "https://api.openai.com/v1")
+    transport.gemini_client("key")
+
+    asyncio.run(transport.aclose())
+
+    assert client._client.is_closed
@@ -1,4 +1,7 @@
 import re
+import threading
+from collections import OrderedDict
+from typing import Any
 
 import chess
 import chess.pgn
@@ -6,10 +9,72 @@ import chess.pgn
 from llm_chess.core.enums import APIResponseFormat, MoveNotation
 from llm_chess.prompts.base import PromptConfig
 
+# Number of games whose rendered movetext is kept for incremental prompt building
+MAX_CACHED_GAMES = 64
+
+_MOVE_NUMBER_PATTERN = re.compile(r" (\d+)\. ")
+
+
+class PGNMovetextBuilder:
+    """
+    Renders the movetext of a game one ply at a time, in the layout used by PGN prompts:
+    each full move on its own line. The SAN of each ply is computed once, when it is
+    added, rather than for every ply each time the prompt is built.
+
+    Like `chess.pgn.Game`, moves are replayed from the standard starting position.
+    """
+
+    def __init__(self) -> None:
+        self.board = chess.Board()
+        self.text = ""
+        # Length of the text before each ply, for take-backs
+        self._lengths: list[int] = []
+
+    def update(self, moves: list[chess.Move], n_common: int | None = None) -> None:
+        """
+        Render the given moves, keeping the text of any plies already rendered.
+
+        Args:
+            moves: The moves of the game.
+            n_common: The number of leading moves already rendered, if known. Later
+                rendered plies are taken back.
+        """
+        rendered = self.board.move_stack
+        if n_common is None:
+            n_common = 0
+            for rendered_move, move in zip(rendered, moves, strict=False):
+                if rendered_move != move:
+                    break
+                n_common += 1
+        while len(rendered) > n_common:
+            self.board.pop()
+            self.text = self.text[: self._lengths.pop()]
+
+        for move in moves[n_common:]:
+            self._lengths.append(len(self.text))
+            san = self.board.san(move)
+            if self.board.turn == chess.WHITE:
+                separator = "\n" if self.text else ""
+                self.text += f"{separator}{self.board.fullmove_number}. {san}"
+            else:
+                self.text += f" {san}"
+            self.board.push(move)
+
+    def copy(self) -> "PGNMovetextBuilder":
+        builder = PGNMovetextBuilder()
+        builder.board = self.board.copy()
+        builder.text = self.text
+        builder._lengths = list(self._lengths)
+        return builder
+
 
 class PGNPromptConfig(PromptConfig):
     """
     Config for generating a PGN representation of a chess game.
+
+    The movetext of recent games is cached, so building the prompt for a game's next
+    position only renders the new plies. Positions are matched to cached games by their
+    moves, so board copies share a cache entry and take-backs reuse the moves they keep.
     """
 
     def __init__(
@@ -61,26 +126,39 @@ class PGNPromptConfig(PromptConfig):
         self.white_player_elo = white_player_elo
         self.black_player_elo = black_player_elo
         self.prompt_prefix = prompt_prefix
+        self._builders: OrderedDict[tuple[chess.Move, ...], PGNMovetextBuilder] = OrderedDict()
+        self._builders_lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_builders"], state["_builders_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._builders = OrderedDict()
+        self._builders_lock = threading.Lock()
 
     def _get_result(self, is_white_turn: bool) -> str:
         if self.result is not None:
             return self.result
         return "1-0" if is_white_turn else "0-1"
 
+    def _get_headers(self, result: str) -> dict[str, str]:
+        return {
+            "Event": self.event,
+            "Site": self.site,
+            "Date": self.date,
+            "Round": self.round,
+            "White": self.white_player,
+            "Black": self.black_player,
+            "Result": result,
+            "WhiteElo": str(self.white_player_elo),
+            "BlackElo": str(self.black_player_elo),
+        }
+
     def _get_PGN_game(self, board: chess.Board, result: str) -> chess.pgn.Game:
-        game = chess.pgn.Game(
-            headers={
-                "Event": self.event,
-                "Site": self.site,
-                "Date": self.date,
-                "Round": self.round,
-                "White": self.white_player,
-                "Black": self.black_player,
-                "Result": result,
-                "WhiteElo": str(self.white_player_elo),
-                "BlackElo": str(self.black_player_elo),
-            }
-        )
+        game = chess.pgn.Game(headers=self._get_headers(result))
 
         node = game
         for move in board.move_stack:
@@ -109,8 +187,10 @@ class PGNPromptConfig(PromptConfig):
         game_str = str(game)[: -len(result)]
 
         # Format each full turn as its own line
-        game_str = re.sub(r" (\d+)\. ", r"\n\1. ", game_str)
+        game_str = _MOVE_NUMBER_PATTERN.sub(r"\n\1. ", game_str)
+        return self._add_move_number(game_str, board)
 
+    def _add_move_number(self, game_str: str, board: chess.Board) -> str:
         if board.turn == chess.WHITE:  # Add current move number indicator
             n = board.fullmove_number
             if n == 1:
@@ -132,8 +212,53 @@ class PGNPromptConfig(PromptConfig):
             appropriate formatting for prompting an LLM
         """
         result = self._get_result(board.turn == chess.WHITE)
-        game = self._get_PGN_game(board, result)
-        game_str = self._convert_PGN_game_to_string(game, board, result)
+        # Equivalent to `_convert_PGN_game_to_string`, with the movetext built
+        # incrementally. Only the headers are formatted from scratch.
+        headers = str(chess.pgn.Game(headers=self._get_headers(result)))[: -len(result)]
+        movetext = self._get_movetext(board)
+        game_str = _MOVE_NUMBER_PATTERN.sub(r"\n\1. ", headers)
+        if movetext:
+            game_str += movetext + " "
+        game_str = self._add_move_number(game_str, board)
         if self.prompt_prefix:
             game_str = f"{self.prompt_prefix}\n\n{game_str}"
         return game_str if self.move_response_has_leading_space else game_str + " "
+
+    def _get_movetext(self, board: chess.Board) -> str:
+        """Render the board's movetext, continuing from a cached game where possible."""
+        moves = board.move_stack
+        with self._builders_lock:
+            builder, n_common = self._take_builder(moves)
+        builder.update(moves, n_common)
+        with self._builders_lock:
+            self._builders[tuple(moves)] = builder
+            while len(self._builders) > MAX_CACHED_GAMES:
+                self._builders.popitem(last=False)
+        return builder.text
+
+    def _take_builder(self, moves: list[chess.Move]) -> tuple[PGNMovetextBuilder, int]:
+        """
+        Find the cached game to continue, and the number of its moves to keep. The
+        builder is removed from the cache while it's updated.
+        """
+        # Usually the same game, one or two plies on
+        for n_new in range(min(len(moves), 2) + 1):
+            key = tuple(moves[: len(moves) - n_new])
+            builder = self._builders.pop(key, None)
+            if builder is not None:
+                return builder, len(key)
+
+        # Otherwise, e.g. after a take-back, copy the game sharing the most moves
+        best_key: tuple[chess.Move, ...] = ()
+        n_best = 0
+        for key in self._builders:
+            n_common = 0
+            for cached_move, move in zip(key, moves, strict=False):
+                if cached_move != move:
+                    break
+                n_common += 1
+            if n_common > n_best:
+                best_key, n_best = key, n_common
+        if n_best == 0:
+            return PGNMovetextBuilder(), 0
+        return self._builders[best_key].copy(), n_best
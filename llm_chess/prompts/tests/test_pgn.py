@@ -1,3 +1,5 @@
+import random
+
 import chess
 import pytest
 from pytest import FixtureRequest
@@ -118,3 +120,38 @@ def test_pgn_prompt_config(
     assert f'[Result "{expected_result}"]' in prompt
     for expected_move in expected_moves:
         assert expected_move in prompt
+
+
+def rebuilt_prompt(config: PGNPromptConfig, board: chess.Board) -> str:
+    """The prompt built from a full `chess.pgn.Game`, without the movetext cache."""
+    result = config._get_result(board.turn == chess.WHITE)
+    game_str = config._convert_PGN_game_to_string(
+        config._get_PGN_game(board, result), board, result
+    )
+    if config.prompt_prefix:
+        game_str = f"{config.prompt_prefix}\n\n{game_str}"
+    return game_str if config.move_response_has_leading_space else game_str + " "
+
+
+@pytest.mark.parametrize("move_response_has_leading_space", [True, False])
+@pytest.mark.parametrize("prompt_prefix", [None, "Continue the game."])
+def test_incremental_prompt_matches_rebuilt_prompt(
+    move_response_has_leading_space: bool, prompt_prefix: str | None
+) -> None:
+    config = PGNPromptConfig(
+        move_response_has_leading_space=move_response_has_leading_space,
+        prompt_prefix=prompt_prefix,
+    )
+    rng = random.Random(0)
+    boards = [chess.Board() for _ in range(3)]
+    for ply in range(80):
+        for board in boards:
+            if board.is_game_over():
+                continue
+            board.push(rng.choice(list(board.legal_moves)))
+            if ply % 17 == 16:  # Take back two plies and continue from a copy
+                board.pop()
+                board.pop()
+                board = board.copy()
+            assert config.build_prompt(board) == rebuilt_prompt(config, board)
+    assert config.build_prompt(chess.Board()) == rebuilt_prompt(config, chess.Board())
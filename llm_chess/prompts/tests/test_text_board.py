@@ -1,9 +1,16 @@
+import random
 from typing import Literal
 
+import chess
 import pytest
 
 from llm_chess.core.enums import MoveNotation
-from llm_chess.prompts.text_board import TextBoardPromptConfig, board_to_text
+from llm_chess.prompts.text_board import (
+    PIECE_SYMBOLS,
+    TextBoardPromptConfig,
+    board_to_text,
+    boards_to_text,
+)
 
 
 @pytest.mark.parametrize(
@@ -89,3 +96,30 @@ def test_text_board_prompt_config(
     assert f"It is your turn as {colour}." in prompt
     assert board_str_fixture in prompt
     assert moves_formatted_fixture in prompt
+
+
+def _legacy_board_to_text(board: chess.Board, flip_board: bool, piece_symbols: bool) -> str:
+    """The original implementation, which translates `str(board)`."""
+    symbols: dict[str, str | int | None] = dict(PIECE_SYMBOLS)
+    str_board = str(board).translate(str.maketrans(symbols)) if piece_symbols else str(board)
+    rows_with_labels = [f"{8 - i} {line}" for i, line in enumerate(str_board.splitlines())]
+    if flip_board:
+        rows_with_labels = rows_with_labels[::-1]
+    return "\n".join(rows_with_labels) + "\n  a b c d e f g h"
+
+
+@pytest.mark.parametrize("flip_board", [False, True])
+@pytest.mark.parametrize("piece_symbols", [False, True])
+def test_board_to_text_matches_legacy_rendering(flip_board: bool, piece_symbols: bool) -> None:
+    rng = random.Random(0)
+    boards = []
+    board = chess.Board()
+    for _ in range(100):
+        if board.is_game_over():
+            board = chess.Board()
+        board.push(rng.choice(list(board.legal_moves)))
+        boards.append(board.copy())
+
+    expected = [_legacy_board_to_text(board, flip_board, piece_symbols) for board in boards]
+    assert [board_to_text(board, flip_board, piece_symbols) for board in boards] == expected
+    assert boards_to_text(boards, flip_board, piece_symbols) == expected
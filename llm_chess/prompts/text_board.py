@@ -1,3 +1,5 @@
+from collections.abc import Iterable
+
 import chess
 
 from llm_chess.core.enums import APIResponseFormat, MoveNotation
@@ -20,30 +22,88 @@ Upper case letters denote white pieces, and lower case letters denote black piec
 """
 
 
-def board_to_text(board: chess.Board, flip_board: bool = False, piece_symbols: bool = True) -> str:
-    piece_symbols_map = {
-        "K": "♔",
-        "Q": "♕",
-        "R": "♖",
-        "B": "♗",
-        "N": "♘",
-        "P": "♙",
-        "k": "♚",
-        "q": "♛",
-        "r": "♜",
-        "b": "♝",
-        "n": "♞",
-        "p": "♟",
+PIECE_SYMBOLS = {
+    "K": "♔",
+    "Q": "♕",
+    "R": "♖",
+    "B": "♗",
+    "N": "♘",
+    "P": "♙",
+    "k": "♚",
+    "q": "♛",
+    "r": "♜",
+    "b": "♝",
+    "n": "♞",
+    "p": "♟",
+}
+
+# The glyph of each piece, indexed by whether to use piece symbols, then colour, then
+# piece type
+_GLYPHS = {
+    piece_symbols: {
+        colour: {
+            piece_type: (
+                PIECE_SYMBOLS[chess.Piece(piece_type, colour).symbol()]
+                if piece_symbols
+                else chess.Piece(piece_type, colour).symbol()
+            )
+            for piece_type in chess.PIECE_TYPES
+        }
+        for colour in chess.COLORS
     }
-    translation_table = str.maketrans(piece_symbols_map)
-    str_board = str(board).translate(translation_table) if piece_symbols else str(board)
+    for piece_symbols in (True, False)
+}
+_EMPTY_SQUARE = "."
+_RANK_LABELS = [f"{rank + 1} " for rank in range(8)]
+_FILE_LABELS = "\n  a b c d e f g h"
+
+
+def board_to_text(board: chess.Board, flip_board: bool = False, piece_symbols: bool = True) -> str:
+    """
+    Render the board as text, with rank and file labels.
+
+    Args:
+        board: The board to render.
+        flip_board: Whether to show the first rank at the top, as seen by black.
+        piece_symbols: Whether to use piece symbols. If False, use letters, with upper
+            case for white and lower case for black.
+    """
+    return _render(board, flip_board, _GLYPHS[piece_symbols])
+
+
+def boards_to_text(
+    boards: Iterable[chess.Board], flip_board: bool = False, piece_symbols: bool = True
+) -> list[str]:
+    """
+    Render many boards as text, as `board_to_text`, e.g. to generate datasets.
+    """
+    glyphs = _GLYPHS[piece_symbols]
+    return [_render(board, flip_board, glyphs) for board in boards]
+
 
-    rows_with_labels = [f"{8 - i} {line}" for i, line in enumerate(str_board.splitlines())]
-    if flip_board:
-        rows_with_labels = rows_with_labels[::-1]
-    str_board = "\n".join(rows_with_labels) + "\n  a b c d e f g h"
+def _render(
+    board: chess.Board, flip_board: bool, glyphs: dict[chess.Color, dict[chess.PieceType, str]]
+) -> str:
+    # Place each piece's glyph on its square, reading the pieces off the bitboards
+    squares = [_EMPTY_SQUARE] * 64
+    for colour in chess.COLORS:
+        occupied = board.occupied_co[colour]
+        colour_glyphs = glyphs[colour]
+        for piece_type, pieces in (
+            (chess.PAWN, board.pawns),
+            (chess.KNIGHT, board.knights),
+            (chess.BISHOP, board.bishops),
+            (chess.ROOK, board.rooks),
+            (chess.QUEEN, board.queens),
+            (chess.KING, board.kings),
+        ):
+            glyph = colour_glyphs[piece_type]
+            for square in chess.scan_forward(pieces & occupied):
+                squares[square] = glyph
 
-    return str(str_board)
+    ranks = range(8) if flip_board else range(7, -1, -1)
+    rows = [_RANK_LABELS[rank] + " ".join(squares[rank * 8 : rank * 8 + 8]) for rank in ranks]
+    return "\n".join(rows) + _FILE_LABELS
 
 
 class TextBoardPromptConfig(PromptConfig, ResponseInstructionsMixin):
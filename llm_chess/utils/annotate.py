@@ -0,0 +1,298 @@
+import csv
+import functools
+import logging
+import math
+import multiprocessing.util
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import chess
+import chess.engine
+import chess.pgn
+
+from llm_chess.players.engine.cache import EvaluationCache, analyse
+
+logger = logging.getLogger(__name__)
+
+# Centipawn loss thresholds for each classification, from most to least severe
+CLASSIFICATION_THRESHOLDS = (("blunder", 300), ("mistake", 100), ("inaccuracy", 50))
+CLASSIFICATION_NAGS = {
+    "blunder": chess.pgn.NAG_BLUNDER,
+    "mistake": chess.pgn.NAG_MISTAKE,
+    "inaccuracy": chess.pgn.NAG_DUBIOUS_MOVE,
+}
+
+# Evaluations are clamped to this many centipawns, so that e.g. missing a mate in a
+# completely winning position does not count as a huge loss
+MAX_CP = 1000
+MATE_CP = 100_000
+
+EngineFactory = Callable[[], chess.engine.SimpleEngine]
+
+
+@dataclass(frozen=True)
+class MoveAnnotation:
+    ply: int
+    colour: str
+    move: str
+    cp_before: int
+    cp_after: int
+    cp_loss: int
+    classification: str | None
+    accuracy: float
+
+
+@dataclass(frozen=True)
+class GameAnnotation:
+    source: str
+    white: str
+    black: str
+    result: str
+    moves: list[MoveAnnotation]
+
+    def accuracy(self, colour: chess.Color) -> float | None:
+        """The mean move accuracy of the given side, or None if it made no moves."""
+        colour_name = "white" if colour == chess.WHITE else "black"
+        accuracies = [move.accuracy for move in self.moves if move.colour == colour_name]
+        return sum(accuracies) / len(accuracies) if accuracies else None
+
+
+def win_percent(cp: int) -> float:
+    """Convert a centipawn evaluation to a winning chance between 0 and 100."""
+    return 50 + 50 * (2 / (1 + math.exp(-0.00368208 * cp)) - 1)
+
+
+def move_accuracy(win_percent_before: float, win_percent_after: float) -> float:
+    """
+    Accuracy of a move, between 0 and 100, from the drop in the mover's winning chance.
+    Uses the same formula as Lichess.
+    """
+    accuracy = 103.1668 * math.exp(-0.04354 * (win_percent_before - win_percent_after)) - 3.1669
+    return min(max(accuracy, 0.0), 100.0)
+
+
+def classify(cp_loss: int) -> str | None:
+    """Classify a move as a blunder, mistake or inaccuracy by its centipawn loss."""
+    for classification, threshold in CLASSIFICATION_THRESHOLDS:
+        if cp_loss >= threshold:
+            return classification
+    return None
+
+
+def _clamped_cp(score: chess.engine.PovScore, colour: chess.Color) -> int:
+    cp = score.pov(colour).score(mate_score=MATE_CP)
+    return min(max(cp, -MAX_CP), MAX_CP)
+
+
+def annotate_game(
+    game: chess.pgn.Game,
+    engine: chess.engine.SimpleEngine,
+    limit: chess.engine.Limit,
+    cache: EvaluationCache | None = None,
+    source: str = "",
+) -> GameAnnotation:
+    """
+    Score every mainline move of a game with the engine.
+
+    Args:
+        game: The game to annotate.
+        engine: The engine used to evaluate each position.
+        limit: The search limit for each position.
+        cache: Optional evaluation cache, so repeated positions are only analysed once.
+        source: Identifier of the game's source, e.g. its file name.
+
+    Returns:
+        The per-move annotations for the game.
+    """
+    board = game.board()
+    score = analyse(engine, board, limit, cache).score
+    moves = []
+    for move in game.mainline_moves():
+        colour = board.turn
+        san = board.san(move)
+        board.push(move)
+        if board.is_checkmate():
+            next_score = chess.engine.PovScore(chess.engine.Mate(0), board.turn)
+        elif board.is_game_over():
+            next_score = chess.engine.PovScore(chess.engine.Cp(0), board.turn)
+        else:
+            next_score = analyse(engine, board, limit, cache).score
+
+        cp_before, cp_after = _clamped_cp(score, colour), _clamped_cp(next_score, colour)
+        cp_loss = max(cp_before - cp_after, 0)
+        moves.append(
+            MoveAnnotation(
+                ply=len(board.move_stack),
+                colour="white" if colour == chess.WHITE else "black",
+                move=san,
+                cp_before=cp_before,
+                cp_after=cp_after,
+                cp_loss=cp_loss,
+                classification=classify(cp_loss),
+                accuracy=move_accuracy(win_percent(cp_before), win_percent(cp_after)),
+            )
+        )
+        score = next_score
+
+    return GameAnnotation(
+        source=source,
+        white=game.headers.get("White", "?"),
+        black=game.headers.get("Black", "?"),
+        result=game.headers.get("Result", "*"),
+        moves=moves,
+    )
+
+
+def add_comments(game: chess.pgn.Game, annotation: GameAnnotation) -> None:
+    """
+    Write an annotation into a game as move comments, NAGs and accuracy headers. Each
+    comment holds the clamped evaluation after the move as an `[%eval]` command, the
+    centipawn loss and the classification, if any.
+    """
+    for node, move in zip(game.mainline(), annotation.moves, strict=True):
+        node.comment = f"cp_loss {move.cp_loss}"
+        if move.classification is not None:
+            node.comment = f"{move.classification} ({node.comment})"
+            node.nags.add(CLASSIFICATION_NAGS[move.classification])
+        colour = chess.WHITE if move.colour == "white" else chess.BLACK
+        node.set_eval(chess.engine.PovScore(chess.engine.Cp(move.cp_after), colour))
+
+    for colour, header in ((chess.WHITE, "WhiteAccuracy"), (chess.BLACK, "BlackAccuracy")):
+        accuracy = annotation.accuracy(colour)
+        if accuracy is not None:
+            game.headers[header] = f"{accuracy:.1f}"
+
+
+def read_games(pgn_file_path: str | Path) -> Iterator[chess.pgn.Game]:
+    """Stream every game from a PGN file, without reading the whole file at once."""
+    with open(pgn_file_path, encoding="utf-8") as pgn:
+        while (game := chess.pgn.read_game(pgn)) is not None:
+            yield game
+
+
+# Per-process state for worker processes, created by `_init_worker`
+_worker_engine: chess.engine.SimpleEngine | None = None
+_worker_cache: EvaluationCache | None = None
+
+
+def _init_worker(engine_factory: EngineFactory, cache_path: Path | None) -> None:
+    global _worker_engine, _worker_cache
+    _worker_engine = engine_factory()
+    # Worker processes skip `atexit` handlers, so register the engine shutdown with
+    # multiprocessing's own finalisers instead
+    multiprocessing.util.Finalize(None, _worker_engine.quit, exitpriority=10)
+    _worker_cache = EvaluationCache(cache_path) if cache_path is not None else None
+
+
+def _annotate_file(
+    pgn_file_path: Path, pgn_dir: Path, output_dir: Path | None, limit: chess.engine.Limit
+) -> list[GameAnnotation]:
+    assert _worker_engine is not None, "Worker engine has not been initialised."
+    # Files are identified by their path within the directory, as runs in different
+    # subdirectories reuse file names
+    relative_path = pgn_file_path.relative_to(pgn_dir)
+    annotations = []
+    annotated_games = []
+    for game in read_games(pgn_file_path):
+        annotation = annotate_game(
+            game, _worker_engine, limit, _worker_cache, relative_path.as_posix()
+        )
+        annotations.append(annotation)
+        if output_dir is not None:
+            add_comments(game, annotation)
+            annotated_games.append(game)
+
+    if output_dir is not None:
+        output_path = output_dir / relative_path
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            for game in annotated_games:
+                print(game, file=f, end="\n\n")
+    return annotations
+
+
+def annotate_directory(
+    pgn_dir: str | Path,
+    output_dir: str | Path | None = None,
+    table_path: str | Path | None = None,
+    engine_path: str | None = None,
+    limit: chess.engine.Limit | None = None,
+    n_workers: int | None = None,
+    cache_path: str | Path | None = None,
+    engine_factory: EngineFactory | None = None,
+) -> Iterator[GameAnnotation]:
+    """
+    Annotate every game in a directory of PGN files, including those in its
+    subdirectories, using one engine per worker process.
+
+    Files are distributed across the workers as they become free, so throughput scales
+    with the number of cores. Annotations are yielded in file order.
+
+    Args:
+        pgn_dir: Directory containing `.pgn` files, which are found recursively. Each
+            file is identified by its path relative to this directory, e.g. in the
+            table's `source` column.
+        output_dir: If given, annotated copies of the PGN files are written here, at
+            the same relative paths, with evaluations, centipawn loss and
+            classifications as comments, and each side's accuracy in the headers.
+        table_path: If given, a CSV side table with one row per move is written here.
+        engine_path: Path to the Stockfish binary. Defaults to the
+            `STOCKFISH_ENGINE_PATH` environment variable.
+        limit: Search limit per position. Defaults to depth 12.
+        n_workers: Number of worker processes. Defaults to the number of CPUs.
+        cache_path: Optional path to an evaluation cache shared by all workers, so
+            re-annotating an archive skips positions that were already analysed.
+        engine_factory: Picklable zero-argument callable that starts an engine. Takes
+            precedence over `engine_path`.
+
+    Yields:
+        The annotation of each game.
+    """
+    if engine_factory is None:
+        engine_path = engine_path or os.getenv("STOCKFISH_ENGINE_PATH")
+        if engine_path is None:
+            raise ValueError(
+                "STOCKFISH_ENGINE_PATH must be set in the environment or passed as argument."
+            )
+        engine_factory = functools.partial(chess.engine.SimpleEngine.popen_uci, engine_path)
+    limit = limit or chess.engine.Limit(depth=12)
+    pgn_files = sorted(Path(pgn_dir).rglob("*.pgn"))
+    out_dir = Path(output_dir) if output_dir is not None else None
+    if out_dir is not None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    table_file = open(table_path, "w", newline="") if table_path is not None else None
+    try:
+        writer = None
+        if table_file is not None:
+            fields = ["source", "white", "black", *MoveAnnotation.__dataclass_fields__]
+            writer = csv.DictWriter(table_file, fieldnames=fields)
+            writer.writeheader()
+
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,
+            initargs=(engine_factory, Path(cache_path) if cache_path is not None else None),
+        ) as executor:
+            annotate = functools.partial(
+                _annotate_file, pgn_dir=Path(pgn_dir), output_dir=out_dir, limit=limit
+            )
+            for annotations in executor.map(annotate, pgn_files):
+                for annotation in annotations:
+                    if writer is not None:
+                        for move in annotation.moves:
+                            writer.writerow(
+                                {
+                                    "source": annotation.source,
+                                    "white": annotation.white,
+                                    "black": annotation.black,
+                                    **asdict(move),
+                                }
+                            )
+                    yield annotation
+    finally:
+        if table_file is not None:
+            table_file.close()
@@ -0,0 +1,162 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """A thread-safe in-memory cache that evicts the least recently used entry."""
+
+    def __init__(self, maxsize: int = 10_000):
+        """
+        Args:
+            maxsize: Maximum number of entries held in memory.
+        """
+        self.maxsize = maxsize
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            return self._data[key]
+
+    def put(self, key: K, value: V) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache:
+    """
+    A persistent string key-value store backed by SQLite, with size-based eviction of
+    the least recently accessed entries and optional expiry of old entries.
+
+    SQLite handles locking between connections, so several processes can share the
+    same cache file.
+    """
+
+    # Check the database size after this many writes, rather than on every write
+    _EVICTION_CHECK_INTERVAL = 100
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int | None = 256 * 1024**2,
+        ttl: float | None = None,
+    ):
+        """
+        Args:
+            path: Path to the SQLite database file. Created if it does not exist.
+            max_bytes: Approximate maximum size of the stored data. When exceeded, the
+                least recently accessed entries are evicted. If None, never evict.
+            ttl: Seconds after which an entry expires, counted from when it was
+                written. If None, entries never expire.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._n_writes = 0
+        self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)"
+            )
+
+    def get(self, key: str) -> str | None:
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key: str) -> tuple[str, float] | None:
+        """The value stored under the key and the time it was written, if present."""
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT value, created FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self.ttl is not None and created < now - self.ttl:
+                self._connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+            self._connection.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+        return str(value), float(created)
+
+    def put(self, key: str, value: str) -> None:
+        size = len(key.encode()) + len(value.encode())
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._n_writes += 1
+            if self._n_writes % self._EVICTION_CHECK_INTERVAL == 0:
+                self._evict()
+
+    def _evict(self) -> None:
+        """
+        Delete expired entries, then the least recently accessed entries until under
+        the size limit.
+        """
+        if self.ttl is not None:
+            self._connection.execute(
+                "DELETE FROM cache WHERE created < ?", (time.time() - self.ttl,)
+            )
+        if self.max_bytes is None:
+            return
+        (total,) = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+        # Evict down to 90% of the limit, so that eviction doesn't run on every check
+        excess += self.max_bytes // 10
+        rows = self._connection.execute("SELECT key, size FROM cache ORDER BY accessed")
+        to_delete = []
+        for key, size in rows:
+            if excess <= 0:
+                break
+            to_delete.append((key,))
+            excess -= size
+        self._connection.executemany("DELETE FROM cache WHERE key = ?", to_delete)
+
+    def evict(self) -> None:
+        """Enforce the expiry and size limits immediately."""
+        with self._lock, self._connection:
+            self._evict()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute("SELECT COUNT(*) FROM cache").fetchone()
+        return int(count)
@@ -6,6 +6,7 @@ import chess
 
 from llm_chess.core.game_manager import GameManager
 from llm_chess.core.player import ChessPlayer
+from llm_chess.players.engine.pool import EnginePool
 from llm_chess.players.engine.stockfish import StockfishPlayer
 from llm_chess.utils.write import write_board_to_pgn_file
 
@@ -56,6 +57,7 @@ def calibrate_elo(
     stockfish_max_elo: int = 3190,
     write_dir: Path | None = None,
     n_randomised_starting_half_moves: int = 0,
+    engine_pool: EnginePool | None = None,
 ) -> list[tuple[float, int]]:
     """
     Calibrates the ChessPlayer's ELO rating by playing against Stockfish.
@@ -72,10 +74,28 @@ def calibrate_elo(
         write_dir: Optionally log games as PGN files to this directory.
         n_randomised_starting_half_moves: Number of random moves to make before before
             using the players' strategies.
+        engine_pool: Pool to lease Stockfish engines from. If None, a single-engine
+            pool is created for the duration of the calibration, so that one warm
+            engine process is reused for every game.
 
     Returns:
         A list containing the (player score, player ELO) for each played game.
     """
+    if engine_pool is None:
+        with EnginePool(max_engines=1) as engine_pool:
+            return calibrate_elo(
+                player_to_calibrate,
+                initial_llm_elo_estimate,
+                num_games,
+                start_k_factor,
+                end_k_factor,
+                stockfish_min_elo,
+                stockfish_max_elo,
+                write_dir,
+                n_randomised_starting_half_moves,
+                engine_pool,
+            )
+
     current_elo = initial_llm_elo_estimate
     stockfish_elo = initial_llm_elo_estimate  # Stockfish starts at the Player's estimated ELO
 
@@ -101,7 +121,7 @@ def calibrate_elo(
             logger.info(f"  Setting Stockfish ELO to: {stockfish_elo}")
             current_stockfish_elo = stockfish_elo
         stockfish_player = StockfishPlayer(
-            f"Stockfish (ELO: {current_stockfish_elo})", elo=current_stockfish_elo
+            f"Stockfish (ELO: {current_stockfish_elo})", elo=current_stockfish_elo, pool=engine_pool
         )
 
         # Play the game
@@ -113,14 +133,15 @@ def calibrate_elo(
         )
         manager = GameManager()
         board = chess.Board()
-        board, result = manager.play_game(
-            white,
-            black,
-            board=board,
-            displayer=None,
-            sleep_time=0.2,
-            n_randomised_starting_half_moves=n_randomised_starting_half_moves,
-        )
+        with stockfish_player:  # Returns the engine to the pool after the game
+            board, result = manager.play_game(
+                white,
+                black,
+                board=board,
+                displayer=None,
+                sleep_time=0.2,
+                n_randomised_starting_half_moves=n_randomised_starting_half_moves,
+            )
 
         # Log the game
         if write_dir is not None:
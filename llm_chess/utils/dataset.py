@@ -0,0 +1,238 @@
+import functools
+import gzip
+import importlib.util
+import json
+import logging
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TextIO
+
+import chess
+import chess.pgn
+
+from llm_chess.core.enums import APIResponseFormat, DatasetFormat
+from llm_chess.core.position import position_context
+from llm_chess.prompts.base import PromptConfig
+from llm_chess.utils.annotate import read_games
+from llm_chess.utils.format import MoveHistoryTracker, convert_move_to_str
+
+logger = logging.getLogger(__name__)
+
+# Parquet rows are buffered and written in row groups of this size
+PARQUET_ROW_GROUP_SIZE = 10_000
+
+
+@dataclass(frozen=True)
+class ExportedShard:
+    path: Path
+    n_positions: int
+
+
+def position_records(
+    game: chess.pgn.Game,
+    prompt_config: PromptConfig,
+    source: str = "",
+    game_index: int = 0,
+    move_history: MoveHistoryTracker | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Stream a record for each position of a game's mainline that was followed by a move.
+
+    Each record holds the prompt that the prompt config builds for the position, the
+    legal moves and the move played, both in the config's notation, and the game's
+    players and result. For multi-turn configs, the moves so far are included as
+    `history`, from which the conversation is built.
+
+    Args:
+        game: The game.
+        prompt_config: Builds the prompt for each position.
+        source: Identifier of the game's source, e.g. its file name.
+        game_index: Index of the game within its source.
+        move_history: Tracker used to format the history of multi-turn configs
+            incrementally. If None, a new tracker is used.
+    """
+    notation = prompt_config.move_notation
+    multi_turn = prompt_config.api_response_format == APIResponseFormat.MULTI_TURN
+    if move_history is None:
+        move_history = MoveHistoryTracker(max_games=1)
+    headers = {
+        "white": game.headers.get("White", "?"),
+        "black": game.headers.get("Black", "?"),
+        "result": game.headers.get("Result", "*"),
+    }
+    board = game.board()
+    for move in game.mainline_moves():
+        context = position_context(board)
+        record = {
+            "source": source,
+            "game": game_index,
+            "ply": len(board.move_stack),
+            **headers,
+            "fen": context.fen,
+            "turn": "white" if board.turn == chess.WHITE else "black",
+            "prompt": context.prompt(prompt_config),
+            "legal_moves": context.formatted_legal_moves(notation),
+            "move": convert_move_to_str(board, move, notation),
+            "move_uci": move.uci(),
+        }
+        if multi_turn:
+            record["history"] = move_history.format(board, notation)
+        yield record
+        board.push(move)
+
+
+def _parquet_schema(record: dict[str, Any]) -> Any:
+    """The Parquet schema of the records, given one, so all row groups have the same schema."""
+    import pyarrow as pa
+
+    types = {int: pa.int64(), str: pa.string(), list: pa.list_(pa.string())}
+    return pa.schema([(name, types[type(value)]) for name, value in record.items()])
+
+
+class _ShardWriter:
+    """Writes records to consecutive shards, starting a new one every `rows_per_shard`."""
+
+    def __init__(
+        self, output_dir: Path, prefix: str, dataset_format: DatasetFormat, rows_per_shard: int
+    ):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.dataset_format = dataset_format
+        self.rows_per_shard = rows_per_shard
+        self.shards: list[ExportedShard] = []
+        self._path: Path | None = None
+        self._n_rows = 0
+        self._file: TextIO | None = None
+        self._parquet_writer: Any = None
+        self._buffer: list[dict[str, Any]] = []
+
+    def write(self, record: dict[str, Any]) -> None:
+        if self._path is None:
+            self._open()
+        if self.dataset_format == DatasetFormat.JSONL:
+            assert self._file is not None
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            self._buffer.append(record)
+            if len(self._buffer) >= PARQUET_ROW_GROUP_SIZE:
+                self._flush_parquet()
+        self._n_rows += 1
+        if self._n_rows >= self.rows_per_shard:
+            self.close()
+
+    def _open(self) -> None:
+        suffix = "jsonl.gz" if self.dataset_format == DatasetFormat.JSONL else "parquet"
+        self._path = self.output_dir / f"{self.prefix}-{len(self.shards):04d}.{suffix}"
+        self._n_rows = 0
+        if self.dataset_format == DatasetFormat.JSONL:
+            self._file = gzip.open(self._path, "wt", encoding="utf-8")
+
+    def _flush_parquet(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        assert self._path is not None
+        table = pa.Table.from_pylist(self._buffer, schema=_parquet_schema(self._buffer[0]))
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(self._path, table.schema, compression="zstd")
+        self._parquet_writer.write_table(table)
+        self._buffer = []
+
+    def close(self) -> None:
+        """Finish the current shard, if any."""
+        if self._path is None:
+            return
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._buffer:
+            self._flush_parquet()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        self.shards.append(ExportedShard(self._path, self._n_rows))
+        self._path = None
+
+
+def _export_files(
+    task: tuple[int, list[Path]],
+    pgn_dir: Path,
+    output_dir: Path,
+    prompt_config: PromptConfig,
+    dataset_format: DatasetFormat,
+    rows_per_shard: int,
+) -> list[ExportedShard]:
+    task_index, pgn_files = task
+    writer = _ShardWriter(output_dir, f"part-{task_index:05d}", dataset_format, rows_per_shard)
+    move_history = MoveHistoryTracker(max_games=1)
+    try:
+        for pgn_file_path in pgn_files:
+            # Runs in different subdirectories reuse file names
+            source = pgn_file_path.relative_to(pgn_dir).as_posix()
+            for game_index, game in enumerate(read_games(pgn_file_path)):
+                if game.errors:
+                    logger.warning(f"Skipping game {game_index} of {pgn_file_path}: {game.errors}")
+                    continue
+                records = position_records(game, prompt_config, source, game_index, move_history)
+                for record in records:
+                    writer.write(record)
+    finally:
+        writer.close()
+    return writer.shards
+
+
+def export_prompt_dataset(
+    pgn_dir: str | Path,
+    output_dir: str | Path,
+    prompt_config: PromptConfig,
+    dataset_format: DatasetFormat = DatasetFormat.JSONL,
+    rows_per_shard: int = 100_000,
+    files_per_task: int = 64,
+    n_workers: int | None = None,
+) -> Iterator[ExportedShard]:
+    """
+    Export every position of every game in a directory of PGN files, including those
+    in its subdirectories, as a prompt dataset, with one record per position, as from
+    `position_records`. Each record's `source` is its file's path relative to `pgn_dir`.
+
+    The files are split into tasks of consecutive files, which are distributed across
+    worker processes. Each task streams its records into its own shards, named
+    `part-<task>-<shard>`, so memory use doesn't grow with the size of the export, and
+    the output doesn't depend on the number of workers.
+
+    Args:
+        pgn_dir: Directory containing `.pgn` files, which are found recursively.
+        output_dir: Directory to write the shards to.
+        prompt_config: Builds the prompt for each position. It must be picklable.
+        dataset_format: Gzipped JSONL, or Parquet, which requires `pyarrow`
+            (`pip install llm_chess[parquet]`).
+        rows_per_shard: Maximum number of records per shard.
+        files_per_task: Number of PGN files per task.
+        n_workers: Number of worker processes. Defaults to the number of CPUs.
+
+    Yields:
+        Each shard written, in task order.
+    """
+    if dataset_format == DatasetFormat.PARQUET and importlib.util.find_spec("pyarrow") is None:
+        raise ImportError("Parquet export requires pyarrow: `pip install llm_chess[parquet]`")
+    pgn_files = sorted(Path(pgn_dir).rglob("*.pgn"))
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tasks = [
+        (task_index, pgn_files[start : start + files_per_task])
+        for task_index, start in enumerate(range(0, len(pgn_files), files_per_task))
+    ]
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        export = functools.partial(
+            _export_files,
+            pgn_dir=Path(pgn_dir),
+            output_dir=out_dir,
+            prompt_config=prompt_config,
+            dataset_format=dataset_format,
+            rows_per_shard=rows_per_shard,
+        )
+        for shards in executor.map(export, tasks):
+            yield from shards
@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 
 import chess
 
+from llm_chess.core.position import position_context
 from llm_chess.prompts.base import PromptConfig
 from llm_chess.prompts.text_board import board_to_text
 
@@ -22,4 +23,4 @@ class PromptDisplayer(BoardDisplayer):
         self.prompt_config = prompt_config
 
     def display(self, board: chess.Board, ended: bool = False) -> str:
-        return self.prompt_config.build_prompt(board)
+        return position_context(board).prompt(self.prompt_config)
@@ -1,6 +1,10 @@
+import threading
+from collections import OrderedDict
+
 import chess
 
 from llm_chess.core.enums import MoveNotation
+from llm_chess.core.position import position_context
 
 
 def convert_str_to_move(
@@ -9,6 +13,10 @@ def convert_str_to_move(
     """
     Parse a chess move from a string in the specified notation.
 
+    The usual spellings of the legal moves are resolved by a lookup in the board's
+    position context, and anything else is parsed by python-chess, which also accepts
+    e.g. overspecified SAN.
+
     Args:
         move_str (str): The chess move as a string.
         move_notation (MoveNotation): The notation to use for parsing.
@@ -19,6 +27,10 @@ def convert_str_to_move(
     Raises:
         ValueError: If the move string is invalid or the notation is not supported.
     """
+    if move_notation in (MoveNotation.UCI, MoveNotation.SAN):
+        move = position_context(board).parse_move(move_str, move_notation)
+        if move is not None:
+            return move
     try:
         if move_notation == MoveNotation.UCI:
             return board.parse_uci(move_str)
@@ -63,7 +75,8 @@ def format_legal_moves(
 ) -> list[str]:
     """
     Format the legal moves of a chess board in the specified notation. Typically used to
-    yield the list of permitted LLM responses.
+    yield the list of permitted LLM responses. The formatting is shared by every caller
+    within a ply, through the board's position context.
 
     Args:
         board (chess.Board): The chess board.
@@ -74,10 +87,8 @@ def format_legal_moves(
     Returns:
         list[str]: A list of legal moves in the specified notation.
     """
-    out = [convert_move_to_str(board, move, move_notation) for move in board.legal_moves]
-    if move_response_has_leading_space:
-        out = [f" {move}" for move in out]
-    return out
+    context = position_context(board)
+    return context.formatted_legal_moves(move_notation, move_response_has_leading_space)
 
 
 def format_moves_history(board: chess.Board, move_notation: MoveNotation) -> list[str]:
@@ -92,9 +103,98 @@ def format_moves_history(board: chess.Board, move_notation: MoveNotation) -> lis
         list[str]: A list of moves in the specified notation in the order they were
             played for the supplied board.
     """
-    board_ = chess.Board()
+    board_ = board.root()
     formatted_moves = []
     for move in board.move_stack:
         formatted_moves.append(convert_move_to_str(board_, move, move_notation))
         board_.push(move)
     return formatted_moves
+
+
+class _FormattedHistory:
+    """The formatted moves of one game, with the position after them."""
+
+    def __init__(self, root: chess.Board):
+        self.board = root
+        self.formatted_moves: list[str] = []
+
+    def update(self, moves: list[chess.Move], n_common: int, move_notation: MoveNotation) -> None:
+        while len(self.formatted_moves) > n_common:
+            self.board.pop()
+            self.formatted_moves.pop()
+        for move in moves[n_common:]:
+            self.formatted_moves.append(convert_move_to_str(self.board, move, move_notation))
+            self.board.push(move)
+
+    def copy(self) -> "_FormattedHistory":
+        history = _FormattedHistory(self.board.copy())
+        history.formatted_moves = list(self.formatted_moves)
+        return history
+
+
+class MoveHistoryTracker:
+    """
+    Formats the move histories of games incrementally. The formatted moves of recent
+    games are kept, so formatting a game's next position only formats the new plies,
+    rather than replaying the whole game as `format_moves_history` does.
+
+    Games are identified by their root position, notation and moves, so board copies
+    share an entry, take-backs reuse the moves they keep, and games that don't start
+    from the standard position are supported. Safe to share between threads.
+    """
+
+    def __init__(self, max_games: int = 64):
+        """
+        Args:
+            max_games: The number of games whose histories are kept.
+        """
+        self.max_games = max_games
+        self._histories: OrderedDict[
+            tuple[str, MoveNotation, tuple[chess.Move, ...]], _FormattedHistory
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def format(self, board: chess.Board, move_notation: MoveNotation) -> list[str]:
+        """
+        Format the moves history of a chess board in the specified notation. Equivalent
+        to `format_moves_history`.
+        """
+        root = board.root()
+        game = (root.fen(), move_notation)
+        moves = board.move_stack
+        with self._lock:
+            history, n_common = self._take_history(game, moves)
+        if history is None:
+            history = _FormattedHistory(root)
+        history.update(moves, n_common, move_notation)
+        formatted_moves = list(history.formatted_moves)
+        with self._lock:
+            self._histories[(*game, tuple(moves))] = history
+            while len(self._histories) > self.max_games:
+                self._histories.popitem(last=False)
+        return formatted_moves
+
+    def _take_history(
+        self, game: tuple[str, MoveNotation], moves: list[chess.Move]
+    ) -> tuple[_FormattedHistory | None, int]:
+        # Usually the same game, one or two plies on
+        for n_new in range(min(len(moves), 2) + 1):
+            key = tuple(moves[: len(moves) - n_new])
+            history = self._histories.pop((*game, key), None)
+            if history is not None:
+                return history, len(key)
+
+        # Otherwise, e.g. after a take-back, copy the game sharing the most moves
+        best: _FormattedHistory | None = None
+        n_best = 0
+        for (fen, notation, key), history in self._histories.items():
+            if (fen, notation) != game:
+                continue
+            n_common = 0
+            for cached_move, move in zip(key, moves, strict=False):
+                if cached_move != move:
+                    break
+                n_common += 1
+            if n_common > n_best:
+                best, n_best = history, n_common
+        return (best.copy() if best is not None else None), n_best
@@ -0,0 +1,150 @@
+from collections import defaultdict
+from collections.abc import Iterable
+
+import chess
+
+
+def legal_moves_san(board: chess.Board, moves: Iterable[chess.Move] | None = None) -> list[str]:
+    """
+    Format legal moves of a position in SAN, returning exactly what `board.san` would
+    for each move.
+
+    `board.san` generates the legal moves again to disambiguate each move, and pushes
+    and pops it to test for check and checkmate. Here, the disambiguation is computed
+    once for all moves, and checks are detected from the move's attacks without
+    pushing it. Only moves that give check are pushed, to test for checkmate.
+
+    Args:
+        board: The position.
+        moves: Legal moves of the position. If None, all legal moves, in the order of
+            `board.legal_moves`.
+
+    Returns:
+        The SAN of each move, in order.
+    """
+    legal_moves = list(board.legal_moves)
+    moves = legal_moves if moves is None else list(moves)
+    if board.uci_variant != "chess" or board.chess960:
+        # Variants have other suffix rules; fall back to the general implementation
+        return [board.san(move) for move in moves]
+
+    # The origin squares of the legal moves of each piece type to each square
+    origins: defaultdict[tuple[chess.PieceType, chess.Square], chess.Bitboard]
+    origins = defaultdict(int)
+    for move in legal_moves:
+        piece_type = board.piece_type_at(move.from_square)
+        assert piece_type is not None
+        origins[piece_type, move.to_square] |= chess.BB_SQUARES[move.from_square]
+
+    king = board.king(not board.turn)
+    return [_san(board, move, origins, king) for move in moves]
+
+
+def _san(
+    board: chess.Board,
+    move: chess.Move,
+    origins: dict[tuple[chess.PieceType, chess.Square], chess.Bitboard],
+    king: chess.Square | None,
+) -> str:
+    if board.is_castling(move):
+        san = (
+            "O-O-O"
+            if chess.square_file(move.to_square) < chess.square_file(move.from_square)
+            else "O-O"
+        )
+    else:
+        san = _san_without_suffix(board, move, origins)
+
+    if king is None:
+        return san
+    if board.is_castling(move) or board.is_en_passant(move):
+        # These move two pieces, so test for check by pushing the move
+        gives_check = board.gives_check(move)
+    else:
+        gives_check = _gives_check(board, move, king)
+    if not gives_check:
+        return san
+    board.push(move)
+    try:
+        return san + ("#" if board.is_checkmate() else "+")
+    finally:
+        board.pop()
+
+
+def _san_without_suffix(
+    board: chess.Board,
+    move: chess.Move,
+    origins: dict[tuple[chess.PieceType, chess.Square], chess.Bitboard],
+) -> str:
+    piece_type = board.piece_type_at(move.from_square)
+    assert piece_type is not None, f"Expected a legal move, but got {move} in {board.fen()}"
+    capture = board.is_capture(move)
+    from_file = chess.square_file(move.from_square)
+    from_rank = chess.square_rank(move.from_square)
+
+    if piece_type == chess.PAWN:
+        san = chess.FILE_NAMES[from_file] if capture else ""
+    else:
+        san = chess.piece_symbol(piece_type).upper()
+        others = origins[piece_type, move.to_square] & ~chess.BB_SQUARES[move.from_square]
+        if others:
+            column = bool(others & chess.BB_RANKS[from_rank])
+            row = bool(others & chess.BB_FILES[from_file])
+            if not row:
+                column = True
+            if column:
+                san += chess.FILE_NAMES[from_file]
+            if row:
+                san += chess.RANK_NAMES[from_rank]
+
+    if capture:
+        san += "x"
+    san += chess.SQUARE_NAMES[move.to_square]
+    if move.promotion:
+        san += "=" + chess.piece_symbol(move.promotion).upper()
+    return san
+
+
+def _gives_check(board: chess.Board, move: chess.Move, king: chess.Square) -> bool:
+    """Whether a move other than castling or en passant attacks the opponent's king."""
+    from_bb = chess.BB_SQUARES[move.from_square]
+    to_bb = chess.BB_SQUARES[move.to_square]
+    occupied = (board.occupied & ~from_bb) | to_bb
+
+    # Direct check by the moved, or promoted, piece
+    piece_type = move.promotion or board.piece_type_at(move.from_square)
+    if piece_type == chess.PAWN:
+        if chess.BB_PAWN_ATTACKS[board.turn][move.to_square] & chess.BB_SQUARES[king]:
+            return True
+    elif piece_type == chess.KNIGHT:
+        if chess.BB_KNIGHT_ATTACKS[move.to_square] & chess.BB_SQUARES[king]:
+            return True
+    elif piece_type != chess.KING:
+        diagonal = piece_type in (chess.BISHOP, chess.QUEEN)
+        straight = piece_type in (chess.ROOK, chess.QUEEN)
+        if diagonal and _diagonal_attacks(move.to_square, occupied) & chess.BB_SQUARES[king]:
+            return True
+        if straight and _straight_attacks(move.to_square, occupied) & chess.BB_SQUARES[king]:
+            return True
+
+    # Discovered check by a slider behind the vacated square. A captured piece belongs
+    # to the opponent, so only the moved piece leaves our sliders.
+    ours = board.occupied_co[board.turn] & ~from_bb
+    queens = board.queens & ours
+    diagonal_sliders = (board.bishops & ours) | queens
+    straight_sliders = (board.rooks & ours) | queens
+    return bool(
+        (_diagonal_attacks(king, occupied) & diagonal_sliders)
+        or (_straight_attacks(king, occupied) & straight_sliders)
+    )
+
+
+def _diagonal_attacks(square: chess.Square, occupied: chess.Bitboard) -> chess.Bitboard:
+    return chess.BB_DIAG_ATTACKS[square][chess.BB_DIAG_MASKS[square] & occupied]
+
+
+def _straight_attacks(square: chess.Square, occupied: chess.Bitboard) -> chess.Bitboard:
+    return (
+        chess.BB_RANK_ATTACKS[square][chess.BB_RANK_MASKS[square] & occupied]
+        | chess.BB_FILE_ATTACKS[square][chess.BB_FILE_MASKS[square] & occupied]
+    )
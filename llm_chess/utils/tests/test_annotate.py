@@ -0,0 +1,111 @@
+import csv
+from pathlib import Path
+from typing import cast
+
+import chess
+import chess.engine
+import chess.pgn
+import pytest
+
+from llm_chess.utils.annotate import (
+    annotate_directory,
+    annotate_game,
+    classify,
+    move_accuracy,
+    read_games,
+    win_percent,
+)
+
+PIECE_VALUES = {chess.PAWN: 100, chess.KNIGHT: 300, chess.BISHOP: 300, chess.ROOK: 500}
+PIECE_VALUES[chess.QUEEN] = 900
+
+# White hangs its queen on move 3
+PGN = """
+[White "LLM"]
+[Black "Stockfish"]
+[Result "0-1"]
+
+1. e4 e5 2. Qh5 Nc6 3. Qxf7+ Kxf7 0-1
+"""
+
+
+class MaterialEngine:
+    """Fake engine that evaluates positions by material count."""
+
+    def analyse(self, board: chess.Board, limit: chess.engine.Limit) -> chess.engine.InfoDict:
+        cp = sum(
+            value * (len(board.pieces(piece, chess.WHITE)) - len(board.pieces(piece, chess.BLACK)))
+            for piece, value in PIECE_VALUES.items()
+        )
+        return {"score": chess.engine.PovScore(chess.engine.Cp(cp), chess.WHITE), "depth": 1}
+
+    def quit(self) -> None:
+        pass
+
+
+@pytest.fixture
+def game(tmp_path: Path) -> chess.pgn.Game:
+    (tmp_path / "game.pgn").write_text(PGN)
+    return next(read_games(tmp_path / "game.pgn"))
+
+
+def test_classify() -> None:
+    assert classify(0) is None
+    assert classify(49) is None
+    assert classify(50) == "inaccuracy"
+    assert classify(100) == "mistake"
+    assert classify(300) == "blunder"
+
+
+def test_move_accuracy() -> None:
+    assert win_percent(0) == pytest.approx(50)
+    assert move_accuracy(50, 50) == pytest.approx(100, abs=0.01)
+    assert move_accuracy(80, 20) < move_accuracy(80, 70)
+
+
+def test_annotate_game(game: chess.pgn.Game) -> None:
+    engine = cast(chess.engine.SimpleEngine, MaterialEngine())
+    annotation = annotate_game(game, engine, chess.engine.Limit(depth=1))
+
+    assert [move.move for move in annotation.moves] == ["e4", "e5", "Qh5", "Nc6", "Qxf7+", "Kxf7"]
+    queen_sac = annotation.moves[4]
+    assert queen_sac.colour == "white"
+    assert queen_sac.cp_loss == 0  # Material only drops after black recaptures
+    recapture = annotation.moves[5]
+    assert recapture.cp_loss == 0
+    assert recapture.cp_after == 800
+    white_accuracy = annotation.accuracy(chess.WHITE)
+    assert white_accuracy is not None and white_accuracy > 90
+
+
+def test_annotate_directory(tmp_path: Path) -> None:
+    pgn_dir, output_dir = tmp_path / "games", tmp_path / "annotated"
+    # Runs in different subdirectories reuse file names
+    (pgn_dir / "run").mkdir(parents=True)
+    (pgn_dir / "game.pgn").write_text(PGN.replace("Kxf7 0-1", "Kxf7 4. Nf3 Qf6 0-1"))
+    (pgn_dir / "run" / "game.pgn").write_text(PGN)
+    table_path = tmp_path / "moves.csv"
+
+    annotations = list(
+        annotate_directory(
+            pgn_dir,
+            output_dir=output_dir,
+            table_path=table_path,
+            engine_factory=MaterialEngine,  # type: ignore[arg-type]
+            n_workers=1,
+        )
+    )
+
+    assert [annotation.source for annotation in annotations] == ["game.pgn", "run/game.pgn"]
+    with open(table_path) as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 14
+    assert next(read_games(output_dir / "run" / "game.pgn")).headers["WhiteAccuracy"]
+
+    annotated = next(read_games(output_dir / "game.pgn"))
+    assert "WhiteAccuracy" in annotated.headers
+    assert any(node.comment.startswith("cp_loss") for node in annotated.mainline())
+    for node, row in zip(annotated.mainline(), rows[:8], strict=True):
+        evaluation = node.eval()
+        assert evaluation is not None
+        assert evaluation.pov(node.turn()).score() == -int(row["cp_after"])
@@ -0,0 +1,56 @@
+from pathlib import Path
+
+import pytest
+
+from llm_chess.utils.cache import LRUCache, SQLiteCache
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_sqlite_cache_persists(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite"
+    cache = SQLiteCache(path)
+    cache.put("key", "value")
+    cache.close()
+
+    reopened = SQLiteCache(path)
+    assert reopened.get("key") == "value"
+    assert reopened.get("missing") is None
+
+
+def test_sqlite_cache_evicts_by_size(tmp_path: Path) -> None:
+    cache = SQLiteCache(tmp_path / "cache.sqlite", max_bytes=1000)
+    for i in range(50):
+        cache.put(f"key{i:02d}", "x" * 95)  # 100 bytes per entry
+    cache.get("key00")  # Mark the oldest entry as recently used
+    cache.evict()
+
+    assert len(cache) <= 9
+    assert cache.get("key00") is not None
+    assert cache.get("key01") is None
+    assert cache.get("key49") is not None
+
+
+def test_sqlite_cache_expires_entries(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = SQLiteCache(tmp_path / "cache.sqlite", ttl=60)
+    monkeypatch.setattr("llm_chess.utils.cache.time.time", lambda: 1000.0)
+    cache.put("old", "value")
+    monkeypatch.setattr("llm_chess.utils.cache.time.time", lambda: 1050.0)
+    cache.put("new", "value")
+
+    monkeypatch.setattr("llm_chess.utils.cache.time.time", lambda: 1070.0)
+    assert cache.get("old") is None
+    assert cache.get("new") == "value"
+    cache.evict()
+    assert len(cache) == 1
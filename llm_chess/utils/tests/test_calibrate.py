@@ -2,6 +2,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from llm_chess.players.engine.pool import EnginePool
 from llm_chess.utils import calibrate
 
 
@@ -54,6 +55,8 @@ def test_calibrate_elo_basic(mock_gamemanager: MagicMock, mock_stockfishplayer:
         write_dir=None,
     )
     assert len(scores_and_elos) == len(results)
+    assert isinstance(mock_stockfishplayer.call_args.kwargs["pool"], EnginePool)
+    assert mock_stockfish.__exit__.call_count == len(results)
 
     assert scores_and_elos[0][0] == 1.0
     assert scores_and_elos[0][1] > 1500
@@ -0,0 +1,122 @@
+import gzip
+import io
+import json
+from pathlib import Path
+from typing import Any
+
+import chess
+import chess.pgn
+import pytest
+
+from llm_chess.core.enums import DatasetFormat, MoveNotation
+from llm_chess.prompts.fen import FENPromptConfig
+from llm_chess.prompts.multi_turn import MultiTurnPromptConfig
+from llm_chess.prompts.pgn import PGNPromptConfig
+from llm_chess.utils.dataset import export_prompt_dataset, position_records
+
+PGN = """
+[White "Alice"]
+[Black "Bob"]
+[Result "0-1"]
+
+1. f3 e5 2. g4 Qh4# 0-1
+
+[White "Bob"]
+[Black "Alice"]
+[Result "*"]
+
+1. e4 *
+"""
+
+
+def read_game() -> chess.pgn.Game:
+    game = chess.pgn.read_game(io.StringIO(PGN))
+    assert game is not None
+    return game
+
+
+def test_position_records() -> None:
+    prompt_config = FENPromptConfig(move_notation=MoveNotation.SAN)
+    records = list(position_records(read_game(), prompt_config, "game.pgn"))
+
+    assert [record["move"] for record in records] == ["f3", "e5", "g4", "Qh4#"]
+    assert [record["move_uci"] for record in records] == ["f2f3", "e7e5", "g2g4", "d8h4"]
+    board = chess.Board()
+    for record in records:
+        assert record["prompt"] == prompt_config.build_prompt(board)
+        assert record["fen"] == board.fen()
+        assert record["move"] in record["legal_moves"]
+        board.push_san(record["move"])
+    assert records[-1]["turn"] == "black"
+    assert records[-1]["result"] == "0-1"
+    assert "history" not in records[0]
+
+
+def test_position_records_include_history_for_multi_turn_prompts() -> None:
+    records = list(position_records(read_game(), MultiTurnPromptConfig()))
+    assert [record["history"] for record in records] == [
+        [],
+        ["f3"],
+        ["f3", "e5"],
+        ["f3", "e5", "g4"],
+    ]
+
+
+def test_export_prompt_dataset(tmp_path: Path) -> None:
+    pgn_dir, output_dir = tmp_path / "games", tmp_path / "dataset"
+    (pgn_dir / "run").mkdir(parents=True)
+    for name in ("a.pgn", "b.pgn", "run/a.pgn"):
+        (pgn_dir / name).write_text(PGN)
+
+    shards = list(
+        export_prompt_dataset(
+            pgn_dir,
+            output_dir,
+            PGNPromptConfig(),
+            rows_per_shard=3,
+            files_per_task=2,
+            n_workers=1,
+        )
+    )
+
+    # Each file has five positions; the first task exports two files, the second one
+    assert [shard.path.name for shard in shards] == [
+        "part-00000-0000.jsonl.gz",
+        "part-00000-0001.jsonl.gz",
+        "part-00000-0002.jsonl.gz",
+        "part-00000-0003.jsonl.gz",
+        "part-00001-0000.jsonl.gz",
+        "part-00001-0001.jsonl.gz",
+    ]
+    assert sum(shard.n_positions for shard in shards) == 15
+    records: list[dict[str, Any]] = []
+    for shard in shards:
+        with gzip.open(shard.path, "rt", encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f)
+    assert len(records) == 15
+    assert records[-1]["source"] == "run/a.pgn"
+    assert [(record["source"], record["game"]) for record in records[:6]] == [
+        ("a.pgn", 0),
+        ("a.pgn", 0),
+        ("a.pgn", 0),
+        ("a.pgn", 0),
+        ("a.pgn", 1),
+        ("b.pgn", 0),
+    ]
+
+
+def test_export_prompt_dataset_to_parquet(tmp_path: Path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    pgn_dir = tmp_path / "games"
+    pgn_dir.mkdir()
+    (pgn_dir / "a.pgn").write_text(PGN)
+
+    shards = list(
+        export_prompt_dataset(
+            pgn_dir, tmp_path / "dataset", FENPromptConfig(), DatasetFormat.PARQUET, n_workers=1
+        )
+    )
+
+    table = pq.read_table(shards[0].path)
+    assert table.num_rows == 5
+    assert table.column("legal_moves")[0].as_py()[0] == "g1h3"
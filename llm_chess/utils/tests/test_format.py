@@ -1,8 +1,11 @@
+import random
+
 import chess
 import pytest
 
 from llm_chess.core.enums import MoveNotation
 from llm_chess.utils.format import (
+    MoveHistoryTracker,
     convert_move_to_str,
     convert_str_to_move,
     format_legal_moves,
@@ -24,6 +27,26 @@ def test_convert_str_to_move(starting_board: chess.Board) -> None:
         convert_str_to_move(starting_board, "invalid", MoveNotation.UCI)
 
 
+@pytest.mark.parametrize(
+    "move_str,move_notation",
+    [(" e4", MoveNotation.SAN), ("e4+", MoveNotation.SAN), (" e2e4", MoveNotation.UCI)],
+)
+def test_convert_str_to_move_accepts_tolerated_spellings(
+    starting_board: chess.Board, move_str: str, move_notation: MoveNotation
+) -> None:
+    assert convert_str_to_move(starting_board, move_str, move_notation) == chess.Move.from_uci(
+        "e2e4"
+    )
+
+
+def test_convert_str_to_move_falls_back_to_parsing(starting_board: chess.Board) -> None:
+    # Overspecified SAN isn't one of the looked-up spellings, but is still accepted
+    move = convert_str_to_move(starting_board, "Ng1f3", MoveNotation.SAN)
+    assert move == chess.Move.from_uci("g1f3")
+    with pytest.raises(ValueError):
+        convert_str_to_move(starting_board, "Nf6", MoveNotation.SAN)
+
+
 def test_convert_move_to_str(starting_board: chess.Board) -> None:
     move = chess.Move.from_uci("e2e4")
     assert convert_move_to_str(starting_board, move, MoveNotation.UCI) == "e2e4"
@@ -70,3 +93,20 @@ def test_format_moves_history(
 
     with pytest.raises(ValueError):
         format_moves_history(starting_board, "INVALID_NOTATION")  # type: ignore
+
+
+@pytest.mark.parametrize("notation", [MoveNotation.UCI, MoveNotation.SAN])
+def test_move_history_tracker_matches_format_moves_history(notation: MoveNotation) -> None:
+    tracker = MoveHistoryTracker(max_games=2)
+    rng = random.Random(0)
+    boards = [chess.Board(), chess.Board("4k3/8/8/8/8/8/4P3/4K2R b K - 0 30")]
+    for ply in range(60):
+        for i, board in enumerate(boards):
+            if board.is_game_over():
+                continue
+            board.push(rng.choice(list(board.legal_moves)))
+            if ply % 13 == 12:  # Take back two plies and continue from a copy
+                board.pop()
+                board.pop()
+                board = boards[i] = board.copy()
+            assert tracker.format(board, notation) == format_moves_history(board, notation)
@@ -0,0 +1,44 @@
+import random
+
+import chess
+import pytest
+
+from llm_chess.utils.san import legal_moves_san
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        chess.STARTING_FEN,
+        # Castling both ways, and promotions with and without capture
+        "r3k2r/pPpp1ppp/8/8/8/8/P1PP1PPP/R3K2R w KQkq - 0 1",
+        # En passant, including one that discovers check
+        "4k3/8/8/3pP3/8/8/8/4K2R w K d6 0 1",
+        "8/8/8/R2pP2k/8/8/8/4K3 w - d6 0 1",
+        # Disambiguation by file, rank and both
+        "k7/8/8/8/8/8/8/KQ1Q1Q2 w - - 0 1",
+        "4k3/8/8/1Q1Q4/8/1Q1Q4/8/4K3 w - - 0 1",
+        # Checkmates
+        "7k/8/8/8/8/8/1R6/KR6 w - - 0 1",
+        "6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1",
+    ],
+)
+def test_legal_moves_san_matches_board_san(fen: str) -> None:
+    board = chess.Board(fen)
+    assert legal_moves_san(board) == [board.san(move) for move in board.legal_moves]
+    assert board.fen(en_passant="fen") == fen
+
+
+def test_legal_moves_san_matches_board_san_in_random_games() -> None:
+    rng = random.Random(0)
+    for _ in range(20):
+        board = chess.Board()
+        while not board.is_game_over() and board.ply() < 200:
+            assert legal_moves_san(board) == [board.san(move) for move in board.legal_moves]
+            board.push(rng.choice(list(board.legal_moves)))
+
+
+def test_legal_moves_san_of_some_moves() -> None:
+    # The knights' moves to d2 are disambiguated, even if only one is formatted
+    board = chess.Board("4k3/8/8/8/8/5N2/8/1N2K3 w - - 0 1")
+    assert legal_moves_san(board, [chess.Move.from_uci("b1d2")]) == ["Nbd2"]
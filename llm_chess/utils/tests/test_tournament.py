@@ -0,0 +1,64 @@
+from functools import partial
+
+import chess
+
+from llm_chess.conftest import MockChessPlayer
+from llm_chess.players.random import RandomPlayer
+from llm_chess.utils.tournament import (
+    ScheduledGame,
+    gauntlet,
+    play_scheduled_game,
+    round_robin,
+    run_tournament,
+)
+
+
+def _failing_factory() -> RandomPlayer:
+    raise RuntimeError("Cannot build player")
+
+
+def test_round_robin_schedule() -> None:
+    players = [partial(RandomPlayer, name) for name in ("A", "B", "C")]
+    schedule = round_robin(players, repetitions=2)
+
+    # 3 pairings, both colours, 2 repetitions
+    assert len(schedule) == 12
+    assert [game.game_id for game in schedule] == list(range(12))
+
+
+def test_gauntlet_schedule() -> None:
+    challenger = partial(RandomPlayer, "Challenger")
+    opponents = [partial(RandomPlayer, f"Opponent {i}") for i in range(3)]
+    fens = [chess.STARTING_FEN, "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1"]
+    schedule = gauntlet(challenger, opponents, starting_fens=fens, both_colours=False)
+
+    assert len(schedule) == 6
+    assert all(game.white is challenger for game in schedule)
+    assert {game.starting_fen for game in schedule} == set(fens)
+
+
+def test_play_scheduled_game_captures_errors() -> None:
+    game = ScheduledGame(0, _failing_factory, partial(RandomPlayer, "B"))
+    result = play_scheduled_game(game)
+    assert result.result == "*"
+    assert result.error is not None and "Cannot build player" in result.error
+
+
+def test_play_scheduled_game_illegal_move() -> None:
+    game = ScheduledGame(0, partial(MockChessPlayer, "e2e5", "Mock"), partial(RandomPlayer, "B"))
+    result = play_scheduled_game(game)
+    assert result.result == "Illegal move by Mock"
+    assert result.error is None
+
+
+def test_run_tournament_streams_all_results() -> None:
+    players = [partial(RandomPlayer, name) for name in ("A", "B")]
+    schedule = round_robin(players, repetitions=3, max_half_moves=20)
+
+    results = list(run_tournament(schedule, max_workers=2, max_pending=2))
+
+    assert sorted(result.game_id for result in results) == list(range(len(schedule)))
+    for result in results:
+        assert result.error is None
+        assert {result.white_name, result.black_name} == {"A", "B"}
+        assert len(result.board.move_stack) <= 21
@@ -0,0 +1,217 @@
+import itertools
+import logging
+import multiprocessing
+import os
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+
+import chess
+
+from llm_chess.core.game_manager import GameManager
+from llm_chess.core.player import ChessPlayer
+
+logger = logging.getLogger(__name__)
+
+# A picklable zero-argument callable that builds a player inside a worker process, such
+# as a module-level function or a `functools.partial` of a player class. Live API
+# clients and engine processes cannot be pickled, so players are never shipped as-is.
+PlayerFactory = Callable[[], ChessPlayer]
+
+
+@dataclass(frozen=True)
+class ScheduledGame:
+    """A single game in a tournament schedule."""
+
+    game_id: int
+    white: PlayerFactory
+    black: PlayerFactory
+    starting_fen: str = chess.STARTING_FEN
+    max_half_moves: int = 400
+    n_randomised_starting_half_moves: int = 0
+
+
+@dataclass(frozen=True)
+class GameResult:
+    """The outcome of a scheduled game, as streamed back from a worker process."""
+
+    game_id: int
+    white_name: str
+    black_name: str
+    result: str
+    board: chess.Board
+    error: str | None = None
+
+
+def round_robin(
+    players: Sequence[PlayerFactory],
+    repetitions: int = 1,
+    starting_fens: Iterable[str] = (chess.STARTING_FEN,),
+    both_colours: bool = True,
+    max_half_moves: int = 400,
+    n_randomised_starting_half_moves: int = 0,
+) -> list[ScheduledGame]:
+    """
+    Build a round-robin schedule in which every player meets every other player.
+
+    Args:
+        players: Factories for the players. Results are labelled by player name.
+        repetitions: Number of times each pairing is played per starting position.
+        starting_fens: Starting positions. Every pairing is played from each of them.
+        both_colours: Whether each pairing is also played with colours reversed.
+        max_half_moves: Maximum number of half-moves allowed in each game.
+        n_randomised_starting_half_moves: Number of random moves to make before using
+            the players' strategies.
+
+    Returns:
+        The list of scheduled games.
+    """
+    pairings: list[tuple[PlayerFactory, PlayerFactory]] = []
+    for a, b in itertools.combinations(players, 2):
+        pairings.append((a, b))
+        if both_colours:
+            pairings.append((b, a))
+    return _build_schedule(
+        pairings, repetitions, starting_fens, max_half_moves, n_randomised_starting_half_moves
+    )
+
+
+def gauntlet(
+    challenger: PlayerFactory,
+    opponents: Iterable[PlayerFactory],
+    repetitions: int = 1,
+    starting_fens: Iterable[str] = (chess.STARTING_FEN,),
+    both_colours: bool = True,
+    max_half_moves: int = 400,
+    n_randomised_starting_half_moves: int = 0,
+) -> list[ScheduledGame]:
+    """
+    Build a gauntlet schedule in which a single challenger plays each opponent.
+
+    Args:
+        challenger: Factory for the player running the gauntlet.
+        opponents: Factories for the opponents.
+        repetitions: Number of times each pairing is played per starting position.
+        starting_fens: Starting positions. Every pairing is played from each of them.
+        both_colours: Whether the challenger also plays each opponent as black.
+        max_half_moves: Maximum number of half-moves allowed in each game.
+        n_randomised_starting_half_moves: Number of random moves to make before using
+            the players' strategies.
+
+    Returns:
+        The list of scheduled games.
+    """
+    pairings: list[tuple[PlayerFactory, PlayerFactory]] = []
+    for opponent in opponents:
+        pairings.append((challenger, opponent))
+        if both_colours:
+            pairings.append((opponent, challenger))
+    return _build_schedule(
+        pairings, repetitions, starting_fens, max_half_moves, n_randomised_starting_half_moves
+    )
+
+
+def _build_schedule(
+    pairings: list[tuple[PlayerFactory, PlayerFactory]],
+    repetitions: int,
+    starting_fens: Iterable[str],
+    max_half_moves: int,
+    n_randomised_starting_half_moves: int,
+) -> list[ScheduledGame]:
+    fens = list(starting_fens)
+    schedule: list[ScheduledGame] = []
+    for (white, black), fen, _ in itertools.product(pairings, fens, range(repetitions)):
+        schedule.append(
+            ScheduledGame(
+                game_id=len(schedule),
+                white=white,
+                black=black,
+                starting_fen=fen,
+                max_half_moves=max_half_moves,
+                n_randomised_starting_half_moves=n_randomised_starting_half_moves,
+            )
+        )
+    return schedule
+
+
+def _close_player(player: ChessPlayer) -> None:
+    """Release any resources (e.g. engine processes) held by a player."""
+    exit_ = getattr(player, "__exit__", None)
+    if exit_ is not None:
+        try:
+            exit_(None, None, None)
+        except Exception as e:
+            logger.warning(f"Failed to close player {player.name}: {e}")
+
+
+def play_scheduled_game(game: ScheduledGame) -> GameResult:
+    """
+    Build the players for a scheduled game and play it. Runs inside worker processes.
+
+    Args:
+        game: The scheduled game.
+
+    Returns:
+        The game result. Errors raised while building the players or playing the game
+        are captured in `GameResult.error` so that one failure does not end the
+        tournament.
+    """
+    board = chess.Board(game.starting_fen)
+    players: list[ChessPlayer] = []
+    try:
+        white = game.white()
+        players.append(white)
+        black = game.black()
+        players.append(black)
+        board, result = GameManager().play_game(
+            white,
+            black,
+            board=board,
+            max_half_moves=game.max_half_moves,
+            n_randomised_starting_half_moves=game.n_randomised_starting_half_moves,
+        )
+        return GameResult(game.game_id, white.name, black.name, result, board)
+    except Exception as e:
+        names = [player.name for player in players] + ["?", "?"]
+        return GameResult(game.game_id, names[0], names[1], "*", board, error=repr(e))
+    finally:
+        for player in players:
+            _close_player(player)
+
+
+def run_tournament(
+    schedule: Iterable[ScheduledGame],
+    max_workers: int | None = None,
+    max_pending: int | None = None,
+    mp_context: multiprocessing.context.BaseContext | None = None,
+) -> Iterator[GameResult]:
+    """
+    Play a schedule of games across a process pool, yielding results as games finish.
+
+    Args:
+        schedule: The games to play. Consumed lazily, so large schedules can be
+            generated on the fly.
+        max_workers: Number of worker processes. Defaults to the number of CPUs.
+        max_pending: Maximum number of games submitted to the pool at once. Defaults
+            to twice the number of workers.
+        mp_context: Optional multiprocessing context, e.g. `get_context("spawn")`.
+
+    Yields:
+        A `GameResult` for each game, in order of completion.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * max_workers
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+        games = iter(schedule)
+        pending: set[Future[GameResult]] = set()
+        while True:
+            for game in itertools.islice(games, max_pending - len(pending)):
+                pending.add(executor.submit(play_scheduled_game, game))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if result.error is not None:
+                    logger.warning(f"Game {result.game_id} failed: {result.error}")
+                yield result